@@ -0,0 +1,66 @@
+from esphome import config_validation as cv
+from esphome import codegen as cg
+from esphome.const import CONF_FORMAT, CONF_ID, CONF_PORT, CONF_PROTOCOL
+
+from ..wmbus_radio import CONF_LINK_MODE, LinkMode, RadioComponent
+
+AUTO_LOAD = ["socket", "wmbus_common"]
+
+DEPENDENCIES = ["wmbus_radio"]
+
+MULTI_CONF = True
+
+CODEOWNERS = ["@SzczepanLeon", "@kubasaw"]
+
+CONF_RADIO_ID = "radio_id"
+CONF_MAX_CLIENTS = "max_clients"
+
+socket_ns = cg.esphome_ns.namespace("socket_receiver")
+SocketReceiver = socket_ns.class_("SocketReceiver", cg.Component)
+InputFormat = socket_ns.enum("InputFormat", is_class=True)
+
+INPUT_FORMATS = {
+    # rtlwmbus or hex lines, e.g. from socket_transmitter or rtl_wmbus
+    "lines": InputFormat.LINES,
+    # 2 byte big endian length, link mode ('T'/'C'), RSSI, frame
+    "binary": InputFormat.BINARY,
+}
+
+# Frames from remote receivers (other gateways, an rtl_wmbus host) are handed
+# to the meters and on_frame triggers of radio_id as if that radio had
+# received them, with the RSSI the sender reported. Load test with
+# tools/socket_receiver_send.py.
+CONFIG_SCHEMA = cv.Schema(
+    {
+        cv.GenerateID(): cv.declare_id(SocketReceiver),
+        cv.GenerateID(CONF_RADIO_ID): cv.use_id(RadioComponent),
+        cv.Required(CONF_PORT): cv.port,
+        cv.Required(CONF_PROTOCOL): cv.enum(
+            {
+                "TCP": cg.RawExpression("SOCK_STREAM"),
+                "UDP": cg.RawExpression("SOCK_DGRAM"),
+            },
+            upper=True,
+        ),
+        cv.Optional(CONF_FORMAT, default="lines"): cv.enum(INPUT_FORMATS, lower=True),
+        # Link mode of plain hex lines, rtlwmbus lines carry their own.
+        cv.Optional(CONF_LINK_MODE, default="T1"): cv.enum(
+            {name: getattr(LinkMode, name) for name in ("C1", "T1")}, upper=True
+        ),
+        # TCP only: further connections are refused.
+        cv.Optional(CONF_MAX_CLIENTS, default=4): cv.int_range(min=1, max=16),
+    }
+).extend(cv.COMPONENT_SCHEMA)
+
+
+async def to_code(config):
+    var = cg.new_Pvariable(config[CONF_ID])
+    radio = await cg.get_variable(config[CONF_RADIO_ID])
+    cg.add(var.set_radio(radio))
+    cg.add(var.set_port(config[CONF_PORT]))
+    cg.add(var.set_protocol(config[CONF_PROTOCOL]))
+    cg.add(var.set_format(config[CONF_FORMAT]))
+    cg.add(var.set_default_link_mode(config[CONF_LINK_MODE]))
+    cg.add(var.set_max_clients(config[CONF_MAX_CLIENTS]))
+
+    await cg.register_component(var, config)
@@ -0,0 +1,65 @@
+from esphome import config_validation as cv
+from esphome import codegen as cg
+from esphome.components import sensor
+from esphome.const import (
+    CONF_ID,
+    ENTITY_CATEGORY_DIAGNOSTIC,
+    STATE_CLASS_TOTAL_INCREASING,
+)
+
+from .. import SocketReceiver, socket_ns
+
+CONF_SOCKET_RECEIVER_ID = "socket_receiver_id"
+CONF_FRAMES_RECEIVED = "frames_received"
+CONF_FRAMES_REJECTED = "frames_rejected"
+CONF_CRC_FAILURES = "crc_failures"
+CONF_BYTES_RECEIVED = "bytes_received"
+UNIT_BYTES = "B"
+
+SocketReceiverSensor = socket_ns.class_(
+    "SocketReceiverSensor",
+    cg.PollingComponent,
+    cg.Parented.template(SocketReceiver),
+)
+
+# Totals since boot, like the wmbus_radio counters.
+COUNTER_SENSORS = {
+    CONF_FRAMES_RECEIVED: "mdi:download-network",
+    # Records that held no usable wM-Bus frame.
+    CONF_FRAMES_REJECTED: "mdi:alert-circle-outline",
+    CONF_CRC_FAILURES: "mdi:alert-circle-outline",
+}
+
+CONFIG_SCHEMA = cv.Schema(
+    {
+        cv.GenerateID(): cv.declare_id(SocketReceiverSensor),
+        cv.GenerateID(CONF_SOCKET_RECEIVER_ID): cv.use_id(SocketReceiver),
+        **{
+            cv.Optional(key): sensor.sensor_schema(
+                icon=icon,
+                accuracy_decimals=0,
+                state_class=STATE_CLASS_TOTAL_INCREASING,
+                entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+            )
+            for key, icon in COUNTER_SENSORS.items()
+        },
+        cv.Optional(CONF_BYTES_RECEIVED): sensor.sensor_schema(
+            unit_of_measurement=UNIT_BYTES,
+            icon="mdi:download-network",
+            accuracy_decimals=0,
+            state_class=STATE_CLASS_TOTAL_INCREASING,
+            entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+        ),
+    }
+).extend(cv.polling_component_schema("60s"))
+
+
+async def to_code(config):
+    var = cg.new_Pvariable(config[CONF_ID])
+    await cg.register_parented(var, config[CONF_SOCKET_RECEIVER_ID])
+    await cg.register_component(var, config)
+
+    for key in (*COUNTER_SENSORS, CONF_BYTES_RECEIVED):
+        if key in config:
+            sens = await sensor.new_sensor(config[key])
+            cg.add(getattr(var, f"set_{key}_sensor")(sens))
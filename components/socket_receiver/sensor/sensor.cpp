@@ -0,0 +1,30 @@
+#include "sensor.h"
+
+#include "esphome/core/log.h"
+
+namespace esphome {
+namespace socket_receiver {
+static void publish(sensor::Sensor *sensor, uint32_t value) {
+  if (sensor != nullptr)
+    sensor->publish_state(value);
+}
+
+void SocketReceiverSensor::update() {
+  publish(this->frames_received_sensor_, this->parent_->get_frames_received());
+  publish(this->frames_rejected_sensor_, this->parent_->get_frames_rejected());
+  publish(this->crc_failures_sensor_,
+          wmbus_radio::RadioStats::get(
+              this->parent_->get_stats().crc_failures));
+  publish(this->bytes_received_sensor_, this->parent_->get_bytes_received());
+}
+
+void SocketReceiverSensor::dump_config() {
+  ESP_LOGCONFIG(TAG, "Socket Receiver Sensors:");
+  LOG_UPDATE_INTERVAL(this);
+  LOG_SENSOR("  ", "Frames received", this->frames_received_sensor_);
+  LOG_SENSOR("  ", "Frames rejected", this->frames_rejected_sensor_);
+  LOG_SENSOR("  ", "CRC failures", this->crc_failures_sensor_);
+  LOG_SENSOR("  ", "Bytes received", this->bytes_received_sensor_);
+}
+} // namespace socket_receiver
+} // namespace esphome
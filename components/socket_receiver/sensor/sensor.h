@@ -0,0 +1,36 @@
+#pragma once
+#include "esphome/components/sensor/sensor.h"
+#include "esphome/core/component.h"
+#include "esphome/core/helpers.h"
+
+#include "../socket_receiver.h"
+
+namespace esphome {
+namespace socket_receiver {
+class SocketReceiverSensor : public PollingComponent,
+                             public Parented<SocketReceiver> {
+public:
+  void update() override;
+  void dump_config() override;
+
+  void set_frames_received_sensor(sensor::Sensor *sensor) {
+    this->frames_received_sensor_ = sensor;
+  };
+  void set_frames_rejected_sensor(sensor::Sensor *sensor) {
+    this->frames_rejected_sensor_ = sensor;
+  };
+  void set_crc_failures_sensor(sensor::Sensor *sensor) {
+    this->crc_failures_sensor_ = sensor;
+  };
+  void set_bytes_received_sensor(sensor::Sensor *sensor) {
+    this->bytes_received_sensor_ = sensor;
+  };
+
+protected:
+  sensor::Sensor *frames_received_sensor_{nullptr};
+  sensor::Sensor *frames_rejected_sensor_{nullptr};
+  sensor::Sensor *crc_failures_sensor_{nullptr};
+  sensor::Sensor *bytes_received_sensor_{nullptr};
+};
+} // namespace socket_receiver
+} // namespace esphome
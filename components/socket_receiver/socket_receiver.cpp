@@ -0,0 +1,238 @@
+#include "socket_receiver.h"
+
+#include <cctype>
+#include <cerrno>
+
+#include "esphome/components/wmbus_radio/packet.h"
+
+namespace esphome {
+namespace socket_receiver {
+using wmbus_radio::RadioStats;
+
+void SocketReceiver::setup() {
+  this->socket_ = socket::socket_ip(this->protocol_, 0);
+  if (this->socket_ == nullptr) {
+    ESP_LOGE(TAG, "Socket creation failed");
+    this->mark_failed();
+    return;
+  }
+  int enable = 1;
+  this->socket_->setsockopt(SOL_SOCKET, SO_REUSEADDR, &enable, sizeof(enable));
+  this->socket_->setblocking(false);
+
+  sockaddr_storage address;
+  socklen_t address_len = socket::set_sockaddr_any(
+      (sockaddr *)&address, sizeof(address), this->port_);
+  if (this->socket_->bind((sockaddr *)&address, address_len) < 0) {
+    ESP_LOGE(TAG, "Failed to bind port %u: errno %d", this->port_, errno);
+    this->mark_failed();
+    return;
+  }
+  if (this->protocol_ == SOCK_STREAM &&
+      this->socket_->listen(this->max_clients_) < 0) {
+    ESP_LOGE(TAG, "Failed to listen: errno %d", errno);
+    this->mark_failed();
+    return;
+  }
+}
+
+void SocketReceiver::loop() {
+  if (this->protocol_ == SOCK_DGRAM) {
+    this->read_datagrams_();
+    return;
+  }
+
+  this->accept_clients_();
+  for (auto it = this->clients_.begin(); it != this->clients_.end();) {
+    if (this->read_client_(*it)) {
+      ++it;
+      continue;
+    }
+    it->socket->close();
+    it = this->clients_.erase(it);
+    ESP_LOGD(TAG, "Client disconnected, %zu left", this->clients_.size());
+  }
+}
+
+void SocketReceiver::accept_clients_() {
+  while (true) {
+    sockaddr_storage address;
+    socklen_t address_len = sizeof(address);
+    auto client = this->socket_->accept((sockaddr *)&address, &address_len);
+    if (client == nullptr)
+      return;
+    if (this->clients_.size() >= this->max_clients_) {
+      ESP_LOGW(TAG, "Refusing client, %zu already connected",
+               this->clients_.size());
+      client->close();
+      continue;
+    }
+    client->setblocking(false);
+    this->clients_.push_back({std::move(client), {}});
+    this->clients_accepted_++;
+    ESP_LOGD(TAG, "Client connected, %zu in total", this->clients_.size());
+  }
+}
+
+bool SocketReceiver::read_client_(Client &client) {
+  // A sender that keeps the socket full still leaves time for the rest of
+  // loop().
+  for (size_t reads = 0; reads < READS_PER_LOOP; reads++) {
+    uint8_t chunk[READ_CHUNK_SIZE];
+    ssize_t n = client.socket->read(chunk, sizeof(chunk));
+    if (n == 0) {
+      this->consume_(client.buffer, true);
+      return false;
+    }
+    if (n < 0)
+      return errno == EAGAIN || errno == EWOULDBLOCK;
+
+    this->bytes_received_ += n;
+    client.buffer.insert(client.buffer.end(), chunk, chunk + n);
+    if (!this->consume_(client.buffer, false)) {
+      ESP_LOGW(TAG, "Client sent a malformed record, closing connection");
+      return false;
+    }
+  }
+  return true;
+}
+
+void SocketReceiver::read_datagrams_() {
+  // Every datagram holds whole records, a batch from socket_transmitter or a
+  // single frame.
+  for (size_t reads = 0; reads < READS_PER_LOOP; reads++) {
+    this->datagram_.resize(MAX_DATAGRAM_SIZE);
+    ssize_t n = this->socket_->read(this->datagram_.data(), MAX_DATAGRAM_SIZE);
+    if (n <= 0)
+      return;
+    this->bytes_received_ += n;
+    this->datagram_.resize(n);
+    this->consume_(this->datagram_, true);
+  }
+}
+
+bool SocketReceiver::consume_(std::vector<uint8_t> &buffer,
+                              bool end_of_stream) {
+  bool framed = this->format_ == InputFormat::LINES
+                    ? this->consume_lines_(buffer, end_of_stream)
+                    : this->consume_records_(buffer);
+  if (!framed || (end_of_stream && !buffer.empty())) {
+    this->frames_rejected_++;
+    buffer.clear();
+  }
+  return framed;
+}
+
+bool SocketReceiver::consume_lines_(std::vector<uint8_t> &buffer,
+                                    bool end_of_stream) {
+  size_t start = 0;
+  for (size_t i = 0; i < buffer.size(); i++) {
+    if (buffer[i] != '\n')
+      continue;
+    this->handle_line_(buffer.data() + start, i - start);
+    start = i + 1;
+  }
+  if (end_of_stream && start < buffer.size()) {
+    this->handle_line_(buffer.data() + start, buffer.size() - start);
+    start = buffer.size();
+  }
+  buffer.erase(buffer.begin(), buffer.begin() + start);
+  return buffer.size() <= MAX_RECORD_SIZE;
+}
+
+bool SocketReceiver::consume_records_(std::vector<uint8_t> &buffer) {
+  size_t start = 0;
+  bool framed = true;
+  while (buffer.size() - start >= RECORD_HEADER_SIZE) {
+    size_t length = buffer[start] << 8 | buffer[start + 1];
+    if (length < 2 || length > MAX_RECORD_SIZE) {
+      framed = false;
+      break;
+    }
+    if (buffer.size() - start - RECORD_HEADER_SIZE < length)
+      break;
+    this->handle_record_(buffer.data() + start + RECORD_HEADER_SIZE, length);
+    start += RECORD_HEADER_SIZE + length;
+  }
+  buffer.erase(buffer.begin(), buffer.begin() + start);
+  return framed;
+}
+
+void SocketReceiver::handle_line_(const uint8_t *data, size_t length) {
+  while (length > 0 && isspace(data[length - 1]))
+    length--;
+  while (length > 0 && isspace(data[0])) {
+    data++;
+    length--;
+  }
+  if (length == 0 || data[0] == '#')
+    return;
+
+  ReplayFrame frame;
+  if (!parseReplayLine(std::string((const char *)data, length),
+                       this->default_link_mode_, &frame)) {
+    ESP_LOGD(TAG, "Ignoring line that holds no wM-Bus frame [%zu bytes]",
+             length);
+    this->frames_rejected_++;
+    return;
+  }
+  this->inject_(frame);
+}
+
+void SocketReceiver::handle_record_(const uint8_t *data, size_t length) {
+  LinkMode link_mode = LinkMode::UNKNOWN;
+  if (data[0] == 'T')
+    link_mode = LinkMode::T1;
+  else if (data[0] == 'C')
+    link_mode = LinkMode::C1;
+
+  ReplayFrame frame;
+  if (!makeReplayFrame(std::vector<uchar>(data + 2, data + length), link_mode,
+                       static_cast<int8_t>(data[1]), &frame)) {
+    ESP_LOGD(TAG, "Ignoring record that holds no wM-Bus frame [%zu bytes]",
+             length);
+    this->frames_rejected_++;
+    return;
+  }
+  this->inject_(frame);
+}
+
+void SocketReceiver::inject_(const ReplayFrame &frame) {
+  // Same conversion as a radio packet, so injected frames look exactly like
+  // received ones to the handlers.
+  auto *packet = new wmbus_radio::Packet();
+  packet->set_data(frame.packet);
+  packet->set_requires_decode(false);
+  packet->set_link_mode_hint(frame.link_mode);
+  packet->set_rssi(frame.rssi);
+  auto converted = packet->convert_to_frame(this->stats_);
+  if (!converted) {
+    this->frames_rejected_++;
+    return;
+  }
+
+  this->frames_received_++;
+  if (converted->link_mode() == LinkMode::C1)
+    RadioStats::increment(this->stats_.frames_c1);
+  else
+    RadioStats::increment(this->stats_.frames_t1);
+  this->radio_->handle_frame(std::move(*converted));
+}
+
+void SocketReceiver::dump_config() {
+  ESP_LOGCONFIG(TAG, "Socket Receiver:");
+  ESP_LOGCONFIG(TAG, "  Port: %u", this->port_);
+  ESP_LOGCONFIG(TAG, "  Protocol: %s",
+                this->protocol_ == SOCK_DGRAM ? "UDP" : "TCP");
+  ESP_LOGCONFIG(TAG, "  Format: %s",
+                this->format_ == InputFormat::LINES ? "lines" : "binary");
+  if (this->protocol_ == SOCK_STREAM)
+    ESP_LOGCONFIG(TAG, "  Clients: %zu of %zu (%u accepted)",
+                  this->clients_.size(), this->max_clients_,
+                  this->clients_accepted_);
+  ESP_LOGCONFIG(TAG, "  Frames: %u received, %u rejected, %u CRC failures",
+                this->frames_received_, this->frames_rejected_,
+                RadioStats::get(this->stats_.crc_failures));
+}
+} // namespace socket_receiver
+} // namespace esphome
@@ -0,0 +1,100 @@
+#pragma once
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "esphome/components/socket/socket.h"
+#include "esphome/components/wmbus_common/replay.h"
+#include "esphome/components/wmbus_radio/component.h"
+#include "esphome/core/component.h"
+#include "esphome/core/log.h"
+
+namespace esphome {
+namespace socket_receiver {
+static const char *TAG = "socket_receiver";
+
+enum class InputFormat : uint8_t {
+  // rtlwmbus or hex lines, as written by socket_transmitter, rtl_wmbus or
+  // wmbusmeters.
+  LINES,
+  // Records of a 2 byte big endian length followed by that many bytes:
+  // link mode ('T' or 'C'), RSSI (int8) and the frame with or without DLL
+  // CRCs.
+  BINARY,
+};
+
+// Accepts frames from remote receivers and hands them to the handlers of a
+// wmbus_radio, as if that radio had received them.
+class SocketReceiver : public Component {
+public:
+  void set_port(uint16_t port) { this->port_ = port; };
+  void set_protocol(int protocol) { this->protocol_ = protocol; };
+  void set_format(InputFormat format) { this->format_ = format; };
+  void set_default_link_mode(LinkMode mode) {
+    this->default_link_mode_ = mode;
+  };
+  void set_max_clients(size_t max_clients) {
+    this->max_clients_ = max_clients;
+  };
+  void set_radio(wmbus_radio::Radio *radio) { this->radio_ = radio; };
+
+  void setup() override;
+  void loop() override;
+  void dump_config() override;
+  float get_setup_priority() const override {
+    return setup_priority::AFTER_CONNECTION;
+  }
+
+  uint32_t get_frames_received() const { return this->frames_received_; }
+  // Records that held no usable wM-Bus frame.
+  uint32_t get_frames_rejected() const { return this->frames_rejected_; }
+  uint32_t get_bytes_received() const { return this->bytes_received_; }
+  // CRC failures of injected frames, kept apart from the radio's own.
+  const wmbus_radio::RadioStats &get_stats() const { return this->stats_; }
+
+protected:
+  struct Client {
+    std::unique_ptr<socket::Socket> socket;
+    std::vector<uint8_t> buffer;
+  };
+
+  void accept_clients_();
+  bool read_client_(Client &client);
+  void read_datagrams_();
+  // Handles the complete records at the start of buffer and removes them.
+  // False when the stream lost its framing.
+  bool consume_(std::vector<uint8_t> &buffer, bool end_of_stream);
+  bool consume_lines_(std::vector<uint8_t> &buffer, bool end_of_stream);
+  bool consume_records_(std::vector<uint8_t> &buffer);
+  void handle_line_(const uint8_t *data, size_t length);
+  void handle_record_(const uint8_t *data, size_t length);
+  void inject_(const ReplayFrame &frame);
+
+  uint16_t port_;
+  int protocol_;
+  InputFormat format_{InputFormat::LINES};
+  LinkMode default_link_mode_{LinkMode::T1};
+  size_t max_clients_{4};
+  wmbus_radio::Radio *radio_{nullptr};
+
+  // The listening TCP socket, or the bound UDP socket.
+  std::unique_ptr<socket::Socket> socket_;
+  std::vector<Client> clients_;
+  std::vector<uint8_t> datagram_;
+
+  wmbus_radio::RadioStats stats_;
+  uint32_t frames_received_{0};
+  uint32_t frames_rejected_{0};
+  uint32_t bytes_received_{0};
+  uint32_t clients_accepted_{0};
+
+  // An rtlwmbus line of the longest frame is ~600 characters.
+  static constexpr size_t MAX_RECORD_SIZE = 1024;
+  static constexpr size_t READ_CHUNK_SIZE = 512;
+  // Reads per socket and loop(), bounds the time spent in one loop().
+  static constexpr size_t READS_PER_LOOP = 4;
+  static constexpr size_t MAX_DATAGRAM_SIZE = 1500;
+  static constexpr size_t RECORD_HEADER_SIZE = 2;
+};
+} // namespace socket_receiver
+} // namespace esphome
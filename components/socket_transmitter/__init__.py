@@ -1,7 +1,15 @@
 from esphome import config_validation as cv
 from esphome import codegen as cg
 from esphome import automation
-from esphome.const import CONF_ID, CONF_IP_ADDRESS, CONF_PORT, CONF_PROTOCOL, CONF_DATA
+import esphome.final_validate as fv
+from esphome.const import (
+    CONF_ID,
+    CONF_IP_ADDRESS,
+    CONF_PORT,
+    CONF_PROTOCOL,
+    CONF_DATA,
+    CONF_FORMAT,
+)
 
 AUTO_LOAD = ["socket"]
 
@@ -15,6 +23,20 @@ SocketTransmitter = socket_ns.class_("SocketTransmitter", cg.Component)
 SocketTransmitterSendAction = socket_ns.class_(
     "SocketTransmitterSendAction", automation.Action
 )
+DropPolicy = socket_ns.enum("DropPolicy", is_class=True)
+
+CONF_QUEUE_SIZE = "queue_size"
+CONF_DROP_POLICY = "drop_policy"
+CONF_BATCH = "batch"
+CONF_MAX_BATCH_BYTES = "max_batch_bytes"
+CONF_MAX_DELAY = "max_delay"
+CONF_COMPRESSION = "compression"
+CONF_BACKLOG_SIZE = "backlog_size"
+
+DROP_POLICIES = {
+    "OLDEST": DropPolicy.DROP_OLDEST,
+    "NEWEST": DropPolicy.DROP_NEWEST,
+}
 
 CONFIG_SCHEMA = cv.Schema(
     {
@@ -28,15 +50,89 @@ CONFIG_SCHEMA = cv.Schema(
             },
             upper=True,
         ),
+        # Frames are queued and written from loop() so a slow or unreachable
+        # collector never stalls the radio path. When the queue is full the
+        # oldest (default) or the newest frame is dropped.
+        cv.Optional(CONF_QUEUE_SIZE, default=16): cv.int_range(min=1, max=256),
+        cv.Optional(CONF_DROP_POLICY, default="OLDEST"): cv.enum(
+            DROP_POLICIES, upper=True
+        ),
+        # Store-and-forward: frames that do not fit into the queue during an
+        # outage are kept in a ring of this size (PSRAM if available) and
+        # replayed in order after reconnecting. The drop policy applies once
+        # the backlog is full too.
+        cv.Optional(CONF_BACKLOG_SIZE): cv.All(
+            cv.validate_bytes, cv.int_range(min=1024)
+        ),
+        # Coalesce newline framed records (hex/rtlwmbus lines) into one datagram
+        # or stream write until max_batch_bytes (e.g. the path MTU) or max_delay
+        # is reached. Raw frames cannot be batched.
+        cv.Optional(CONF_BATCH): cv.Schema(
+            {
+                cv.Optional(CONF_MAX_BATCH_BYTES, default=1400): cv.int_range(
+                    min=64, max=65507
+                ),
+                cv.Optional(
+                    CONF_MAX_DELAY, default="1s"
+                ): cv.positive_time_period_milliseconds,
+                # Send every batch as a length prefixed LZSS envelope, decode
+                # with tools/socket_transmitter_decode.py
+                cv.Optional(CONF_COMPRESSION, default="none"): cv.one_of(
+                    "none", "lzss", lower=True
+                ),
+            }
+        ),
     }
 )
 
 
+def find_actions(value, action_name):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == action_name:
+                yield item
+            yield from find_actions(item, action_name)
+    elif isinstance(value, list):
+        for item in value:
+            yield from find_actions(item, action_name)
+
+
+def final_validate(config):
+    # Batched records are split on newlines by the collector, a raw frame may
+    # contain or end with 0x0A.
+    if CONF_BATCH not in config:
+        return config
+    for action in find_actions(
+        fv.full_config.get(), "wmbus_radio.send_frame_with_socket"
+    ):
+        if (
+            action[CONF_ID].id == config[CONF_ID].id
+            and action[CONF_FORMAT] == "raw"
+        ):
+            raise cv.Invalid(
+                "Batches are newline framed and cannot carry raw frames, "
+                "send them as hex or rtlwmbus",
+                path=[CONF_BATCH],
+            )
+    return config
+
+
+FINAL_VALIDATE_SCHEMA = final_validate
+
+
 async def to_code(config):
     var = cg.new_Pvariable(config[CONF_ID])
     cg.add(var.set_host(config[CONF_IP_ADDRESS]))
     cg.add(var.set_port(config[CONF_PORT]))
     cg.add(var.set_protocol(config[CONF_PROTOCOL]))
+    cg.add(var.set_queue_size(config[CONF_QUEUE_SIZE]))
+    cg.add(var.set_drop_policy(config[CONF_DROP_POLICY]))
+    if CONF_BACKLOG_SIZE in config:
+        cg.add(var.set_backlog_size(config[CONF_BACKLOG_SIZE]))
+    if batch := config.get(CONF_BATCH):
+        cg.add(var.set_batch(batch[CONF_MAX_BATCH_BYTES], batch[CONF_MAX_DELAY]))
+        if batch[CONF_COMPRESSION] == "lzss":
+            cg.add(var.set_compression(True))
 
     await cg.register_component(var, config)
 
@@ -0,0 +1,68 @@
+#include "backlog.h"
+
+#include <algorithm>
+#include <cstring>
+
+#include "esphome/core/helpers.h"
+
+namespace esphome {
+namespace socket_transmitter {
+bool Backlog::allocate(size_t capacity) {
+  RAMAllocator<uint8_t> allocator;
+  this->buffer_ = allocator.allocate(capacity);
+  if (this->buffer_ == nullptr)
+    return false;
+  this->capacity_ = capacity;
+  return true;
+}
+
+void Backlog::push(const uint8_t *data, size_t length, uint32_t timestamp) {
+  const size_t tail = (this->head_ + this->used_) % this->capacity_;
+  const uint8_t header[RECORD_HEADER_SIZE] = {
+      uint8_t(length >> 24),    uint8_t(length >> 16),
+      uint8_t(length >> 8),     uint8_t(length),
+      uint8_t(timestamp >> 24), uint8_t(timestamp >> 16),
+      uint8_t(timestamp >> 8),  uint8_t(timestamp),
+  };
+  this->write_(tail, header, RECORD_HEADER_SIZE);
+  this->write_((tail + RECORD_HEADER_SIZE) % this->capacity_, data, length);
+  this->used_ += RECORD_HEADER_SIZE + length;
+  this->count_++;
+}
+
+uint32_t Backlog::front_timestamp() const {
+  return this->read_u32_((this->head_ + 4) % this->capacity_);
+}
+
+std::vector<uint8_t> Backlog::pop() {
+  const size_t length = this->read_u32_(this->head_);
+  std::vector<uint8_t> record(length);
+  this->read_((this->head_ + RECORD_HEADER_SIZE) % this->capacity_,
+              record.data(), length);
+  this->head_ = (this->head_ + RECORD_HEADER_SIZE + length) % this->capacity_;
+  this->used_ -= RECORD_HEADER_SIZE + length;
+  this->count_--;
+  if (this->count_ == 0)
+    this->head_ = 0;
+  return record;
+}
+
+void Backlog::write_(size_t at, const uint8_t *data, size_t length) {
+  const size_t first = std::min(length, this->capacity_ - at);
+  std::memcpy(this->buffer_ + at, data, first);
+  std::memcpy(this->buffer_, data + first, length - first);
+}
+
+void Backlog::read_(size_t at, uint8_t *data, size_t length) const {
+  const size_t first = std::min(length, this->capacity_ - at);
+  std::memcpy(data, this->buffer_ + at, first);
+  std::memcpy(data + first, this->buffer_, length - first);
+}
+
+uint32_t Backlog::read_u32_(size_t at) const {
+  uint8_t bytes[4];
+  this->read_(at, bytes, sizeof(bytes));
+  return encode_uint32(bytes[0], bytes[1], bytes[2], bytes[3]);
+}
+} // namespace socket_transmitter
+} // namespace esphome
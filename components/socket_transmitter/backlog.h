@@ -0,0 +1,47 @@
+#pragma once
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+namespace esphome {
+namespace socket_transmitter {
+// Byte ring holding records that did not fit into the send queue while the
+// collector was unreachable or slow. The storage is allocated once, preferring
+// PSRAM, so a long outage never fragments the internal heap.
+//
+// Every record is stored as
+//   u32 length | u32 millis() when it was buffered | data
+// and may wrap around the end of the ring.
+class Backlog {
+public:
+  static constexpr size_t RECORD_HEADER_SIZE = 8;
+
+  bool allocate(size_t capacity);
+  bool is_allocated() const { return this->buffer_ != nullptr; }
+  size_t capacity() const { return this->capacity_; }
+
+  bool empty() const { return this->count_ == 0; }
+  size_t size() const { return this->count_; }
+  size_t used_bytes() const { return this->used_; }
+  bool fits(size_t length) const {
+    return this->used_ + RECORD_HEADER_SIZE + length <= this->capacity_;
+  }
+
+  // The caller has to make room first, see fits().
+  void push(const uint8_t *data, size_t length, uint32_t timestamp);
+  uint32_t front_timestamp() const;
+  std::vector<uint8_t> pop();
+
+protected:
+  void write_(size_t at, const uint8_t *data, size_t length);
+  void read_(size_t at, uint8_t *data, size_t length) const;
+  uint32_t read_u32_(size_t at) const;
+
+  uint8_t *buffer_{nullptr};
+  size_t capacity_{0};
+  size_t head_{0};
+  size_t used_{0};
+  size_t count_{0};
+};
+} // namespace socket_transmitter
+} // namespace esphome
@@ -0,0 +1,93 @@
+#include "lzss.h"
+
+#include <algorithm>
+
+namespace esphome {
+namespace socket_transmitter {
+size_t LzssCompressor::hash3_(const uint8_t *p) {
+  uint32_t v = (uint32_t(p[0]) << 16) | (uint32_t(p[1]) << 8) | p[2];
+  return (v * 2654435761u) >> (32 - HASH_BITS);
+}
+
+bool LzssCompressor::encode(const uint8_t *input, size_t length,
+                            std::vector<uint8_t> &output) {
+  if (length > MAX_INPUT_SIZE)
+    return false;
+
+  const size_t header_at = output.size();
+  output.resize(header_at + ENVELOPE_HEADER_SIZE);
+
+  size_t payload_length = this->compress_(input, length, output);
+  if (payload_length >= length) {
+    // Not worth it, store the batch as is.
+    output.resize(header_at + ENVELOPE_HEADER_SIZE);
+    output.insert(output.end(), input, input + length);
+    payload_length = length;
+  }
+
+  output[header_at + 0] = payload_length >> 8;
+  output[header_at + 1] = payload_length & 0xFF;
+  output[header_at + 2] = length >> 8;
+  output[header_at + 3] = length & 0xFF;
+  return true;
+}
+
+size_t LzssCompressor::compress_(const uint8_t *input, size_t length,
+                                 std::vector<uint8_t> &output) {
+  this->head_.fill(0);
+
+  const size_t start = output.size();
+  size_t flags_at = 0;
+  uint8_t flag_bit = 8;
+  size_t pos = 0;
+
+  while (pos < length) {
+    if (flag_bit == 8) {
+      // Bail out early once the output cannot beat the input any more.
+      if (output.size() - start >= length)
+        return output.size() - start;
+      flags_at = output.size();
+      output.push_back(0);
+      flag_bit = 0;
+    }
+
+    size_t best_length = 0;
+    size_t best_offset = 0;
+    if (pos + MIN_MATCH <= length) {
+      const size_t h = hash3_(input + pos);
+      const size_t candidate = this->head_[h];
+      this->head_[h] = pos + 1;
+      if (candidate != 0 && pos - (candidate - 1) <= WINDOW_SIZE) {
+        const size_t from = candidate - 1;
+        const size_t limit = std::min(MAX_MATCH, length - pos);
+        size_t n = 0;
+        while (n < limit && input[from + n] == input[pos + n])
+          n++;
+        if (n >= MIN_MATCH) {
+          best_length = n;
+          best_offset = pos - from;
+        }
+      }
+    }
+
+    if (best_length == 0) {
+      output[flags_at] |= 1 << flag_bit;
+      output.push_back(input[pos]);
+      pos++;
+    } else {
+      const uint16_t token =
+          ((best_offset - 1) << 4) | (best_length - MIN_MATCH);
+      output.push_back(token >> 8);
+      output.push_back(token & 0xFF);
+      // Index the skipped positions so later data can refer to them too.
+      for (size_t i = 1; i < best_length && pos + i + MIN_MATCH <= length; i++)
+        this->head_[hash3_(input + pos + i)] = pos + i + 1;
+      pos += best_length;
+    }
+    flag_bit++;
+  }
+
+  return output.size() - start;
+}
+} // namespace socket_transmitter
+} // namespace esphome
@@ -0,0 +1,42 @@
+#pragma once
+#include <array>
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+namespace esphome {
+namespace socket_transmitter {
+// Small LZSS compressor for batched uploads.
+//
+// Envelope (all integers big endian):
+//   u16 payload length | u16 original length | payload
+// When both lengths are equal the payload is stored uncompressed.
+//
+// Compressed payload: a flag byte precedes every group of up to 8 tokens, bit 0
+// first. A set bit is a literal byte, a clear bit a 2 byte back reference:
+//   (offset - 1) in 12 bits, (length - 3) in 4 bits -> oooooooo oooollll
+// The window is the batch itself, so no extra history buffer is needed; only a
+// hash table of last positions (HASH_SIZE * 2 bytes) is kept between calls.
+class LzssCompressor {
+public:
+  static constexpr size_t ENVELOPE_HEADER_SIZE = 4;
+  static constexpr size_t MAX_INPUT_SIZE = UINT16_MAX;
+  static constexpr size_t WINDOW_SIZE = 4096;
+  static constexpr size_t MIN_MATCH = 3;
+  static constexpr size_t MAX_MATCH = 18;
+
+  // Appends the envelope for input to output. Returns false when input is too
+  // large to be described by the envelope.
+  bool encode(const uint8_t *input, size_t length, std::vector<uint8_t> &output);
+
+protected:
+  size_t compress_(const uint8_t *input, size_t length, std::vector<uint8_t> &output);
+  static size_t hash3_(const uint8_t *p);
+
+  static constexpr size_t HASH_BITS = 10;
+  static constexpr size_t HASH_SIZE = 1 << HASH_BITS;
+  // Last position + 1 of every 3 byte prefix hash, 0 when unused.
+  std::array<uint16_t, HASH_SIZE> head_;
+};
+} // namespace socket_transmitter
+} // namespace esphome
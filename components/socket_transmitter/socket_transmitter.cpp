@@ -1,36 +1,316 @@
 #include "socket_transmitter.h"
 
+#include <algorithm>
+#include <cerrno>
+
+#include <sys/select.h>
+
+#include "esphome/core/hal.h"
+
 namespace esphome {
 namespace socket_transmitter {
-void SocketTransmitter::send(std::string data) {
-  return this->send((uint8_t *)data.c_str(), data.length());
+void SocketTransmitter::setup() {
+  if (this->backlog_size_ > 0 && !this->backlog_.allocate(this->backlog_size_))
+    ESP_LOGE(TAG, "Failed to allocate %zu bytes for the backlog",
+             this->backlog_size_);
+}
+
+void SocketTransmitter::send(const std::string &data) {
+  return this->send((const uint8_t *)data.data(), data.length());
 }
 
-void SocketTransmitter::send(std::vector<uint8_t> data) {
+void SocketTransmitter::send(const std::vector<uint8_t> &data) {
   return this->send(data.data(), data.size());
 }
 
+void SocketTransmitter::send(std::vector<uint8_t> &&data) {
+  if (this->batching_)
+    return this->add_to_batch_(data.data(), data.size());
+  return this->enqueue_(std::move(data));
+}
+
 void SocketTransmitter::send(const uint8_t *data, size_t length) {
-  ESP_LOGD(TAG, "Setting up socket transmitter");
+  if (this->batching_)
+    return this->add_to_batch_(data, length);
+  return this->enqueue_(std::vector<uint8_t>(data, data + length));
+}
+
+void SocketTransmitter::add_to_batch_(const uint8_t *data, size_t length) {
+  const bool needs_newline = length == 0 || data[length - 1] != '\n';
+  const size_t framed_length = length + (needs_newline ? 1 : 0);
+
+  if (!this->batch_.empty() &&
+      this->batch_.size() + framed_length > this->max_batch_bytes_)
+    this->flush_batch_();
+
+  if (this->batch_.empty()) {
+    this->batch_.reserve(this->max_batch_bytes_);
+    this->batch_started_ms_ = millis();
+  }
+  this->batch_.insert(this->batch_.end(), data, data + length);
+  if (needs_newline)
+    this->batch_.push_back('\n');
+
+  // Oversized records travel alone rather than being split.
+  if (this->batch_.size() >= this->max_batch_bytes_)
+    this->flush_batch_();
+}
+
+void SocketTransmitter::flush_batch_() {
+  if (this->batch_.empty())
+    return;
+  ESP_LOGV(TAG, "Flushing batch [%zu bytes]", this->batch_.size());
+  if (this->compression_) {
+    std::vector<uint8_t> envelope;
+    if (this->compressor_.encode(this->batch_.data(), this->batch_.size(),
+                                 envelope)) {
+      ESP_LOGV(TAG, "Compressed batch %zu -> %zu bytes", this->batch_.size(),
+               envelope.size());
+      this->uncompressed_bytes_ += this->batch_.size();
+      this->compressed_bytes_ += envelope.size();
+      this->batch_.clear();
+      this->enqueue_(std::move(envelope));
+      return;
+    }
+    ESP_LOGW(TAG, "Batch too large to compress [%zu bytes], dropping",
+             this->batch_.size());
+    this->dropped_records_++;
+    this->dropped_bytes_ += this->batch_.size();
+    this->batch_.clear();
+    return;
+  }
+  this->enqueue_(std::move(this->batch_));
+  this->batch_ = {};
+}
+
+void SocketTransmitter::enqueue_(std::vector<uint8_t> &&record) {
+  if (this->queue_.size() >= this->queue_size_) {
+    // Never touch the record that is on the wire.
+    auto oldest = this->front_pinned_ ? std::next(this->queue_.begin())
+                                      : this->queue_.begin();
+    if (oldest == this->queue_.end()) {
+      this->drop_(record);
+      return;
+    }
+    if (this->backlog_.is_allocated()) {
+      // The oldest queued record is newer than anything in the backlog.
+      if (!this->spill_(std::move(*oldest))) {
+        this->drop_(record);
+        return;
+      }
+    } else if (this->drop_policy_ == DropPolicy::DROP_OLDEST) {
+      this->drop_(*oldest);
+    } else {
+      this->drop_(record);
+      return;
+    }
+    this->queue_.erase(oldest);
+  }
+
+  ESP_LOGV(TAG, "Queueing frame [%zu bytes]", record.size());
+  this->queue_.push_back(std::move(record));
+  this->queue_high_water_ =
+      std::max(this->queue_high_water_, this->queue_.size());
+}
+
+void SocketTransmitter::drop_(const std::vector<uint8_t> &record) {
+  this->dropped_records_++;
+  this->dropped_bytes_ += record.size();
+  ESP_LOGW(TAG, "Queue full, dropping frame [%zu bytes]", record.size());
+}
+
+bool SocketTransmitter::spill_(std::vector<uint8_t> &&record) {
+  if (record.size() + Backlog::RECORD_HEADER_SIZE > this->backlog_.capacity()) {
+    this->drop_(record);
+    return true;
+  }
+  if (!this->backlog_.fits(record.size()) &&
+      this->drop_policy_ == DropPolicy::DROP_NEWEST)
+    return false;
+  while (!this->backlog_.fits(record.size()))
+    this->drop_(this->backlog_.pop());
+  ESP_LOGV(TAG, "Moving frame to backlog [%zu bytes]", record.size());
+  this->backlog_.push(record.data(), record.size(), millis());
+  return true;
+}
+
+void SocketTransmitter::loop() {
+  if (!this->batch_.empty() &&
+      millis() - this->batch_started_ms_ >= this->max_delay_ms_)
+    this->flush_batch_();
+
+  switch (this->state_) {
+  case ConnectionState::DISCONNECTED:
+    if ((!this->queue_.empty() || !this->backlog_.empty()) &&
+        (int32_t)(millis() - this->next_connect_ms_) >= 0)
+      this->start_connect_();
+    return;
+  case ConnectionState::CONNECTING:
+    this->check_connect_();
+    return;
+  case ConnectionState::CONNECTED:
+    break;
+  }
+
+  if (this->protocol == SOCK_STREAM) {
+    const uint32_t now = millis();
+    if (now - this->last_peer_check_ms_ >= PEER_CHECK_INTERVAL_MS) {
+      this->last_peer_check_ms_ = now;
+      if (this->peer_closed_()) {
+        this->disconnect_("closed by peer");
+        return;
+      }
+    }
+  }
+
+  this->drain_();
+}
+
+void SocketTransmitter::drain_() {
+  while (true) {
+    if (!this->front_pinned_) {
+      // Backlogged records are older than everything still in the queue.
+      if (!this->backlog_.empty())
+        this->queue_.push_front(this->backlog_.pop());
+      else if (this->queue_.empty())
+        return;
+      this->front_pinned_ = true;
+    }
+
+    auto &record = this->queue_.front();
+    ssize_t n_bytes = this->socket_->write(record.data() + this->front_offset_,
+                                           record.size() - this->front_offset_);
+    if (n_bytes < 0) {
+      if (errno == EAGAIN || errno == EWOULDBLOCK)
+        return; // Socket buffer full, continue on next loop()
+      ESP_LOGE(TAG, "Failed to send message (errno %d)", errno);
+      this->disconnect_("write failed");
+      return;
+    }
+
+    // Datagrams are sent whole, only streams can be written partially.
+    this->front_offset_ += n_bytes;
+    if (this->protocol == SOCK_STREAM && this->front_offset_ < record.size())
+      return;
+
+    ESP_LOGD(TAG, "Sent frame [%zu bytes]", record.size());
+    // The collector took a record, the connection works.
+    this->backoff_ms_ = MIN_BACKOFF_MS;
+    this->front_offset_ = 0;
+    this->front_pinned_ = false;
+    this->queue_.pop_front();
+  }
+}
+
+void SocketTransmitter::start_connect_() {
+  ESP_LOGD(TAG, "Connecting %s ...",
+           this->protocol == SOCK_DGRAM ? "UDP" : "TCP");
   this->socket_ = socket::socket_ip(this->protocol, 0);
+  if (this->socket_ == nullptr) {
+    this->connect_failed_("socket creation failed");
+    return;
+  }
   int enable = 1;
   this->socket_->setsockopt(SOL_SOCKET, SO_REUSEADDR, &enable, sizeof(enable));
+  this->socket_->setblocking(false);
 
-  ESP_LOGD(TAG, "Connecting %s ...",
-           this->protocol == SOCK_DGRAM ? "UDP" : "TCP");
-  sockaddr destination;
-  socket::set_sockaddr(&destination, sizeof(destination), this->host,
-                       this->port);
-  if (this->socket_->connect(&destination, sizeof(destination)) < 0) {
-    ESP_LOGE(TAG, "Failed to connect");
+  sockaddr_storage destination;
+  socklen_t destination_len = socket::set_sockaddr(
+      (sockaddr *)&destination, sizeof(destination), this->host, this->port);
+  this->connect_started_ms_ = millis();
+  this->state_ = ConnectionState::CONNECTING;
+  if (this->socket_->connect((sockaddr *)&destination, destination_len) < 0 &&
+      errno != EINPROGRESS) {
+    this->connect_failed_("connect failed");
+    return;
+  }
+  this->check_connect_();
+}
+
+void SocketTransmitter::check_connect_() {
+  // The non-blocking connect has finished once the socket becomes writable.
+  int fd = this->socket_->get_fd();
+  fd_set write_fds;
+  FD_ZERO(&write_fds);
+  FD_SET(fd, &write_fds);
+  timeval no_wait = {0, 0};
+  if (::select(fd + 1, nullptr, &write_fds, nullptr, &no_wait) <= 0) {
+    if (millis() - this->connect_started_ms_ > CONNECT_TIMEOUT_MS)
+      this->connect_failed_("connect timed out");
     return;
   }
 
-  ESP_LOGD(TAG, "Sending frame [%d bytes]", length);
-  int n_bytes = this->socket_->write(data, length);
-  if (n_bytes < 0)
-    ESP_LOGE(TAG, "Failed to send message");
+  int error = 0;
+  socklen_t error_len = sizeof(error);
+  this->socket_->getsockopt(SOL_SOCKET, SO_ERROR, &error, &error_len);
+  if (error != 0) {
+    ESP_LOGD(TAG, "connect: errno %d", error);
+    this->connect_failed_("connect failed");
+    return;
+  }
+
+  const uint32_t now = millis();
+  if (this->connect_count_++ > 0)
+    this->reconnect_count_++;
+  this->state_ = ConnectionState::CONNECTED;
+  this->connected_at_ms_ = now;
+  this->last_peer_check_ms_ = now;
+  ESP_LOGI(TAG, "Connected to %s:%d", this->host.c_str(), this->port);
+}
+
+void SocketTransmitter::connect_failed_(const char *reason) {
+  ESP_LOGE(TAG, "Failed to connect (%s), retrying in %us", reason,
+           this->backoff_ms_ / 1000);
+  if (this->socket_ != nullptr)
+    this->socket_->close();
+  this->socket_ = nullptr;
+  this->state_ = ConnectionState::DISCONNECTED;
+  this->next_connect_ms_ = millis() + this->backoff_ms_;
+  this->backoff_ms_ = std::min(this->backoff_ms_ * 2, MAX_BACKOFF_MS);
+}
+
+void SocketTransmitter::disconnect_(const char *reason) {
+  if (this->socket_ == nullptr)
+    return;
+  this->last_connection_lifetime_ms_ = millis() - this->connected_at_ms_;
+  // A collector that accepts and closes right away backs off like one that
+  // refuses the connection.
+  if (this->last_connection_lifetime_ms_ >= STABLE_CONNECTION_MS)
+    this->backoff_ms_ = MIN_BACKOFF_MS;
+  ESP_LOGW(TAG, "Connection to %s:%d %s after %us, reconnecting in %us",
+           this->host.c_str(), this->port, reason,
+           this->last_connection_lifetime_ms_ / 1000, this->backoff_ms_ / 1000);
   this->socket_->close();
+  this->socket_ = nullptr;
+  this->state_ = ConnectionState::DISCONNECTED;
+  // A partially written record cannot be resumed on a new stream; resend it.
+  this->front_offset_ = 0;
+  this->next_connect_ms_ = millis() + this->backoff_ms_;
+  this->backoff_ms_ = std::min(this->backoff_ms_ * 2, MAX_BACKOFF_MS);
+}
+
+bool SocketTransmitter::peer_closed_() {
+  // A TCP peer that shut down its side makes read() return 0 immediately.
+  // The socket is non-blocking, so a live connection costs nothing.
+  uint8_t buffer[16];
+  ssize_t n = this->socket_->read(buffer, sizeof(buffer));
+  if (n == 0)
+    return true;
+  if (n < 0)
+    return errno != EAGAIN && errno != EWOULDBLOCK;
+  return false; // Collectors are not expected to talk back, discard
+}
+
+uint32_t SocketTransmitter::get_backlog_age_ms() const {
+  if (this->backlog_.empty())
+    return 0;
+  return millis() - this->backlog_.front_timestamp();
+}
+
+uint32_t SocketTransmitter::get_connection_lifetime_ms() const {
+  if (!this->is_connected())
+    return 0;
+  return millis() - this->connected_at_ms_;
 }
 
 void SocketTransmitter::dump_config() {
@@ -39,6 +319,24 @@ void SocketTransmitter::dump_config() {
   ESP_LOGCONFIG(TAG, "Socket Transmitter:");
   ESP_LOGCONFIG(TAG, "  Destination: %s:%d", this->host.c_str(), this->port);
   ESP_LOGCONFIG(TAG, "  Protocol: %s", protocol);
+  ESP_LOGCONFIG(TAG, "  Queue size: %zu (drop %s)", this->queue_size_,
+                this->drop_policy_ == DropPolicy::DROP_OLDEST ? "oldest"
+                                                              : "newest");
+  if (this->batching_)
+    ESP_LOGCONFIG(TAG, "  Batching: up to %zu bytes or %ums%s",
+                  this->max_batch_bytes_, this->max_delay_ms_,
+                  this->compression_ ? ", LZSS compressed" : "");
+  if (this->compressed_bytes_ > 0)
+    ESP_LOGCONFIG(TAG, "  Compression: %u -> %u bytes",
+                  this->uncompressed_bytes_, this->compressed_bytes_);
+  if (this->backlog_.is_allocated())
+    ESP_LOGCONFIG(TAG, "  Backlog: %zu/%zu bytes, %zu frames, oldest %us",
+                  this->backlog_.used_bytes(), this->backlog_.capacity(),
+                  this->backlog_.size(), this->get_backlog_age_ms() / 1000);
+  ESP_LOGCONFIG(TAG, "  Connected: %s (reconnects: %u)",
+                YESNO(this->is_connected()), this->reconnect_count_);
+  ESP_LOGCONFIG(TAG, "  Dropped: %u frames, %u bytes", this->dropped_records_,
+                this->dropped_bytes_);
 }
 } // namespace socket_transmitter
 } // namespace esphome
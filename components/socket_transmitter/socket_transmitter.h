@@ -1,4 +1,5 @@
 #pragma once
+#include <deque>
 #include <string>
 #include <vector>
 
@@ -7,28 +8,141 @@
 #include "esphome/core/component.h"
 #include "esphome/core/log.h"
 
+#include "backlog.h"
+#include "lzss.h"
+
 namespace esphome {
 namespace socket_transmitter {
 static const char *TAG = "socket_transmitter";
 
+enum class DropPolicy : uint8_t {
+  DROP_OLDEST,
+  DROP_NEWEST,
+};
+
+enum class ConnectionState : uint8_t {
+  DISCONNECTED,
+  CONNECTING,
+  CONNECTED,
+};
+
 class SocketTransmitter : public Component {
 public:
   void set_host(std::string host) { this->host = host; };
   void set_port(int port) { this->port = port; };
   void set_protocol(int protocol) { this->protocol = protocol; };
-  void send(std::string data);
-  void send(std::vector<uint8_t> data);
+  void set_queue_size(size_t queue_size) { this->queue_size_ = queue_size; };
+  void set_drop_policy(DropPolicy policy) { this->drop_policy_ = policy; };
+  void set_batch(size_t max_batch_bytes, uint32_t max_delay_ms) {
+    this->batching_ = true;
+    this->max_batch_bytes_ = max_batch_bytes;
+    this->max_delay_ms_ = max_delay_ms;
+  };
+  void set_compression(bool enabled) { this->compression_ = enabled; };
+  void set_backlog_size(size_t backlog_size) {
+    this->backlog_size_ = backlog_size;
+  };
+  void send(const std::string &data);
+  void send(const std::vector<uint8_t> &data);
+  void send(std::vector<uint8_t> &&data);
   void send(const uint8_t *data, size_t length);
+  void setup() override;
+  void loop() override;
   void dump_config() override;
   float get_setup_priority() const override {
     return setup_priority::AFTER_CONNECTION;
   }
 
+  bool is_connected() const {
+    return this->state_ == ConnectionState::CONNECTED;
+  }
+  uint32_t get_connect_count() const { return this->connect_count_; }
+  uint32_t get_reconnect_count() const { return this->reconnect_count_; }
+  uint32_t get_connection_lifetime_ms() const;
+  uint32_t get_last_connection_lifetime_ms() const {
+    return this->last_connection_lifetime_ms_;
+  }
+
+  size_t get_queue_depth() const { return this->queue_.size(); }
+  size_t get_queue_high_water() const { return this->queue_high_water_; }
+  uint32_t get_dropped_records() const { return this->dropped_records_; }
+  uint32_t get_dropped_bytes() const { return this->dropped_bytes_; }
+
+  size_t get_backlog_records() const { return this->backlog_.size(); }
+  size_t get_backlog_bytes() const { return this->backlog_.used_bytes(); }
+  // Time the oldest buffered record has been waiting, 0 when empty.
+  uint32_t get_backlog_age_ms() const;
+
 protected:
+  void add_to_batch_(const uint8_t *data, size_t length);
+  void flush_batch_();
+  void enqueue_(std::vector<uint8_t> &&record);
+  void drop_(const std::vector<uint8_t> &record);
+  bool spill_(std::vector<uint8_t> &&record);
+  void drain_();
+  void start_connect_();
+  void check_connect_();
+  void connect_failed_(const char *reason);
+  void disconnect_(const char *reason);
+  bool peer_closed_();
+
   std::string host;
   int port;
   int protocol;
   std::unique_ptr<socket::Socket> socket_;
+  ConnectionState state_{ConnectionState::DISCONNECTED};
+
+  // Records waiting to be written. The socket is non-blocking and the queue is
+  // drained from loop(), so send() never waits for the network.
+  std::deque<std::vector<uint8_t>> queue_;
+  size_t queue_size_{16};
+  DropPolicy drop_policy_{DropPolicy::DROP_OLDEST};
+  // Bytes of queue_.front() already written by a partial TCP write.
+  size_t front_offset_{0};
+  // queue_.front() is the next record on the wire and must not be dropped or
+  // moved, even if nothing of it has been written yet.
+  bool front_pinned_{false};
+  size_t queue_high_water_{0};
+  uint32_t dropped_records_{0};
+  uint32_t dropped_bytes_{0};
+
+  // Optional store-and-forward: records pushed out of a full queue are kept in
+  // order in a (PSRAM) ring and replayed before the queue once the collector
+  // accepts data again. Only when the ring is full does drop_policy_ apply.
+  size_t backlog_size_{0};
+  Backlog backlog_;
+
+  // Optional batching: records are newline framed and coalesced until the
+  // batch would exceed max_batch_bytes_ or max_delay_ms_ has passed.
+  bool batching_{false};
+  size_t max_batch_bytes_{0};
+  uint32_t max_delay_ms_{0};
+  std::vector<uint8_t> batch_;
+  uint32_t batch_started_ms_{0};
+  // Wrap every batch into a length prefixed, LZSS compressed envelope.
+  bool compression_{false};
+  LzssCompressor compressor_;
+  uint32_t uncompressed_bytes_{0};
+  uint32_t compressed_bytes_{0};
+
+  // Reconnect attempts are spaced with exponential backoff so an unreachable
+  // collector costs one connect() per backoff period instead of one per frame.
+  // It is reset once a record was sent or a connection lived
+  // STABLE_CONNECTION_MS.
+  uint32_t backoff_ms_{MIN_BACKOFF_MS};
+  uint32_t next_connect_ms_{0};
+  uint32_t connect_started_ms_{0};
+  uint32_t last_peer_check_ms_{0};
+  uint32_t connected_at_ms_{0};
+  uint32_t last_connection_lifetime_ms_{0};
+  uint32_t connect_count_{0};
+  uint32_t reconnect_count_{0};
+
+  static constexpr uint32_t MIN_BACKOFF_MS = 1000;
+  static constexpr uint32_t MAX_BACKOFF_MS = 60000;
+  static constexpr uint32_t STABLE_CONNECTION_MS = 30000;
+  static constexpr uint32_t CONNECT_TIMEOUT_MS = 5000;
+  static constexpr uint32_t PEER_CHECK_INTERVAL_MS = 1000;
 };
 
 template <typename StrOrVector, typename... Ts>
@@ -0,0 +1,111 @@
+#include "cbor_writer.h"
+
+#include <cmath>
+#include <cstring>
+
+static const uint8_t CBOR_UINT = 0;
+static const uint8_t CBOR_NINT = 1;
+static const uint8_t CBOR_TEXT = 3;
+static const uint8_t CBOR_ARRAY = 4;
+static const uint8_t CBOR_INDEFINITE_MAP = 0xBF;
+static const uint8_t CBOR_BREAK = 0xFF;
+static const uint8_t CBOR_NULL = 0xF6;
+static const uint8_t CBOR_FLOAT32 = 0xFA;
+static const uint8_t CBOR_FLOAT64 = 0xFB;
+
+void CborWriter::beginObject() { out_->push_back(CBOR_INDEFINITE_MAP); }
+
+void CborWriter::endObject() { out_->push_back(CBOR_BREAK); }
+
+void CborWriter::key(const std::string &name) { stringValue(name); }
+
+void CborWriter::key(const std::string &name, const std::string &suffix) {
+  head(CBOR_TEXT, name.size() + 1 + suffix.size());
+  out_->insert(out_->end(), name.begin(), name.end());
+  out_->push_back('_');
+  out_->insert(out_->end(), suffix.begin(), suffix.end());
+}
+
+void CborWriter::fieldKey(int index, int storage_nr, int tariff_nr,
+                          int subunit_nr) {
+  if (storage_nr < 0) {
+    integer(index);
+    return;
+  }
+  head(CBOR_ARRAY, 4);
+  integer(index);
+  integer(storage_nr);
+  integer(tariff_nr);
+  integer(subunit_nr);
+}
+
+void CborWriter::stringValue(const std::string &v) {
+  head(CBOR_TEXT, v.size());
+  out_->insert(out_->end(), v.begin(), v.end());
+}
+
+void CborWriter::nullValue() { out_->push_back(CBOR_NULL); }
+
+void CborWriter::intValue(long v) { integer(v); }
+
+void CborWriter::numberValue(double v) {
+  if (std::isnan(v)) {
+    nullValue();
+    return;
+  }
+  // Doubles hold every integer up to 2^53 exactly.
+  if (v == std::trunc(v) && std::fabs(v) <= 9007199254740992.0) {
+    integer((int64_t)v);
+    return;
+  }
+
+  uint8_t bytes[8];
+  float f = (float)v;
+  if ((double)f == v) {
+    uint32_t bits;
+    memcpy(&bits, &f, sizeof(bits));
+    out_->push_back(CBOR_FLOAT32);
+    for (int i = 3; i >= 0; i--)
+      bytes[3 - i] = bits >> (8 * i);
+    out_->insert(out_->end(), bytes, bytes + 4);
+    return;
+  }
+
+  uint64_t bits;
+  memcpy(&bits, &v, sizeof(bits));
+  out_->push_back(CBOR_FLOAT64);
+  for (int i = 7; i >= 0; i--)
+    bytes[7 - i] = bits >> (8 * i);
+  out_->insert(out_->end(), bytes, bytes + 8);
+}
+
+void CborWriter::integer(int64_t v) {
+  if (v >= 0)
+    head(CBOR_UINT, v);
+  else
+    head(CBOR_NINT, -1 - v);
+}
+
+void CborWriter::head(uint8_t major, uint64_t value) {
+  major <<= 5;
+  if (value < 24) {
+    out_->push_back(major | value);
+    return;
+  }
+  int size;
+  if (value <= 0xFF) {
+    out_->push_back(major | 24);
+    size = 1;
+  } else if (value <= 0xFFFF) {
+    out_->push_back(major | 25);
+    size = 2;
+  } else if (value <= 0xFFFFFFFF) {
+    out_->push_back(major | 26);
+    size = 4;
+  } else {
+    out_->push_back(major | 27);
+    size = 8;
+  }
+  for (int i = size - 1; i >= 0; i--)
+    out_->push_back(value >> (8 * i));
+}
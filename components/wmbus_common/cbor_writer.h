@@ -0,0 +1,44 @@
+#ifndef CBOR_WRITER_H
+#define CBOR_WRITER_H
+
+#include <cstdint>
+#include <string>
+#include <vector>
+
+#include "field_writer.h"
+
+// Appends the meter object as CBOR (RFC 8949) to a caller owned buffer.
+//
+// The object is an indefinite length map with the same text keys and values
+// as the json output. Integral numbers become CBOR integers, others the
+// shortest float that holds them exactly. With field ids enabled, driver
+// fields are keyed by their field index instead of their name, or by
+// [index, storage, tariff, subunit] for fields that expand per storage etc.
+struct CborWriter : public FieldWriter {
+  CborWriter(std::vector<uint8_t> *out, bool field_ids = false)
+      : out_(out), field_ids_(field_ids) {}
+
+  void beginObject() override;
+  void endObject() override;
+
+  void key(const std::string &name) override;
+  void key(const std::string &name, const std::string &suffix) override;
+
+  bool useFieldIds() override { return field_ids_; }
+  void fieldKey(int index, int storage_nr, int tariff_nr,
+                int subunit_nr) override;
+
+  void stringValue(const std::string &v) override;
+  void nullValue() override;
+  void intValue(long v) override;
+  void numberValue(double v) override;
+
+private:
+  void head(uint8_t major, uint64_t value);
+  void integer(int64_t v);
+
+  std::vector<uint8_t> *out_;
+  bool field_ids_;
+};
+
+#endif
@@ -16,6 +16,7 @@
 */
 
 #include "dvparser.h"
+#include "latency.h"
 #include "util.h"
 #include "wmbus.h"
 
@@ -183,6 +184,7 @@ bool parseDV(Telegram *t, std::vector<uchar> &databytes,
              DVEntryMap *dv_entries,
              std::vector<uchar>::iterator *format, size_t format_len,
              uint16_t *format_hash) {
+  LATENCY_PROBE(ParseDV);
   std::map<std::string, int> dv_count;
   std::vector<uchar> format_bytes;
   std::vector<uchar> id_bytes;
@@ -0,0 +1,12 @@
+#include "field_writer.h"
+
+void FieldWriter::keyValuePair(const std::string &s) {
+  size_t p = s.find('=');
+  if (p == std::string::npos) {
+    key(s);
+    stringValue("");
+    return;
+  }
+  key(s.substr(0, p));
+  stringValue(s.substr(p + 1));
+}
@@ -0,0 +1,37 @@
+#ifndef FIELD_WRITER_H
+#define FIELD_WRITER_H
+
+#include <string>
+
+// Sink for the flat object printed by MeterCommonImplementation::printFields.
+// JsonWriter and CborWriter render the same members in their own encoding.
+struct FieldWriter {
+  virtual ~FieldWriter() = default;
+
+  virtual void beginObject() = 0;
+  virtual void endObject() = 0;
+
+  // Member keys, optionally with a unit suffix: "<name>_<suffix>".
+  virtual void key(const std::string &name) = 0;
+  virtual void key(const std::string &name, const std::string &suffix) = 0;
+
+  // Writers that return true get driver fields keyed by fieldKey() instead of
+  // their rendered name. The index is the position of the field in the driver
+  // and stable across firmware versions as long as the driver is unchanged.
+  // storage_nr, tariff_nr and subunit_nr are -1 unless the field name is a
+  // pattern like total_at_month_{storage_counter}.
+  virtual bool useFieldIds() { return false; }
+  virtual void fieldKey(int index, int storage_nr, int tariff_nr,
+                        int subunit_nr) {}
+
+  virtual void stringValue(const std::string &v) = 0;
+  virtual void nullValue() = 0;
+  virtual void intValue(long v) = 0;
+  // NaN is written as null.
+  virtual void numberValue(double v) = 0;
+
+  // "key=value" as used by extra constant fields.
+  void keyValuePair(const std::string &s);
+};
+
+#endif
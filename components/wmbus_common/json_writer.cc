@@ -0,0 +1,104 @@
+#include "json_writer.h"
+
+#include <cmath>
+#include <cstdio>
+
+void JsonWriter::beginObject() {
+  *out_ += '{';
+  first_ = true;
+}
+
+void JsonWriter::endObject() {
+  if (pretty_print_)
+    *out_ += '\n';
+  *out_ += '}';
+}
+
+void JsonWriter::beginKey() {
+  if (!first_)
+    *out_ += ',';
+  first_ = false;
+  if (pretty_print_)
+    out_->append("\n    ");
+  *out_ += '"';
+}
+
+void JsonWriter::key(const std::string &name) {
+  beginKey();
+  escape(name.data(), name.size());
+  out_->append("\":");
+}
+
+void JsonWriter::key(const std::string &name, const std::string &suffix) {
+  beginKey();
+  escape(name.data(), name.size());
+  *out_ += '_';
+  escape(suffix.data(), suffix.size());
+  out_->append("\":");
+}
+
+void JsonWriter::stringValue(const std::string &v) {
+  *out_ += '"';
+  escape(v.data(), v.size());
+  *out_ += '"';
+}
+
+void JsonWriter::nullValue() { out_->append("null"); }
+
+void JsonWriter::intValue(long v) {
+  char buf[24];
+  int n = snprintf(buf, sizeof(buf), "%ld", v);
+  out_->append(buf, n);
+}
+
+void JsonWriter::numberValue(double v) {
+  if (std::isnan(v)) {
+    nullValue();
+    return;
+  }
+  // %f of the largest doubles needs more than 300 characters.
+  char buf[320];
+  int n = snprintf(buf, sizeof(buf), "%f", v);
+  if (n <= 0 || (size_t)n >= sizeof(buf)) {
+    nullValue();
+    return;
+  }
+  // "%f" always prints a '.', which stops the trimming.
+  while (buf[n - 1] == '0')
+    n--;
+  if (buf[n - 1] == '.')
+    n--;
+  out_->append(buf, n);
+}
+
+void JsonWriter::escape(const char *s, size_t len) {
+  static const char HEX_CHARS[] = "0123456789abcdef";
+  for (size_t i = 0; i < len; i++) {
+    unsigned char c = s[i];
+    switch (c) {
+    case '"':
+      out_->append("\\\"");
+      break;
+    case '\\':
+      out_->append("\\\\");
+      break;
+    case '\n':
+      out_->append("\\n");
+      break;
+    case '\r':
+      out_->append("\\r");
+      break;
+    case '\t':
+      out_->append("\\t");
+      break;
+    default:
+      if (c < 0x20) {
+        out_->append("\\u00");
+        *out_ += HEX_CHARS[c >> 4];
+        *out_ += HEX_CHARS[c & 0x0F];
+      } else {
+        *out_ += (char)c;
+      }
+    }
+  }
+}
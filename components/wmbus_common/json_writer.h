@@ -0,0 +1,39 @@
+#ifndef JSON_WRITER_H
+#define JSON_WRITER_H
+
+#include <cstddef>
+#include <string>
+
+#include "field_writer.h"
+
+// Appends a flat JSON object to a caller owned string without building
+// temporaries for every member. Keys and string values are escaped.
+//
+// Used without beginObject()/endObject() it renders bare "key":value members,
+// which is what FieldInfo::renderJson returns.
+struct JsonWriter : public FieldWriter {
+  JsonWriter(std::string *out, bool pretty_print = false)
+      : out_(out), pretty_print_(pretty_print) {}
+
+  void beginObject() override;
+  void endObject() override;
+
+  void key(const std::string &name) override;
+  void key(const std::string &name, const std::string &suffix) override;
+
+  void stringValue(const std::string &v) override;
+  void nullValue() override;
+  void intValue(long v) override;
+  // Same representation as valueToString: 6 decimals, trailing zeros removed.
+  void numberValue(double v) override;
+
+private:
+  void beginKey();
+  void escape(const char *s, size_t len);
+
+  std::string *out_;
+  bool pretty_print_;
+  bool first_ = true;
+};
+
+#endif
@@ -0,0 +1,87 @@
+#include "latency.h"
+
+#include <cmath>
+
+#ifdef WMBUS_LATENCY_PROBES
+#include "esphome/core/hal.h"
+#endif
+
+static const char *LATENCY_STAGE_NAMES[LATENCY_STAGE_COUNT] = {
+    "isr_wakeup", "fifo_drain", "queue_wait",       "crc_trim",    "header_parse",
+    "decrypt",    "parse_dv",   "field_extraction", "json_render", "publish",
+};
+
+const char *latencyStageName(LatencyStage stage) {
+  size_t index = static_cast<size_t>(stage);
+  return index < LATENCY_STAGE_COUNT ? LATENCY_STAGE_NAMES[index] : "unknown";
+}
+
+size_t LatencyHistogram::bucketOf(uint32_t us) {
+  if (us < EXACT)
+    return us;
+  // Position of the highest set bit, at least 3 here.
+  size_t exponent = 31 - __builtin_clz(us);
+  size_t sub = (us >> (exponent - 2)) & (SUB_BUCKETS - 1);
+  size_t bucket = EXACT + (exponent - 3) * SUB_BUCKETS + sub;
+  return bucket < BUCKETS ? bucket : BUCKETS - 1;
+}
+
+uint32_t LatencyHistogram::bucketLimit(size_t bucket) {
+  if (bucket < EXACT)
+    return bucket;
+  size_t exponent = 3 + (bucket - EXACT) / SUB_BUCKETS;
+  size_t sub = (bucket - EXACT) % SUB_BUCKETS;
+  // Largest value falling into the bucket.
+  return (uint32_t(SUB_BUCKETS + sub + 1) << (exponent - 2)) - 1;
+}
+
+void LatencyHistogram::record(uint32_t us) {
+  buckets_[bucketOf(us)]++;
+  count_++;
+  if (us > max_)
+    max_ = us;
+}
+
+void LatencyHistogram::reset() {
+  for (auto &bucket : buckets_)
+    bucket = 0;
+  count_ = 0;
+  max_ = 0;
+}
+
+uint32_t LatencyHistogram::percentile(float p) const {
+  if (count_ == 0)
+    return 0;
+  uint32_t rank = std::ceil(p / 100.0f * count_);
+  if (rank == 0)
+    rank = 1;
+  uint32_t seen = 0;
+  for (size_t i = 0; i < BUCKETS; i++) {
+    seen += buckets_[i];
+    if (seen >= rank)
+      return i == BUCKETS - 1 || bucketLimit(i) > max_ ? max_ : bucketLimit(i);
+  }
+  return max_;
+}
+
+#ifdef WMBUS_LATENCY_PROBES
+
+static LatencyHistogram latency_histograms[LATENCY_STAGE_COUNT];
+
+LatencyHistogram &latencyHistogram(LatencyStage stage) {
+  return latency_histograms[static_cast<size_t>(stage)];
+}
+
+uint32_t latencyCycles() { return esphome::arch_get_cpu_cycle_count(); }
+
+void latencyRecordCycles(LatencyStage stage, uint32_t start_cycles) {
+  static const uint32_t cycles_per_us = esphome::arch_get_cpu_freq_hz() / 1000000;
+  uint32_t cycles = latencyCycles() - start_cycles;
+  latencyRecordUs(stage, cycles_per_us ? cycles / cycles_per_us : cycles);
+}
+
+void latencyRecordUs(LatencyStage stage, uint32_t us) {
+  latencyHistogram(stage).record(us);
+}
+
+#endif
@@ -0,0 +1,96 @@
+#ifndef LATENCY_H
+#define LATENCY_H
+
+#include <cstddef>
+#include <cstdint>
+
+// Latency probes along the receive-to-publish path. Built with
+// -DWMBUS_LATENCY_PROBES (wmbus_radio: latency_probes: true) every stage
+// records its duration into a fixed bucket histogram; without it the probe
+// macros expand to nothing and no histogram storage exists.
+enum class LatencyStage : uint8_t {
+  IsrWakeup,       // radio interrupt until the receiver task runs
+  FifoDrain,       // start of a frame until the whole packet is read
+  QueueWait,       // packet queued by the receiver task until Radio::loop()
+  CrcTrim,         // 3 of 6 decoding, DLL CRC removal and frame check
+  HeaderParse,     // Telegram::parseHeader
+  Decrypt,         // Telegram::potentiallyDecrypt
+  ParseDV,         // parseDV
+  FieldExtraction, // field extractors, processContent and calculators
+  JsonRender,      // printMeterJson
+  Publish,         // on_telegram callbacks: sensors, automations
+};
+
+constexpr size_t LATENCY_STAGE_COUNT = 10;
+
+const char *latencyStageName(LatencyStage stage);
+
+// Durations in microseconds: exact below 8us, above that 4 buckets per power
+// of two, so a percentile is at most 25% too high. Everything from ~1s up
+// lands in the last bucket; max() stays exact.
+struct LatencyHistogram {
+  static constexpr size_t EXACT = 8;
+  static constexpr size_t SUB_BUCKETS = 4;
+  static constexpr size_t BUCKETS = EXACT + (20 - 3) * SUB_BUCKETS;
+
+  void record(uint32_t us);
+  void reset();
+
+  uint32_t count() const { return count_; }
+  uint32_t max() const { return max_; }
+  // Upper bound of the bucket holding the given percentile (0-100), 0 when
+  // nothing was recorded.
+  uint32_t percentile(float p) const;
+
+private:
+  static size_t bucketOf(uint32_t us);
+  static uint32_t bucketLimit(size_t bucket);
+
+  // Written from the receiver task and the main loop, read from the main
+  // loop: aligned 32 bit counters, a racing read is off by one at most.
+  uint32_t buckets_[BUCKETS] = {};
+  uint32_t count_ = 0;
+  uint32_t max_ = 0;
+};
+
+#ifdef WMBUS_LATENCY_PROBES
+
+LatencyHistogram &latencyHistogram(LatencyStage stage);
+
+// CPU cycle counter. Only meaningful for spans that start and end in the same
+// task; spans crossing tasks or the ISR use micros().
+uint32_t latencyCycles();
+void latencyRecordCycles(LatencyStage stage, uint32_t start_cycles);
+void latencyRecordUs(LatencyStage stage, uint32_t us);
+
+// Records the lifetime of the enclosing scope.
+struct LatencyProbe {
+  explicit LatencyProbe(LatencyStage stage)
+      : stage_(stage), start_(latencyCycles()) {}
+  ~LatencyProbe() { latencyRecordCycles(stage_, start_); }
+
+  LatencyProbe(const LatencyProbe &) = delete;
+  LatencyProbe &operator=(const LatencyProbe &) = delete;
+
+private:
+  LatencyStage stage_;
+  uint32_t start_;
+};
+
+#define LATENCY_PROBE_CONCAT_(a, b) a##b
+#define LATENCY_PROBE_CONCAT(a, b) LATENCY_PROBE_CONCAT_(a, b)
+#define LATENCY_PROBE(stage)                                                   \
+  LatencyProbe LATENCY_PROBE_CONCAT(latency_probe_, __LINE__)(                 \
+      LatencyStage::stage)
+#define LATENCY_RECORD_US(stage, us) latencyRecordUs(LatencyStage::stage, (us))
+
+#else
+
+#define LATENCY_PROBE(stage)
+#define LATENCY_RECORD_US(stage, us)                                           \
+  do {                                                                         \
+  } while (0)
+
+#endif
+
+#endif
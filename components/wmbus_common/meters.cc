@@ -16,6 +16,7 @@
 */
 
 #include "meters.h"
+#include "latency.h"
 #include "meters_common_implementation.h"
 #include "units.h"
 #include "wmbus.h"
@@ -786,14 +787,17 @@ bool MeterCommonImplementation::handleTelegram(
   // snprintf(log_prefix, 255, "(%s) log", driverName().str().c_str());
   // logTelegram(t.original, t.frame, t.header_size, t.suffix_size);
 
-  // Invoke standardized field extractors!
-  processFieldExtractors(&t);
-  if (hasProcessContent()) {
-    // Invoke tailor made meter specific parsing!
-    processContent(&t);
+  {
+    LATENCY_PROBE(FieldExtraction);
+    // Invoke standardized field extractors!
+    processFieldExtractors(&t);
+    if (hasProcessContent()) {
+      // Invoke tailor made meter specific parsing!
+      processContent(&t);
+    }
+    // Invoke any calculators working on the extracted fields.
+    processFieldCalculators();
   }
-  // Invoke any calculators working on the extracted fields.
-  processFieldCalculators();
 
   // All done....
 
@@ -1140,45 +1144,53 @@ std::string FieldInfo::generateFieldNameWithUnit(Meter *m, DVEntry *dve) {
 
 std::string FieldInfo::renderJson(Meter *m, DVEntry *dve) {
   std::string s;
+  JsonWriter json(&s);
+  writeField(m, dve, json);
+  return s;
+}
 
-  std::string display_unit_s = unitToStringLowerCase(displayUnit());
+void FieldInfo::writeField(Meter *m, DVEntry *dve, FieldWriter &out) {
   std::string field_name = generateFieldNameNoUnit(m, dve);
 
+  if (out.useFieldIds()) {
+    if (dve != NULL && vname_.find('{') != std::string::npos)
+      out.fieldKey(index_, dve->storage_nr.intValue(),
+                   dve->tariff_nr.intValue(), dve->subunit_nr.intValue());
+    else
+      out.fieldKey(index_, -1, -1, -1);
+  }
+
   if (xuantity() == Quantity::Text) {
     std::string v = m->getStringValue(this);
+    if (!out.useFieldIds())
+      out.key(field_name);
     if (v == "null") {
       // Yes, right now a meter cannot send a string value "something":"null" it
       // will be translated into "something":null in the json, indicating that
       // there is no value. This should not be a problem for now. Lets deal with
       // it when a meter decides to send "null" as its version string for
       // example.
-      s += "\"" + field_name + "\":null";
-    } else {
-      // Normally the string values are quoted in json. TODO quote the value
-      // properly. A well crafted meter could send a version string with " and
-      // break the json format.
-      s += "\"" + field_name + "\":\"" + v + "\"";
-    }
-  } else {
-    if (displayUnit() == Unit::DateLT) {
-      s += "\"" + field_name + "_" + display_unit_s + "\":\"" +
-           strdate(m->getNumericValue(field_name, Unit::DateLT)) + "\"";
-    } else if (displayUnit() == Unit::DateTimeLT) {
-      s += "\"" + field_name + "_" + display_unit_s + "\":\"" +
-           strdatetime(m->getNumericValue(field_name, Unit::DateTimeLT)) + "\"";
-    } else if (displayUnit() == Unit::DateTimeUTC) {
-      s += "\"" + field_name + "_" + display_unit_s + "\":\"" +
-           strTimestampUTC(m->getNumericValue(field_name, Unit::DateTimeUTC)) +
-           "\"";
+      out.nullValue();
     } else {
-      // All numeric values.
-      s += "\"" + field_name + "_" + display_unit_s + "\":" +
-           valueToString(m->getNumericValue(field_name, displayUnit()),
-                         displayUnit());
+      out.stringValue(v);
     }
+    return;
   }
 
-  return s;
+  if (!out.useFieldIds())
+    out.key(field_name, unitToStringLowerCase(displayUnit()));
+  if (displayUnit() == Unit::DateLT) {
+    out.stringValue(strdate(m->getNumericValue(field_name, Unit::DateLT)));
+  } else if (displayUnit() == Unit::DateTimeLT) {
+    out.stringValue(
+        strdatetime(m->getNumericValue(field_name, Unit::DateTimeLT)));
+  } else if (displayUnit() == Unit::DateTimeUTC) {
+    out.stringValue(
+        strTimestampUTC(m->getNumericValue(field_name, Unit::DateTimeUTC)));
+  } else {
+    // All numeric values.
+    out.numberValue(m->getNumericValue(field_name, displayUnit()));
+  }
 }
 
 void MeterCommonImplementation::printMeter(
@@ -1194,6 +1206,38 @@ void MeterCommonImplementation::printMeter(
     *fields = concatFields(this, t, separator, field_infos_, false,
                            selected_fields, extra_constant_fields);
 
+  if (json) {
+    json->clear();
+    printMeterJson(t, json, extra_constant_fields, pretty_print_json);
+  }
+}
+
+void MeterCommonImplementation::printMeterJson(
+    Telegram *t, std::string *out, std::vector<std::string> *extra_constant_fields,
+    bool pretty_print_json) {
+  LATENCY_PROBE(JsonRender);
+  // Most members are short numeric fields, size the buffer once up front.
+  out->reserve(out->size() + 160 +
+               48 * (numeric_values_.size() + string_values_.size()));
+
+  JsonWriter json(out, pretty_print_json);
+  printFields(t, json, extra_constant_fields);
+}
+
+void MeterCommonImplementation::printMeterCbor(
+    Telegram *t, std::vector<uchar> *out,
+    std::vector<std::string> *extra_constant_fields, bool field_ids) {
+  out->reserve(out->size() + 96 +
+               (field_ids ? 12 : 32) *
+                   (numeric_values_.size() + string_values_.size()));
+
+  CborWriter cbor(out, field_ids);
+  printFields(t, cbor, extra_constant_fields);
+}
+
+void MeterCommonImplementation::printFields(
+    Telegram *t, FieldWriter &out,
+    std::vector<std::string> *extra_constant_fields) {
   std::string media;
   if (t->tpl_id_found) {
     media = mediaTypeJSON(t->tpl_type, t->tpl_mfct);
@@ -1208,80 +1252,62 @@ void MeterCommonImplementation::printMeter(
     id = build_id(t->addresses.back(), identityMode());
   }
 
-  if (json) {
-    std::string indent = "";
-    std::string newline = "";
-
-    if (pretty_print_json) {
-      indent = "    ";
-      newline = "\n";
-    }
-
-    std::string s;
-    s += "{" + newline;
-    s += indent + "\"_\":\"telegram\"," + newline;
-    s += indent + "\"media\":\"" + media + "\"," + newline;
-    s += indent + "\"meter\":\"" + driverName().str() + "\"," + newline;
-    s += indent + "\"name\":\"" + name() + "\"," + newline;
-    s += indent + "\"id\":\"" + id + "\"," + newline;
-
-    // Iterate over the meter field infos...
-    std::map<FieldInfo *, std::set<DVEntry *>>
-        founds; // Multiple dventries can match to a single field info.
-    std::set<std::string> found_vnames;
-
-    for (auto &p : numeric_values_) {
-      std::string vname = p.first.first;
-      NumericField &nf = p.second;
-      if (nf.field_info->printProperties().hasHIDE())
-        continue;
+  out.beginObject();
+  out.key("_");
+  out.stringValue("telegram");
+  out.key("media");
+  out.stringValue(media);
+  out.key("meter");
+  out.stringValue(driverName().str());
+  out.key("name");
+  out.stringValue(name());
+  out.key("id");
+  out.stringValue(id);
+
+  for (auto &p : numeric_values_) {
+    NumericField &nf = p.second;
+    if (nf.field_info->printProperties().hasHIDE())
+      continue;
 
-      std::string out = nf.field_info->renderJson(this, &nf.dv_entry);
-      s += indent + out + "," + newline;
-    }
+    nf.field_info->writeField(this, &nf.dv_entry, out);
+  }
 
-    for (auto &p : string_values_) {
-      std::string vname = p.first;
-      StringField &sf = p.second;
-      std::string out;
+  for (auto &p : string_values_) {
+    const std::string &vname = p.first;
+    StringField &sf = p.second;
 
-      if (sf.field_info->printProperties().hasHIDE())
-        continue;
-      if (sf.field_info->printProperties().hasSTATUS()) {
-        std::string in = getStatusField(sf.field_info);
-        out = tostrprintf("\"%s\":\"%s\"", vname.c_str(), in.c_str());
-        s += indent + out + "," + newline;
-      } else {
-        if (sf.value == "null") {
-          // The string "null" translates to actual json null.
-          out = tostrprintf("\"%s\":null", vname.c_str());
-          s += indent + out + "," + newline;
-        } else {
-          out = tostrprintf("\"%s\":\"%s\"", vname.c_str(), sf.value.c_str());
-          s += indent + out + "," + newline;
-        }
-      }
+    if (sf.field_info->printProperties().hasHIDE())
+      continue;
+    if (out.useFieldIds())
+      out.fieldKey(sf.field_info->index(), -1, -1, -1);
+    else
+      out.key(vname);
+    if (sf.field_info->printProperties().hasSTATUS()) {
+      out.stringValue(getStatusField(sf.field_info));
+    } else if (sf.value == "null") {
+      // The string "null" translates to actual json null.
+      out.nullValue();
+    } else {
+      out.stringValue(sf.value);
     }
-    s += indent + "\"timestamp\":\"" + datetimeOfUpdateRobot() + "\"";
+  }
+  out.key("timestamp");
+  out.stringValue(datetimeOfUpdateRobot());
 
-    if (t->about.device != "") {
-      s += "," + newline;
-      s += indent + "\"device\":\"" + t->about.device + "\"," + newline;
-      s += indent + "\"rssi_dbm\":" + std::to_string(t->about.rssi_dbm);
-    }
-    for (std::string extra_field : meterExtraConstantFields()) {
-      s += "," + newline;
-      s += indent + makeQuotedJson(extra_field);
-    }
-    if (extra_constant_fields)
-      for (std::string extra_field : *extra_constant_fields) {
-        s += "," + newline;
-        s += indent + makeQuotedJson(extra_field);
-      }
-    s += newline;
-    s += "}";
-    *json = s;
+  if (t->about.device != "") {
+    out.key("device");
+    out.stringValue(t->about.device);
+    out.key("rssi_dbm");
+    out.intValue(t->about.rssi_dbm);
   }
+  for (const std::string &extra_field : meterExtraConstantFields()) {
+    out.keyValuePair(extra_field);
+  }
+  if (extra_constant_fields)
+    for (const std::string &extra_field : *extra_constant_fields) {
+      out.keyValuePair(extra_field);
+    }
+  out.endObject();
 }
 
 void MeterCommonImplementation::setExpectedTPLSecurityMode(
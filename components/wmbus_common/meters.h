@@ -21,6 +21,8 @@
 #include "address.h"
 #include "dvparser.h"
 #include "formula.h"
+#include "cbor_writer.h"
+#include "json_writer.h"
 #include "translatebits.h"
 #include "units.h"
 #include "util.h"
@@ -346,6 +348,8 @@ struct FieldInfo {
   std::string renderJsonOnlyDefaultUnit(Meter *m);
   std::string renderJson(Meter *m, DVEntry *dve);
   std::string renderJsonText(Meter *m, DVEntry *dve);
+  // Append the member for this field to an open json/cbor object.
+  void writeField(Meter *m, DVEntry *dve, FieldWriter &out);
   // Render the field name based on the actual field from the telegram.
   // A FieldInfo can be declared to handle any number of storage fields of a
   // certain range. The vname is then a pattern total_at_month_{storage_counter}
@@ -460,6 +464,14 @@ struct Meter {
                           std::vector<std::string> *more_json,
                           std::vector<std::string> *selected_fields,
                           bool pretty_print_json) = 0;
+  // Only the json part of printMeter, appended to json.
+  virtual void printMeterJson(Telegram *t, std::string *json,
+                              std::vector<std::string> *more_json,
+                              bool pretty_print_json) = 0;
+  // The same object as printMeterJson, appended to cbor as CBOR.
+  virtual void printMeterCbor(Telegram *t, std::vector<uchar> *cbor,
+                              std::vector<std::string> *more_json,
+                              bool field_ids) = 0;
 
   // The handleTelegram expects an input_frame where the DLL crcs have been
   // removed. Returns true of this meter handled this telegram! Sets id_match to
@@ -179,6 +179,12 @@ protected:
           *more_json, // Add this json "key"="value" strings.
       std::vector<std::string> *selected_fields, // Only print these fields.
       bool pretty_print); // Insert newlines and indentation.
+  void printMeterJson(Telegram *t, std::string *json,
+                      std::vector<std::string> *more_json, bool pretty_print);
+  void printMeterCbor(Telegram *t, std::vector<uchar> *cbor,
+                      std::vector<std::string> *more_json, bool field_ids);
+  void printFields(Telegram *t, FieldWriter &out,
+                   std::vector<std::string> *more_json);
   // Json fields include all values except timestamp_ut, timestamp_utc,
   // timestamp_lt since Json is assumed to be decoded by a program and the
   // current timestamp which is the same as timestamp_utc, can always be
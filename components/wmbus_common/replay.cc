@@ -0,0 +1,161 @@
+#include "replay.h"
+
+#include <cstdlib>
+
+#include "util.h"
+
+static const uchar MODE_C_PREAMBLE = 0x54;
+static const uchar BLOCK_A_PREAMBLE = 0xCD;
+
+static size_t frameFormatASize(uchar l_field) {
+  size_t blocks = l_field < 26 ? 2 : (l_field - 26) / 16 + 3;
+  return l_field + 1 + 2 * blocks;
+}
+
+std::vector<uchar> addFrameFormatACRCs(const std::vector<uchar> &frame) {
+  std::vector<uchar> out;
+  out.reserve(frameFormatASize(frame.empty() ? 0 : frame[0]));
+  size_t pos = 0;
+  while (pos < frame.size()) {
+    size_t block = pos == 0 ? 10 : 16;
+    if (block > frame.size() - pos)
+      block = frame.size() - pos;
+    std::vector<uchar> data(frame.begin() + pos, frame.begin() + pos + block);
+    uint16_t crc = crc16_EN13757(data.data(), data.size());
+    out.insert(out.end(), data.begin(), data.end());
+    out.push_back(crc >> 8);
+    out.push_back(crc & 0xFF);
+    pos += block;
+  }
+  return out;
+}
+
+void offsetReplayFrameId(ReplayFrame *frame, uint32_t offset) {
+  auto &packet = frame->packet;
+  size_t base = frame->link_mode == LinkMode::C1 ? 2 : 0;
+  if (offset == 0 || packet.size() < base + 12)
+    return;
+  uint32_t id = uint32_t(packet[base + 7]) << 24 | packet[base + 6] << 16 |
+                packet[base + 5] << 8 | packet[base + 4];
+  id += offset;
+  for (size_t i = 0; i < 4; i++)
+    packet[base + 4 + i] = id >> (8 * i);
+  uint16_t crc = crc16_EN13757(&packet[base], 10);
+  packet[base + 10] = crc >> 8;
+  packet[base + 11] = crc & 0xFF;
+}
+
+uint32_t replayAirtimeUs(const ReplayFrame &frame) {
+  const size_t overhead = 4;
+  uint32_t us_per_byte = frame.link_mode == LinkMode::C1 ? 80 : 120;
+  return (frame.packet.size() + overhead) * us_per_byte;
+}
+
+bool makeReplayFrame(std::vector<uchar> data, LinkMode link_mode, int8_t rssi,
+                     ReplayFrame *frame) {
+  if (link_mode != LinkMode::T1 && link_mode != LinkMode::C1)
+    return false;
+  if (data.size() < 11)
+    return false;
+
+  if (data.size() == size_t(data[0]) + 1) {
+    data = addFrameFormatACRCs(data);
+  } else {
+    std::vector<uchar> trimmed = data;
+    if (data.size() != frameFormatASize(data[0]) ||
+        !trimCRCsFrameFormatA(trimmed))
+      return false;
+  }
+
+  if (link_mode == LinkMode::C1)
+    data.insert(data.begin(), {MODE_C_PREAMBLE, BLOCK_A_PREAMBLE});
+  frame->link_mode = link_mode;
+  frame->rssi = rssi;
+  frame->packet = std::move(data);
+  return true;
+}
+
+bool parseReplayLine(const std::string &line, LinkMode default_link_mode,
+                     ReplayFrame *frame) {
+  std::string hex = line;
+  LinkMode link_mode = default_link_mode;
+  int8_t rssi = 0;
+
+  // rtlwmbus: mode;crc ok;3of6 ok;time;rssi;;;0xhex
+  size_t last = line.rfind(';');
+  if (last != std::string::npos) {
+    std::vector<std::string> columns;
+    size_t start = 0;
+    for (size_t end; (end = line.find(';', start)) != std::string::npos;
+         start = end + 1)
+      columns.push_back(line.substr(start, end - start));
+    hex = line.substr(last + 1);
+    if (columns.empty())
+      return false;
+    std::string name = columns[0];
+    for (auto &c : name)
+      c = tolower(c);
+    link_mode = toLinkMode(name.c_str());
+    if (columns.size() > 4)
+      rssi = atoi(columns[4].c_str());
+  }
+  if (hex.rfind("0x", 0) == 0)
+    hex = hex.substr(2);
+
+  std::vector<uchar> data;
+  if (!hex2bin(hex, &data))
+    return false;
+  return makeReplayFrame(std::move(data), link_mode, rssi, frame);
+}
+
+size_t parseReplayCapture(const std::string &text, LinkMode default_link_mode,
+                          std::vector<ReplayFrame> *frames) {
+  size_t failed = 0;
+  size_t start = 0;
+  while (start < text.size()) {
+    size_t end = text.find('\n', start);
+    if (end == std::string::npos)
+      end = text.size();
+    std::string line = text.substr(start, end - start);
+    start = end + 1;
+
+    while (!line.empty() && isspace((uchar)line.back()))
+      line.pop_back();
+    size_t first = line.find_first_not_of(" \t");
+    if (first == std::string::npos || line[first] == '#')
+      continue;
+
+    ReplayFrame frame;
+    if (parseReplayLine(line.substr(first), default_link_mode, &frame))
+      frames->push_back(std::move(frame));
+    else
+      failed++;
+  }
+  return failed;
+}
+
+ReplaySchedule::ReplaySchedule(float rate_per_s, uint32_t burst_size,
+                               uint32_t burst_interval_ms)
+    : rate_per_s_(rate_per_s), burst_size_(burst_size),
+      burst_interval_ms_(burst_interval_ms) {}
+
+uint32_t ReplaySchedule::due(uint32_t now_ms) {
+  if (!this->started_) {
+    this->started_ = true;
+    this->last_ms_ = now_ms;
+    this->next_burst_ms_ = now_ms;
+  }
+
+  this->credit_ += this->rate_per_s_ * (now_ms - this->last_ms_) / 1000.0f;
+  this->last_ms_ = now_ms;
+  uint32_t frames = this->credit_;
+  this->credit_ -= frames;
+
+  if (this->burst_size_ > 0 && this->burst_interval_ms_ > 0) {
+    while (int32_t(now_ms - this->next_burst_ms_) >= 0) {
+      frames += this->burst_size_;
+      this->next_burst_ms_ += this->burst_interval_ms_;
+    }
+  }
+  return frames;
+}
@@ -0,0 +1,73 @@
+#ifndef REPLAY_H
+#define REPLAY_H
+
+#include <cstdint>
+#include <string>
+#include <vector>
+
+#include "wmbus.h"
+
+// Captured frames fed back as radio input, by the wmbus_radio REPLAY
+// transceiver and the socket_receiver component on the device and by
+// tools/wmbus_host/wmbus_replay.py.
+struct ReplayFrame {
+  LinkMode link_mode;
+  int8_t rssi;
+  // As a radio delivers it: frame format A with the DLL CRCs, Mode C frames
+  // behind their 2 byte preamble.
+  std::vector<uchar> packet;
+};
+
+// Builds the packet from frame bytes with or without their DLL CRCs. False if
+// the length does not match the L-field, the CRCs are wrong or link_mode is
+// neither T1 nor C1.
+bool makeReplayFrame(std::vector<uchar> data, LinkMode link_mode, int8_t rssi,
+                     ReplayFrame *frame);
+
+// A single rtlwmbus or hex line as described below, no trailing newline.
+bool parseReplayLine(const std::string &line, LinkMode default_link_mode,
+                     ReplayFrame *frame);
+
+// One frame per line, rtlwmbus ("C1;1;1;<time>;<rssi>;;;0x<hex>") or plain
+// hex received in default_link_mode. Frames may carry their DLL CRCs or not.
+// Empty lines and lines starting with '#' are skipped. Returns the number of
+// lines that could not be used.
+size_t parseReplayCapture(const std::string &text, LinkMode default_link_mode,
+                          std::vector<ReplayFrame> *frames);
+
+// Frame format A: a CRC after the first 10 bytes and after every 16 bytes.
+std::vector<uchar> addFrameFormatACRCs(const std::vector<uchar> &frame);
+
+// Adds offset to the DLL id and fixes the first block CRC, so one captured
+// frame can stand in for many meters. Encrypted payloads no longer decrypt
+// under the new id.
+void offsetReplayFrameId(ReplayFrame *frame, uint32_t offset);
+
+// Time the frame occupies the channel: 100 kchip/s with 3 out of 6 coding in
+// T1, 100 kbit/s NRZ in C1, plus preamble and sync word.
+uint32_t replayAirtimeUs(const ReplayFrame &frame);
+
+// Frames due at a steady rate plus optional bursts of burst_size frames every
+// burst_interval_ms. Only driven by the times passed in, so a replay is
+// repeatable.
+class ReplaySchedule {
+public:
+  ReplaySchedule(float rate_per_s, uint32_t burst_size,
+                 uint32_t burst_interval_ms);
+
+  // Frames due since the previous call. The first call starts the schedule
+  // and, with bursts configured, returns the first burst.
+  uint32_t due(uint32_t now_ms);
+
+private:
+  float rate_per_s_;
+  uint32_t burst_size_;
+  uint32_t burst_interval_ms_;
+  bool started_ = false;
+  uint32_t last_ms_ = 0;
+  uint32_t next_burst_ms_ = 0;
+  // Fraction of a frame carried over between calls.
+  float credit_ = 0;
+};
+
+#endif
@@ -18,6 +18,7 @@
 #include "wmbus.h"
 #include "aescmac.h"
 #include "dvparser.h"
+#include "latency.h"
 #include "manufacturer_specificities.h"
 #include "wmbus_utils.h"
 #include <assert.h>
@@ -1285,6 +1286,7 @@ bool Telegram::parseShortTPL(std::vector<uchar>::iterator &pos) {
   CHECK(1);
 
   tpl_acc = *pos;
+  tpl_acc_found = true;
   addExplanationAndIncrementPos(pos, 1, KindOfData::PROTOCOL,
                                 Understanding::FULL, "%02x tpl-acc-field",
                                 tpl_acc);
@@ -1405,6 +1407,7 @@ bool Telegram::alreadyDecryptedCBC(std::vector<uchar>::iterator &pos) {
 }
 
 bool Telegram::potentiallyDecrypt(std::vector<uchar>::iterator &pos) {
+  LATENCY_PROBE(Decrypt);
   if (tpl_sec_mode == TPLSecurityMode::AES_CBC_IV) {
     if (alreadyDecryptedCBC(pos)) {
       if (meter_keys && meter_keys->hasConfidentialityKey()) {
@@ -1819,6 +1822,7 @@ bool Telegram::parse(std::vector<uchar> &input_frame, MeterKeys *mk,
 }
 
 bool Telegram::parseHeader(std::vector<uchar> &input_frame) {
+  LATENCY_PROBE(HeaderParse);
   switch (about.type) {
   case FrameType::WMBUS:
     return parseWMBUSHeader(input_frame);
@@ -4095,10 +4099,11 @@ bool trimCRCsFrameFormatBInternal(std::vector<uchar> &payload,
   return true;
 }
 
-void removeAnyDLLCRCs(std::vector<uchar> &payload) {
+bool removeAnyDLLCRCs(std::vector<uchar> &payload) {
   bool trimmed = trimCRCsFrameFormatAInternal(payload, true);
   if (!trimmed)
-    trimCRCsFrameFormatBInternal(payload, true);
+    trimmed = trimCRCsFrameFormatBInternal(payload, true);
+  return trimmed;
 }
 
 bool trimCRCsFrameFormatA(std::vector<uchar> &payload) {
@@ -30,7 +30,7 @@
 
 // Check and remove the data link layer CRCs from a wmbus telegram.
 // If the CRCs do not pass the test, return false.
-void removeAnyDLLCRCs(std::vector<uchar> &payload);
+bool removeAnyDLLCRCs(std::vector<uchar> &payload);
 bool trimCRCsFrameFormatA(std::vector<uchar> &payload);
 bool trimCRCsFrameFormatB(std::vector<uchar> &payload);
 
@@ -368,6 +368,7 @@ public:
   // TPL
   std::vector<uchar>::iterator tpl_start;
   int tpl_ci{};         // 1 byte
+  bool tpl_acc_found{}; // Set by the short and long TPL headers.
   int tpl_acc{};        // 1 byte
   int tpl_sts{};        // 1 byte
   int tpl_sts_offset{}; // Remember where the sts field is in the telegram, so
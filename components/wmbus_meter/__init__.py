@@ -1,3 +1,4 @@
+from contextlib import suppress
 import esphome.config_validation as cv
 import esphome.codegen as cg
 from esphome.const import (
@@ -7,8 +8,11 @@ from esphome.const import (
     CONF_PAYLOAD,
     CONF_TRIGGER_ID,
     CONF_MODE,
+    CONF_FORMAT,
+    CONF_DATA,
 )
 from esphome import automation
+from esphome.cpp_generator import LambdaExpression
 from esphome.components.mqtt import (
     MQTT_PUBLISH_ACTION_SCHEMA,
     MQTTPublishAction,
@@ -22,6 +26,14 @@ CONF_METER_ID = "meter_id"
 CONF_RADIO_ID = "radio_id"
 CONF_ON_TELEGRAM = "on_telegram"
 
+# Payload lambdas for the telegram send actions. cbor_field_ids keys the driver
+# fields by field index instead of name, see tools/wmbus_meter_cbor_decode.py.
+TELEGRAM_FORMATS = {
+    "json": "return meter.as_json();",
+    "cbor": "auto &cbor = meter.as_cbor(); return std::string(cbor.begin(), cbor.end());",
+    "cbor_field_ids": "auto &cbor = meter.as_cbor(true); return std::string(cbor.begin(), cbor.end());",
+}
+
 CODEOWNERS = ["@SzczepanLeon", "@kubasaw"]
 
 DEPENDENCIES = ["wmbus_radio"]
@@ -101,10 +113,16 @@ TELEGRAM_MQTT_PUBLISH_ACTION_SCHEMA = cv.All(
         {
             cv.Optional(CONF_PAYLOAD): cv.invalid(
                 "If you want to specify payload, use generic 'mqtt.publish' action"
-            )
+            ),
+            cv.Optional(CONF_FORMAT, default="json"): cv.one_of(
+                *TELEGRAM_FORMATS, lower=True
+            ),
         }
     ),
-    lambda c: {**c, CONF_PAYLOAD: cv.Lambda("return meter.as_json();")},
+    lambda c: {
+        **{k: v for k, v in c.items() if k != CONF_FORMAT},
+        CONF_PAYLOAD: cv.Lambda(TELEGRAM_FORMATS[c[CONF_FORMAT]]),
+    },
 )
 
 
@@ -114,3 +132,39 @@ automation.register_action(
     TELEGRAM_MQTT_PUBLISH_ACTION_SCHEMA,
     synchronous=True,
 )(mqtt_publish_action_to_code)
+
+
+with suppress(ImportError):
+    from ..socket_transmitter import (
+        SOCKET_SEND_ACTION_SCHEMA,
+        SocketTransmitterSendAction,
+    )
+
+    TELEGRAM_SOCKET_SEND_SCHEMA = SOCKET_SEND_ACTION_SCHEMA.extend(
+        {
+            cv.Optional(CONF_FORMAT, default="json"): cv.one_of(
+                *TELEGRAM_FORMATS, lower=True
+            ),
+            cv.Optional(CONF_DATA): cv.invalid(
+                "If you want to specify data to be sent, use generic 'socket_transmitter.send' action"
+            ),
+        }
+    )
+
+    @automation.register_action(
+        "wmbus_meter.send_telegram_with_socket",
+        SocketTransmitterSendAction,
+        TELEGRAM_SOCKET_SEND_SCHEMA,
+        synchronous=True,
+    )
+    async def send_telegram_with_socket_to_code(config, action_id, template_arg, args):
+        paren = await cg.get_variable(config[CONF_ID])
+        var = cg.new_Pvariable(
+            action_id, cg.TemplateArguments(cg.std_string, *template_arg), paren
+        )
+        template_ = LambdaExpression(
+            TELEGRAM_FORMATS[config[CONF_FORMAT]], args, cg.std_string
+        )
+        cg.add(var.set_data(template_))
+
+        return var
@@ -0,0 +1,49 @@
+#include "meter_stats.h"
+
+namespace esphome {
+namespace wmbus_meter {
+static float ewma(float average, float value) {
+  if (std::isnan(average))
+    return value;
+  return average + (value - average) * MeterStats::EWMA_WEIGHT;
+}
+
+bool MeterStats::record(optional<uint8_t> access_number, uint32_t frame_hash,
+                        int8_t rssi, bool decrypt_failed, uint32_t now_ms) {
+  const bool first = this->received == 0;
+  this->received++;
+  if (decrypt_failed)
+    this->decrypt_failures++;
+  this->rssi_ewma = ewma(this->rssi_ewma, rssi);
+
+  if (access_number.has_value() && *access_number == this->last_access_number &&
+      frame_hash == this->last_hash) {
+    this->duplicates++;
+    return true;
+  }
+
+  if (access_number.has_value() && this->last_access_number >= 0) {
+    // Modulo 256: the access number wraps.
+    const uint8_t step = *access_number - this->last_access_number;
+    if (step > 1 && step <= MAX_GAP)
+      this->gaps += step - 1;
+  }
+  if (!first)
+    this->interval_ewma_s =
+        ewma(this->interval_ewma_s, (now_ms - this->last_seen_ms) / 1000.0f);
+
+  this->last_access_number =
+      access_number.has_value() ? *access_number : int16_t(-1);
+  this->last_hash = frame_hash;
+  this->last_seen_ms = now_ms;
+  return false;
+}
+
+float MeterStats::loss_percent() const {
+  const uint32_t unique = this->received - this->duplicates;
+  if (unique == 0)
+    return NAN;
+  return 100.0f * this->gaps / (unique + this->gaps);
+}
+} // namespace wmbus_meter
+} // namespace esphome
@@ -0,0 +1,40 @@
+#pragma once
+#include <cmath>
+#include <cstdint>
+
+#include "esphome/core/optional.h"
+
+namespace esphome {
+namespace wmbus_meter {
+// Reception quality of one meter, derived from the access number (ACC) that a
+// meter increments with every transmission. Kept for the lifetime of the
+// meter, 36 bytes each.
+struct MeterStats {
+  // Telegrams addressed to the meter, duplicates included.
+  uint32_t received{0};
+  // Same access number and content as the telegram before, e.g. a repeater
+  // or a second radio.
+  uint32_t duplicates{0};
+  // Telegrams estimated missed from holes in the access number sequence.
+  uint32_t gaps{0};
+  uint32_t decrypt_failures{0};
+  float rssi_ewma{NAN};
+  // Time between unique telegrams, not corrected for gaps.
+  float interval_ewma_s{NAN};
+  uint32_t last_seen_ms{0};
+  uint32_t last_hash{0};
+  int16_t last_access_number{-1};
+
+  // Returns true when the telegram repeats the one before.
+  bool record(optional<uint8_t> access_number, uint32_t frame_hash,
+              int8_t rssi, bool decrypt_failed, uint32_t now_ms);
+  // Missed / (missed + unique received) in percent, NaN before the first
+  // telegram.
+  float loss_percent() const;
+
+  // Larger access number steps are taken for a meter restart, not a gap.
+  static constexpr uint8_t MAX_GAP = 64;
+  static constexpr float EWMA_WEIGHT = 0.125f;
+};
+} // namespace wmbus_meter
+} // namespace esphome
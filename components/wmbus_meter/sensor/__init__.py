@@ -1,4 +1,5 @@
 from esphome import config_validation as cv
+from esphome import codegen as cg
 from esphome.components import sensor
 from esphome.const import CONF_UNIT_OF_MEASUREMENT
 
@@ -9,6 +10,17 @@ from ...wmbus_common.units import get_human_readable_unit
 
 RegularSensor = wmbus_meter_ns.class_("Sensor", BaseSensor, sensor.Sensor)
 
+CONF_PUBLISH_ON_CHANGE_ONLY = "publish_on_change_only"
+CONF_DEADBAND = "deadband"
+CONF_MAX_SILENCE = "max_silence"
+
+
+def validate_deadband(value):
+    """Absolute deadband (0.01) or relative to the last value (0.5%)."""
+    if isinstance(value, str) and value.strip().endswith("%"):
+        return (cv.positive_float(value.strip()[:-1]) / 100, True)
+    return (cv.positive_float(value), False)
+
 
 def default_unit_of_measurement(config):
     config.setdefault(
@@ -20,7 +32,18 @@ def default_unit_of_measurement(config):
 
 
 CONFIG_SCHEMA = cv.All(
-    BASE_SCHEMA.extend(sensor.sensor_schema(RegularSensor)),
+    BASE_SCHEMA.extend(sensor.sensor_schema(RegularSensor)).extend(
+        {
+            # Checked on the raw field value before any filters: many meters
+            # resend the same totals every few seconds.
+            cv.Optional(CONF_PUBLISH_ON_CHANGE_ONLY, default=False): cv.boolean,
+            cv.Optional(CONF_DEADBAND): validate_deadband,
+            # Publish the next telegram anyway once this long has passed.
+            cv.Optional(
+                CONF_MAX_SILENCE
+            ): cv.positive_time_period_milliseconds,
+        }
+    ),
     default_unit_of_measurement,
 )
 
@@ -28,3 +51,9 @@ CONFIG_SCHEMA = cv.All(
 async def to_code(config):
     sensor_ = await sensor.new_sensor(config)
     await register_meter(sensor_, config)
+
+    cg.add(sensor_.set_publish_on_change_only(config[CONF_PUBLISH_ON_CHANGE_ONLY]))
+    if deadband := config.get(CONF_DEADBAND):
+        cg.add(sensor_.set_deadband(*deadband))
+    if max_silence := config.get(CONF_MAX_SILENCE):
+        cg.add(sensor_.set_max_silence(max_silence))
@@ -1,13 +1,54 @@
 #include "sensor.h"
 
+#include <cmath>
+
+#include "esphome/core/hal.h"
+
 namespace esphome {
 namespace wmbus_meter {
 static const char *TAG = "wmbus_meter.sensor";
 
 void Sensor::handle_update() {
   auto val = this->parent_->get_numeric_field(this->field_name);
-  if (val.has_value())
-    this->publish_state(*val);
+  if (!val.has_value())
+    return;
+
+  if (!this->should_publish_(*val)) {
+    this->suppressed_count_++;
+    ESP_LOGV(TAG, "'%s': %f within deadband, not published",
+             this->field_name.c_str(), *val);
+    return;
+  }
+
+  this->last_value_ = *val;
+  this->last_publish_ms_ = millis();
+  this->publish_state(*val);
+}
+
+bool Sensor::should_publish_(float value) {
+  if (!this->last_value_.has_value())
+    return true;
+  if (this->max_silence_ms_.has_value() &&
+      millis() - this->last_publish_ms_ >= *this->max_silence_ms_)
+    return true;
+
+  const float last = *this->last_value_;
+  if (std::isnan(value) || std::isnan(last))
+    return std::isnan(value) != std::isnan(last);
+
+  if (this->deadband_ > 0) {
+    float threshold = this->deadband_;
+    if (this->deadband_relative_)
+      threshold *= std::fabs(last);
+    // A relative deadband around 0 has no width, publish on change instead
+    // of every telegram.
+    if (threshold == 0)
+      return value != last;
+    return std::fabs(value - last) >= threshold;
+  }
+  if (this->on_change_only_)
+    return value != last;
+  return true;
 }
 
 void Sensor::dump_config() {
@@ -15,6 +56,15 @@ void Sensor::dump_config() {
   ESP_LOGCONFIG(TAG, "  Parent meter ID: 0x%s",
                 this->parent_->get_id().c_str());
   ESP_LOGCONFIG(TAG, "  Field: '%s'", this->field_name.c_str());
+  if (this->deadband_ > 0)
+    ESP_LOGCONFIG(TAG, "  Deadband: %g%s",
+                  this->deadband_relative_ ? this->deadband_ * 100
+                                           : this->deadband_,
+                  this->deadband_relative_ ? "%" : "");
+  else if (this->on_change_only_)
+    ESP_LOGCONFIG(TAG, "  Publish on change only");
+  if (this->max_silence_ms_.has_value())
+    ESP_LOGCONFIG(TAG, "  Max silence: %ums", *this->max_silence_ms_);
   LOG_SENSOR("  ", "Name:", this);
 }
 } // namespace wmbus_meter
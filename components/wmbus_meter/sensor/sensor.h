@@ -9,6 +9,32 @@ class Sensor : public sensor::Sensor, public BaseSensor {
 public:
   void handle_update();
   void dump_config() override;
+
+  void set_publish_on_change_only(bool on_change_only) {
+    this->on_change_only_ = on_change_only;
+  }
+  void set_deadband(float deadband, bool relative) {
+    this->deadband_ = deadband;
+    this->deadband_relative_ = relative;
+  }
+  void set_max_silence(uint32_t max_silence_ms) {
+    this->max_silence_ms_ = max_silence_ms;
+  }
+
+  uint32_t get_suppressed_count() const { return this->suppressed_count_; }
+
+protected:
+  // Decides on the raw field value, before the sensor filter chain runs.
+  bool should_publish_(float value);
+
+  bool on_change_only_{false};
+  float deadband_{0};
+  bool deadband_relative_{false};
+  optional<uint32_t> max_silence_ms_;
+
+  optional<float> last_value_;
+  uint32_t last_publish_ms_{0};
+  uint32_t suppressed_count_{0};
 };
 } // namespace wmbus_meter
 } // namespace esphome
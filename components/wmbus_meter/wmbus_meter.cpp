@@ -1,4 +1,5 @@
 #include "wmbus_meter.h"
+#include "esphome/components/wmbus_common/latency.h"
 #include "esphome/components/wmbus_common/meters_common_implementation.h"
 
 namespace esphome {
@@ -32,6 +33,15 @@ void Meter::set_radio(wmbus_radio::Radio *radio) {
   }
   radio->add_frame_handler(
       [this](wmbus_radio::Frame *frame) { return this->handle_frame(frame); });
+
+  // Register the DLL address so the transceiver can drop foreign frames early.
+  if (this->meter != nullptr) {
+    std::string id = this->get_id();
+    char *end = nullptr;
+    uint32_t address = strtoul(id.c_str(), &end, 16);
+    if (id.size() == 8 && *end == '\0')
+      radio->add_address_filter_id(address);
+  }
 }
 void Meter::dump_config() {
   if (this->meter == nullptr) {
@@ -49,6 +59,9 @@ void Meter::dump_config() {
   ESP_LOGCONFIG(TAG, "  ID: 0x%s", id.c_str());
   ESP_LOGCONFIG(TAG, "  Driver: %s", driver.c_str());
   ESP_LOGCONFIG(TAG, "  Key: %s", key.c_str());
+  ESP_LOGCONFIG(TAG, "  Telegrams: %u received, %u duplicates, %u missed",
+                this->stats_.received, this->stats_.duplicates,
+                this->stats_.gaps);
 }
 
 std::string Meter::get_id() {
@@ -104,25 +117,96 @@ void Meter::handle_frame(wmbus_radio::Frame *frame) {
   if (id_match) {
     ESP_LOGI(TAG, "Telegram matched %s (RSSI: %d dBm, mode: %s)", this->meter->name().c_str(), frame->rssi(),
              toString(frame->link_mode()));
+    this->update_stats_(frame, *telegram);
     this->last_telegram = std::move(telegram);
+    this->invalidate_json_cache_();
     this->defer([this]() {
-      this->on_telegram_callback_manager();
+      {
+        LATENCY_PROBE(Publish);
+        this->on_telegram_callback_manager();
+      }
       this->last_telegram = nullptr;
+      this->invalidate_json_cache_();
     });
 
     frame->mark_as_handled();
   }
 }
 
-std::string Meter::as_json(bool pretty_print) {
+void Meter::update_stats_(wmbus_radio::Frame *frame, const Telegram &telegram) {
+  // The ELL access number counts link layer transmissions; without an ELL
+  // the TPL one does, if the telegram has a TPL header at all.
+  optional<uint8_t> access_number;
+  if (telegram.ell_ci != 0)
+    access_number = telegram.ell_acc;
+  else if (telegram.tpl_acc_found)
+    access_number = telegram.tpl_acc;
+
+  // FNV-1a, tells a repeated telegram from a meter reusing its access number.
+  uint32_t hash = 2166136261UL;
+  for (uint8_t byte : frame->data())
+    hash = (hash ^ byte) * 16777619UL;
+
+  if (this->stats_.record(access_number, hash, frame->rssi(),
+                          telegram.decryption_failed, millis()))
+    ESP_LOGD(TAG, "Duplicate telegram from %s (access number %u)",
+             this->meter->name().c_str(), *access_number);
+}
+
+const std::string &Meter::as_json(bool pretty_print) {
+  static const std::string EMPTY_JSON = "{}";
   if (this->meter == nullptr || this->last_telegram == nullptr)
-    return "{}";
-  std::string json;
-  this->meter->printMeter(this->last_telegram.get(), nullptr, nullptr, '\t',
-                          &json, nullptr, nullptr, nullptr, pretty_print);
+    return EMPTY_JSON;
+
+  auto &json = this->json_cache_[pretty_print];
+  if (this->json_cached_[pretty_print]) {
+    this->json_cache_hits_++;
+    return json;
+  }
+
+  this->json_cache_misses_++;
+  json.clear();
+  this->meter->printMeterJson(this->last_telegram.get(), &json, nullptr,
+                              pretty_print);
+  this->json_cached_[pretty_print] = true;
   return json;
 }
 
+const std::vector<uint8_t> &Meter::as_cbor(bool field_ids) {
+  static const std::vector<uint8_t> EMPTY_CBOR = {0xA0}; // {}
+  if (this->meter == nullptr || this->last_telegram == nullptr)
+    return EMPTY_CBOR;
+
+  if (this->cbor_cached_field_ids_ == field_ids) {
+    this->cbor_cache_hits_++;
+    return this->cbor_cache_;
+  }
+
+  this->cbor_cache_misses_++;
+  this->cbor_cache_.clear();
+  this->meter->printMeterCbor(this->last_telegram.get(), &this->cbor_cache_,
+                              nullptr, field_ids);
+  this->cbor_cached_field_ids_ = field_ids;
+  return this->cbor_cache_;
+}
+
+void Meter::invalidate_json_cache_() {
+  this->cbor_cached_field_ids_.reset();
+  // Keep the buffers for the next telegram unless they grew past the
+  // threshold.
+  if (this->cbor_cache_.capacity() > CACHE_SHRINK_THRESHOLD)
+    std::vector<uint8_t>().swap(this->cbor_cache_);
+  else
+    this->cbor_cache_.clear();
+  for (size_t i = 0; i < 2; i++) {
+    this->json_cached_[i] = false;
+    if (this->json_cache_[i].capacity() > CACHE_SHRINK_THRESHOLD)
+      std::string().swap(this->json_cache_[i]);
+    else
+      this->json_cache_[i].clear();
+  }
+}
+
 optional<std::string> Meter::get_string_field(std::string field_name) {
 
   if (this->meter == nullptr)
@@ -155,6 +239,9 @@ optional<float> Meter::get_numeric_field(std::string field_name) {
   if (field_name == "timestamp")
     return this->meter->timestampLastUpdate();
 
+  if (field_name.rfind("stats_", 0) == 0)
+    return this->get_stats_field_(field_name);
+
   std::string name;
   Unit unit;
   extractUnit(field_name, &name, &unit);
@@ -167,6 +254,38 @@ optional<float> Meter::get_numeric_field(std::string field_name) {
   return {};
 }
 
+optional<float> Meter::get_stats_field_(const std::string &field_name) {
+  const auto &stats = this->stats_;
+  float value = NAN;
+  if (field_name == "stats_received_counter")
+    value = stats.received;
+  else if (field_name == "stats_duplicates_counter")
+    value = stats.duplicates;
+  else if (field_name == "stats_gaps_counter")
+    value = stats.gaps;
+  else if (field_name == "stats_decrypt_failures_counter")
+    value = stats.decrypt_failures;
+  else if (field_name == "stats_loss_pct")
+    value = stats.loss_percent();
+  else if (field_name == "stats_rssi_dbm")
+    value = stats.rssi_ewma;
+  else if (field_name == "stats_interval_s")
+    value = stats.interval_ewma_s;
+  else if (field_name == "stats_json_cache_hits_counter")
+    value = this->json_cache_hits_;
+  else if (field_name == "stats_json_cache_misses_counter")
+    value = this->json_cache_misses_;
+  else if (field_name == "stats_cbor_cache_hits_counter")
+    value = this->cbor_cache_hits_;
+  else if (field_name == "stats_cbor_cache_misses_counter")
+    value = this->cbor_cache_misses_;
+
+  if (!std::isnan(value))
+    return value;
+
+  return {};
+}
+
 void Meter::on_telegram(std::function<void()> &&callback) {
   this->on_telegram_callback_manager.add(std::move(callback));
 }
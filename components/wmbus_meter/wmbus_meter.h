@@ -7,6 +7,8 @@
 #include "esphome/components/wmbus_common/meters.h"
 #include "esphome/components/wmbus_radio/component.h"
 
+#include "meter_stats.h"
+
 namespace esphome {
 namespace wmbus_meter {
 class Meter : public Component {
@@ -22,9 +24,14 @@ public:
 
   void on_telegram(std::function<void()> &&callback);
 
-  std::string as_json(bool pretty_print = false);
+  // Rendered once per telegram and shared by every consumer of it.
+  const std::string &as_json(bool pretty_print = false);
+  // Same fields as as_json() as CBOR, keyed by driver field index when
+  // field_ids is set. Cached per telegram like the json.
+  const std::vector<uint8_t> &as_cbor(bool field_ids = false);
   optional<std::string> get_string_field(std::string field_name);
   optional<float> get_numeric_field(std::string field_name);
+  const MeterStats &get_stats() const { return this->stats_; }
 
 protected:
   LinkModeSet link_modes_;
@@ -37,6 +44,25 @@ protected:
   CallbackManager<void()> on_telegram_callback_manager;
 
   void handle_frame(wmbus_radio::Frame *frame);
+  void invalidate_json_cache_();
+  void update_stats_(wmbus_radio::Frame *frame, const Telegram &telegram);
+  optional<float> get_stats_field_(const std::string &field_name);
+
+  MeterStats stats_;
+
+  // [0] compact, [1] pretty printed rendering of last_telegram.
+  std::string json_cache_[2];
+  bool json_cached_[2]{false, false};
+  std::vector<uint8_t> cbor_cache_;
+  optional<bool> cbor_cached_field_ids_;
+  uint32_t json_cache_hits_{0};
+  uint32_t json_cache_misses_{0};
+  uint32_t cbor_cache_hits_{0};
+  uint32_t cbor_cache_misses_{0};
+  // Not a cap: a rendering of any size is kept while its telegram is
+  // current, callers hold references to it. Buffers that grew past this are
+  // freed with the next telegram instead of being reused for it.
+  static constexpr size_t CACHE_SHRINK_THRESHOLD = 2048;
 };
 } // namespace wmbus_meter
 } // namespace esphome
\ No newline at end of file
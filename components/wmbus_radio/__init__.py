@@ -4,7 +4,10 @@ import esphome.config_validation as cv
 from esphome import pins, automation
 from esphome.components import spi
 from esphome.cpp_generator import LambdaExpression
+from esphome.core import CORE, TimePeriod
 from esphome.const import (
+    CONF_CS_PIN,
+    CONF_FILE,
     CONF_ID,
     CONF_RESET_PIN,
     CONF_IRQ_PIN,
@@ -17,13 +20,32 @@ from esphome.const import (
 CONF_GDO0_PIN = "gdo0_pin"
 CONF_GDO2_PIN = "gdo2_pin"
 CONF_POLLING_INTERVAL = "polling_interval"
+CONF_ADDRESS_FILTER = "address_filter"
+CONF_LATENCY_PROBES = "latency_probes"
+CONF_RESET = "reset"
+CONF_TRACE_BUFFER_SIZE = "trace_buffer_size"
+CONF_CLEAR = "clear"
+CONF_REPLAY = "replay"
+CONF_FRAMES = "frames"
+CONF_LINK_MODE = "link_mode"
+CONF_RATE = "rate"
+CONF_BURST_SIZE = "burst_size"
+CONF_BURST_INTERVAL = "burst_interval"
+CONF_METERS = "meters"
+CONF_REPEAT = "repeat"
+CONF_DEDUP_WINDOW = "dedup_window"
+CONF_DUTY_CYCLE = "duty_cycle"
+CONF_RESYNC_INTERVAL = "resync_interval"
+CONF_RESYNC_DURATION = "resync_duration"
 from pathlib import Path
 
 CODEOWNERS = ["@SzczepanLeon", "@kubasaw"]
 
-DEPENDENCIES = ["esp32", "spi"]
+DEPENDENCIES = ["esp32"]
 
-AUTO_LOAD = ["wmbus_common"]
+# Every transceiver is a SPI device in C++, REPLAY included, but only the real
+# radios need a configured spi bus.
+AUTO_LOAD = ["spi", "wmbus_common"]
 
 MULTI_CONF = True
 
@@ -40,6 +62,21 @@ Frame = radio_ns.class_("Frame")
 FramePtr = Frame.operator("ptr")
 FrameTrigger = radio_ns.class_(
     "FrameTrigger", automation.Trigger.template(FramePtr))
+FrameEncoding = radio_ns.enum("FrameEncoding", is_class=True)
+LinkMode = cg.global_ns.enum("LinkMode", is_class=True)
+SendFrameAction = radio_ns.class_("SendFrameAction", automation.Action)
+DumpStatsAction = radio_ns.class_(
+    "DumpStatsAction", automation.Action, cg.Parented.template(RadioComponent)
+)
+DumpTraceAction = radio_ns.class_(
+    "DumpTraceAction", automation.Action, cg.Parented.template(RadioComponent)
+)
+
+FRAME_ENCODINGS = {
+    "hex": FrameEncoding.HEX,
+    "raw": FrameEncoding.RAW,
+    "rtlwmbus": FrameEncoding.RTLWMBUS,
+}
 
 TRANSCEIVER_NAMES = {
     r.stem.removeprefix("transceiver_").upper()
@@ -51,6 +88,23 @@ def validate_radio_config(config):
     """Validate that required pins are present for the selected radio type."""
     radio_type = config[CONF_RADIO_TYPE]
 
+    if radio_type == "REPLAY":
+        if CONF_REPLAY not in config:
+            raise cv.Invalid(f"REPLAY requires '{CONF_REPLAY}' to be specified")
+        for key in (CONF_RESET_PIN, CONF_IRQ_PIN, CONF_GDO0_PIN, CONF_GDO2_PIN):
+            if key in config:
+                raise cv.Invalid(f"REPLAY does not use '{key}'")
+        if config[CONF_ADDRESS_FILTER]:
+            raise cv.Invalid(f"'{CONF_ADDRESS_FILTER}' is only supported by CC1101")
+        if CONF_DUTY_CYCLE in config:
+            raise cv.Invalid(f"REPLAY does not support '{CONF_DUTY_CYCLE}'")
+        return config
+
+    if CONF_REPLAY in config:
+        raise cv.Invalid(f"'{CONF_REPLAY}' is only supported by REPLAY")
+    if CONF_CS_PIN not in config:
+        raise cv.Invalid(f"{radio_type} requires '{CONF_CS_PIN}' to be specified")
+
     if radio_type == "CC1101":
         # CC1101 requires GDO0 and GDO2 pins
         if CONF_GDO0_PIN not in config:
@@ -74,37 +128,123 @@ def validate_radio_config(config):
         # GDO pins not used for SX1276
         if CONF_GDO0_PIN in config or CONF_GDO2_PIN in config:
             raise cv.Invalid(f"SX1276 does not use GDO pins, use '{CONF_IRQ_PIN}' instead")
+        if config[CONF_ADDRESS_FILTER]:
+            raise cv.Invalid(f"'{CONF_ADDRESS_FILTER}' is only supported by CC1101")
 
     return config
 
 
-CONFIG_SCHEMA = cv.All(
+def validate_duty_cycle(config):
+    if config[CONF_RESYNC_DURATION] >= config[CONF_RESYNC_INTERVAL]:
+        raise cv.Invalid(
+            f"'{CONF_RESYNC_DURATION}' must be shorter than '{CONF_RESYNC_INTERVAL}'"
+        )
+    return config
+
+
+# Frames for radio_type REPLAY, one per line in rtlwmbus or hex format. Plain
+# hex frames are taken as received in link_mode.
+REPLAY_SCHEMA = cv.All(
     cv.Schema(
         {
-            cv.GenerateID(): cv.declare_id(RadioComponent),
-            cv.GenerateID(CONF_RADIO_ID): cv.declare_id(RadioTransceiver),
-            cv.Required(CONF_RADIO_TYPE): cv.one_of(*TRANSCEIVER_NAMES, upper=True),
-            # Conditional pins - validated by validate_radio_config
-            cv.Optional(CONF_RESET_PIN): pins.internal_gpio_output_pin_schema,
-            cv.Optional(CONF_IRQ_PIN): pins.internal_gpio_input_pin_schema,
-            cv.Optional(CONF_GDO0_PIN): pins.internal_gpio_input_pin_schema,
-            cv.Optional(CONF_GDO2_PIN): pins.internal_gpio_input_pin_schema,
-            cv.Optional(CONF_FREQUENCY, default=868.95): cv.float_range(min=300.0, max=928.0),
-            # Advanced: Polling interval for CC1101 (milliseconds)
-            # Lower values = better reception but higher CPU load
-            # At 100kbps, data arrives at 12.5 bytes/ms, FIFO is 64 bytes
-            # Default 2ms is recommended. Values >5ms may cause FIFO overflow and frame loss.
-            cv.Optional(CONF_POLLING_INTERVAL, default=2): cv.int_range(min=1, max=10),
-            cv.Optional(CONF_ON_FRAME): automation.validate_automation(
+            cv.Optional(CONF_FILE): cv.file_,
+            cv.Optional(CONF_FRAMES): cv.ensure_list(cv.string_strict),
+            cv.Optional(CONF_LINK_MODE, default="T1"): cv.enum(
+                {name: getattr(LinkMode, name) for name in ("C1", "T1")}, upper=True
+            ),
+            cv.Optional(CONF_RATE, default=1.0): cv.positive_float,
+            cv.Optional(CONF_BURST_SIZE, default=0): cv.uint32_t,
+            cv.Optional(CONF_BURST_INTERVAL, default="10s"): cv.positive_time_period_milliseconds,
+            # Spread the frames over this many DLL ids.
+            cv.Optional(CONF_METERS, default=1): cv.int_range(min=1),
+            cv.Optional(CONF_REPEAT, default=True): cv.boolean,
+        }
+    ),
+    cv.has_exactly_one_key(CONF_FILE, CONF_FRAMES),
+)
+
+
+RADIO_SCHEMA = cv.Schema(
+    {
+        cv.GenerateID(): cv.declare_id(RadioComponent),
+        cv.GenerateID(CONF_RADIO_ID): cv.declare_id(RadioTransceiver),
+        # Conditional pins - validated by validate_radio_config
+        cv.Optional(CONF_RESET_PIN): pins.internal_gpio_output_pin_schema,
+        cv.Optional(CONF_IRQ_PIN): pins.internal_gpio_input_pin_schema,
+        cv.Optional(CONF_GDO0_PIN): pins.internal_gpio_input_pin_schema,
+        cv.Optional(CONF_GDO2_PIN): pins.internal_gpio_input_pin_schema,
+        cv.Optional(CONF_FREQUENCY, default=868.95): cv.float_range(min=300.0, max=928.0),
+        # Advanced: Polling interval for CC1101 (milliseconds)
+        # Lower values = better reception but higher CPU load
+        # At 100kbps, data arrives at 12.5 bytes/ms, FIFO is 64 bytes
+        # Default 2ms is recommended. Values >5ms may cause FIFO overflow and frame loss.
+        cv.Optional(CONF_POLLING_INTERVAL, default=2): cv.int_range(min=1, max=10),
+        # Advanced: drop frames whose DLL address does not belong to any configured
+        # wmbus_meter as soon as the address is received (CC1101 only).
+        # Frames from other meters never reach on_frame triggers when enabled.
+        cv.Optional(CONF_ADDRESS_FILTER, default=False): cv.boolean,
+        # Diagnostics: time every stage from radio interrupt to sensor
+        # publish (wmbus_radio.dump_stats, latency sensors). Compiled out
+        # when disabled.
+        cv.Optional(CONF_LATENCY_PROBES, default=False): cv.boolean,
+        cv.Optional(CONF_REPLAY): REPLAY_SCHEMA,
+        # Diagnostics: number of binary trace records (16 bytes each) kept
+        # from the receive path, see wmbus_radio.dump_trace and
+        # tools/wmbus_trace.py. Shared by all radios.
+        cv.Optional(CONF_TRACE_BUFFER_SIZE): cv.int_range(min=16, max=16384),
+        # Radios covering the same meters: every radio with a dedup
+        # window holds its frames that long, and of the copies received
+        # by these radios only the one with the best RSSI reaches the
+        # meters and on_frame triggers of all of them, once. The longest
+        # window configured applies to all. The address filter and the
+        # duty cycle of each radio cover the meters of the whole group.
+        cv.Optional(CONF_DEDUP_WINDOW): cv.All(
+            cv.positive_time_period_milliseconds,
+            cv.Range(
+                min=TimePeriod(milliseconds=10), max=TimePeriod(seconds=5)
+            ),
+        ),
+        # Battery/solar gateways: learn the transmit period of every
+        # wmbus_meter on this radio and sleep the transceiver between
+        # their predicted windows. Meters are relearned during a
+        # continuous listen of resync_duration every resync_interval,
+        # and whenever a meter misses its windows. Hit rate in
+        # wmbus_radio.dump_stats and the schedule_hit_rate sensor.
+        cv.Optional(CONF_DUTY_CYCLE): cv.All(
+            cv.Schema(
                 {
-                    cv.GenerateID(CONF_TRIGGER_ID): cv.declare_id(FrameTrigger),
-                    cv.Optional(CONF_MARK_AS_HANDLED, default=False): cv.boolean,
+                    cv.Optional(
+                        CONF_RESYNC_INTERVAL, default="1h"
+                    ): cv.positive_time_period_milliseconds,
+                    cv.Optional(
+                        CONF_RESYNC_DURATION, default="2min"
+                    ): cv.positive_time_period_milliseconds,
                 }
             ),
-        }
-    )
-    .extend(spi.spi_device_schema())
-    .extend(cv.COMPONENT_SCHEMA),
+            validate_duty_cycle,
+        ),
+        cv.Optional(CONF_ON_FRAME): automation.validate_automation(
+            {
+                cv.GenerateID(CONF_TRIGGER_ID): cv.declare_id(FrameTrigger),
+                cv.Optional(CONF_MARK_AS_HANDLED, default=False): cv.boolean,
+            }
+        ),
+    }
+).extend(cv.COMPONENT_SCHEMA)
+
+
+CONFIG_SCHEMA = cv.All(
+    # REPLAY talks to no chip, so a load test needs no spi bus.
+    cv.typed_schema(
+        {
+            name: RADIO_SCHEMA
+            if name == "REPLAY"
+            else RADIO_SCHEMA.extend(spi.spi_device_schema(cs_pin_required=False))
+            for name in TRANSCEIVER_NAMES
+        },
+        key=CONF_RADIO_TYPE,
+        upper=True,
+    ),
     validate_radio_config,
 )
 
@@ -134,6 +274,9 @@ async def to_code(config):
         # Set polling interval (CC1101 only - used for polling-based reception)
         if CONF_POLLING_INTERVAL in config:
             cg.add(radio_var.set_polling_interval(config[CONF_POLLING_INTERVAL]))
+
+        if config[CONF_ADDRESS_FILTER]:
+            cg.add(radio_var.set_address_filter(True))
     elif radio_type == "SX1276":
         # SX1276 uses reset and IRQ pins
         reset_pin = await cg.gpio_pin_expression(config[CONF_RESET_PIN])
@@ -141,8 +284,28 @@ async def to_code(config):
 
         irq_pin = await cg.gpio_pin_expression(config[CONF_IRQ_PIN])
         cg.add(radio_var.set_irq_pin(irq_pin))
-
-    await spi.register_spi_device(radio_var, config)
+    elif radio_type == "REPLAY":
+        replay = config[CONF_REPLAY]
+        if CONF_FILE in replay:
+            with open(CORE.relative_config_path(replay[CONF_FILE]), encoding="utf-8") as f:
+                capture = f.read()
+        else:
+            capture = "\n".join(replay[CONF_FRAMES])
+        cg.add(radio_var.set_capture(capture))
+        cg.add(radio_var.set_default_link_mode(replay[CONF_LINK_MODE]))
+        cg.add(radio_var.set_rate(replay[CONF_RATE]))
+        if replay[CONF_BURST_SIZE]:
+            cg.add(
+                radio_var.set_burst(
+                    replay[CONF_BURST_SIZE],
+                    replay[CONF_BURST_INTERVAL].total_milliseconds,
+                )
+            )
+        cg.add(radio_var.set_meter_count(replay[CONF_METERS]))
+        cg.add(radio_var.set_repeat(replay[CONF_REPEAT]))
+
+    if radio_type != "REPLAY":
+        await spi.register_spi_device(radio_var, config)
     await cg.register_component(radio_var, config)
 
     cg.add(cg.LineComment("WMBus Component"))
@@ -151,6 +314,24 @@ async def to_code(config):
 
     await cg.register_component(var, config)
 
+    if config[CONF_LATENCY_PROBES]:
+        enable_latency_probes()
+
+    if CONF_TRACE_BUFFER_SIZE in config:
+        cg.add_define("USE_WMBUS_RADIO_TRACE")
+        cg.add(var.set_trace_buffer_size(config[CONF_TRACE_BUFFER_SIZE]))
+
+    if duty_cycle := config.get(CONF_DUTY_CYCLE):
+        cg.add(
+            var.set_duty_cycle(
+                duty_cycle[CONF_RESYNC_INTERVAL].total_milliseconds,
+                duty_cycle[CONF_RESYNC_DURATION].total_milliseconds,
+            )
+        )
+
+    if CONF_DEDUP_WINDOW in config:
+        cg.add(var.set_dedup_window(config[CONF_DEDUP_WINDOW].total_milliseconds))
+
     for conf in config.get(CONF_ON_FRAME, []):
         trig = cg.new_Pvariable(
             conf[CONF_TRIGGER_ID], var, conf[CONF_MARK_AS_HANDLED])
@@ -161,47 +342,82 @@ async def to_code(config):
         )
 
 
+def enable_latency_probes():
+    # A build flag rather than a define: the probes also sit in wmbus_common,
+    # which does not include defines.h.
+    cg.add_build_flag("-DWMBUS_LATENCY_PROBES")
+
+
+@automation.register_action(
+    "wmbus_radio.dump_stats",
+    DumpStatsAction,
+    cv.Schema(
+        {
+            cv.GenerateID(): cv.use_id(RadioComponent),
+            cv.Optional(CONF_RESET, default=False): cv.templatable(cv.boolean),
+        }
+    ),
+    synchronous=True,
+)
+async def dump_stats_to_code(config, action_id, template_arg, args):
+    var = cg.new_Pvariable(action_id, template_arg)
+    await cg.register_parented(var, config[CONF_ID])
+    reset = await cg.templatable(config[CONF_RESET], args, bool)
+    cg.add(var.set_reset(reset))
+    return var
+
+
+@automation.register_action(
+    "wmbus_radio.dump_trace",
+    DumpTraceAction,
+    cv.Schema(
+        {
+            cv.GenerateID(): cv.use_id(RadioComponent),
+            cv.Optional(CONF_CLEAR, default=False): cv.templatable(cv.boolean),
+        }
+    ),
+    synchronous=True,
+)
+async def dump_trace_to_code(config, action_id, template_arg, args):
+    var = cg.new_Pvariable(action_id, template_arg)
+    await cg.register_parented(var, config[CONF_ID])
+    clear = await cg.templatable(config[CONF_CLEAR], args, bool)
+    cg.add(var.set_clear(clear))
+    return var
+
+
 with suppress(ImportError):
     from ..socket_transmitter import (
         SOCKET_SEND_ACTION_SCHEMA,
-        SocketTransmitterSendAction,
+        SocketTransmitter,
     )
 
     FRAME_SOCKET_SEND_SCHEMA = SOCKET_SEND_ACTION_SCHEMA.extend(
         {
-            cv.Required(CONF_FORMAT): cv.one_of(
-                "hex",
-                "raw",
-                "rtlwmbus",
-                lower=True,
-            ),
+            cv.Required(CONF_FORMAT): cv.enum(FRAME_ENCODINGS, lower=True),
             cv.Optional(CONF_DATA): cv.invalid(
                 "If you want to specify data to be sent, use generic 'socket_transmitter.send' action"
             ),
         }
     )
 
+    # Hands the frame's cached encoding to the transmitter by reference, so
+    # sending the same frame to several sockets encodes it only once.
     @automation.register_action(
         "wmbus_radio.send_frame_with_socket",
-        SocketTransmitterSendAction,
+        SendFrameAction,
         FRAME_SOCKET_SEND_SCHEMA,
         synchronous=True,
     )
     async def send_frame_with_socket_to_code(config, action_id, template_arg, args):
-        output_type = {
-            "hex": cg.std_string,
-            "raw": cg.std_vector.template(cg.uint8),
-            "rtlwmbus": cg.std_string,
-        }[config[CONF_FORMAT]]
-
         paren = await cg.get_variable(config[CONF_ID])
         var = cg.new_Pvariable(
-            action_id, cg.TemplateArguments(output_type, *template_arg), paren
+            action_id,
+            cg.TemplateArguments(SocketTransmitter, *template_arg),
+            paren,
+            config[CONF_FORMAT],
         )
-        template_ = LambdaExpression(
-            f"return frame.as_{config[CONF_FORMAT]}();", args, ""
-        )
-
-        cg.add(var.set_data(template_))
+        template_ = LambdaExpression("return frame;", args, FramePtr)
+        cg.add(var.set_frame(template_))
 
         return var
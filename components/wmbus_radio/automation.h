@@ -2,6 +2,7 @@
 
 #include "component.h"
 #include "esphome/core/automation.h"
+#include "esphome/core/helpers.h"
 #include "packet.h"
 
 namespace esphome {
@@ -17,5 +18,59 @@ public:
   }
 };
 
+template <typename... Ts>
+class DumpStatsAction : public Action<Ts...>, public Parented<Radio> {
+public:
+  TEMPLATABLE_VALUE(bool, reset)
+
+  void play(Ts... x) override {
+    this->parent_->dump_stats();
+    if (this->reset_.value(x...))
+      this->parent_->reset_stats();
+  }
+};
+
+template <typename... Ts>
+class DumpTraceAction : public Action<Ts...>, public Parented<Radio> {
+public:
+  TEMPLATABLE_VALUE(bool, clear)
+
+  void play(Ts... x) override {
+    this->parent_->dump_trace();
+    if (this->clear_.value(x...))
+      global_trace.clear();
+  }
+};
+
+// Sends a frame in the given encoding to any sink with send() overloads for
+// std::string and std::vector<uint8_t>, e.g. socket_transmitter.
+template <typename Sink, typename... Ts>
+class SendFrameAction : public Action<Ts...> {
+public:
+  SendFrameAction(Sink *sink, FrameEncoding encoding)
+      : sink_(sink), encoding_(encoding) {}
+
+  TEMPLATABLE_VALUE(Frame *, frame)
+
+  void play(Ts... x) override {
+    Frame *frame = this->frame_.value(x...);
+    switch (this->encoding_) {
+    case FrameEncoding::HEX:
+      this->sink_->send(frame->as_hex());
+      break;
+    case FrameEncoding::RAW:
+      this->sink_->send(frame->as_raw());
+      break;
+    case FrameEncoding::RTLWMBUS:
+      this->sink_->send(frame->as_rtlwmbus());
+      break;
+    }
+  }
+
+protected:
+  Sink *sink_;
+  FrameEncoding encoding_;
+};
+
 } // namespace wmbus_radio
 } // namespace esphome
\ No newline at end of file
@@ -32,7 +32,7 @@ uint8_t CC1101Driver::read_register(CC1101Register reg) {
 
   for (uint8_t attempt = 0; attempt < CC1101_SPI_MAX_RETRIES; attempt++) {
     this->spi_->enable();
-    status_byte = this->spi_->transfer_byte(addr);
+    status_byte = this->status_ = this->spi_->transfer_byte(addr);
     value = this->spi_->transfer_byte(0x00);
     this->spi_->disable();
 
@@ -40,6 +40,7 @@ uint8_t CC1101Driver::read_register(CC1101Register reg) {
       if (attempt > 0) {
         ESP_LOGV(TAG, "read_register retry ok reg=0x%02X attempts=%u", static_cast<uint8_t>(reg), attempt + 1);
       }
+      this->update_shadow_(reg, &value, 1);
       return value;
     }
     delayMicroseconds(CC1101_SPI_RETRY_DELAY_US);
@@ -52,12 +53,17 @@ uint8_t CC1101Driver::read_register(CC1101Register reg) {
 }
 
 void CC1101Driver::write_register(CC1101Register reg, uint8_t value) {
+  if (this->shadow_matches_(reg, &value, 1))
+    return;
+
   uint8_t addr = static_cast<uint8_t>(reg);
 
   this->spi_->enable();
-  this->spi_->transfer_byte(addr);
+  this->status_ = this->spi_->transfer_byte(addr);
   this->spi_->transfer_byte(value);
   this->spi_->disable();
+
+  this->update_shadow_(reg, &value, 1);
 }
 
 uint8_t CC1101Driver::read_status(CC1101Status status) {
@@ -67,7 +73,7 @@ uint8_t CC1101Driver::read_status(CC1101Status status) {
 
   for (uint8_t attempt = 0; attempt < CC1101_SPI_MAX_RETRIES; attempt++) {
     this->spi_->enable();
-    status_byte = this->spi_->transfer_byte(addr);
+    status_byte = this->status_ = this->spi_->transfer_byte(addr);
     value = this->spi_->transfer_byte(0x00);
     this->spi_->disable();
 
@@ -94,33 +100,40 @@ void CC1101Driver::read_burst(CC1101Register reg, uint8_t *buffer,
   uint8_t addr = static_cast<uint8_t>(reg) | CC1101_READ_BURST;
 
   this->spi_->enable();
-  this->spi_->transfer_byte(addr);
+  uint8_t status_byte = this->status_ = this->spi_->transfer_byte(addr);
   this->spi_->transfer_array(buffer, length);
   this->spi_->disable();
+
+  if (status_byte != 0xFF)
+    this->update_shadow_(reg, buffer, length);
 }
 
 void CC1101Driver::write_burst(CC1101Register reg, const uint8_t *buffer,
                                 size_t length) {
-  if (length == 0)
+  if (length == 0 || this->shadow_matches_(reg, buffer, length))
     return;
 
   uint8_t addr = static_cast<uint8_t>(reg) | CC1101_WRITE_BURST;
 
   this->spi_->enable();
-  this->spi_->transfer_byte(addr);
-  for (size_t i = 0; i < length; i++) {
-    this->spi_->transfer_byte(buffer[i]);
-  }
+  this->status_ = this->spi_->transfer_byte(addr);
+  this->spi_->write_array(buffer, length);
   this->spi_->disable();
+
+  this->update_shadow_(reg, buffer, length);
 }
 
 uint8_t CC1101Driver::send_strobe(CC1101Strobe strobe) {
   uint8_t addr = static_cast<uint8_t>(strobe);
   uint8_t status = 0xFF;
 
+  // SRES restores register defaults and SPWD loses the TEST registers.
+  if (strobe == CC1101Strobe::SRES || strobe == CC1101Strobe::SPWD)
+    this->invalidate_shadow();
+
   for (uint8_t attempt = 0; attempt < CC1101_SPI_MAX_RETRIES; attempt++) {
     this->spi_->enable();
-    status = this->spi_->transfer_byte(addr);
+    status = this->status_ = this->spi_->transfer_byte(addr);
     this->spi_->disable();
 
     if (status != 0xFF) {
@@ -145,7 +158,7 @@ void CC1101Driver::read_rx_fifo(uint8_t *buffer, size_t length) {
   uint8_t addr = CC1101_FIFO | CC1101_READ_BURST;
 
   this->spi_->enable();
-  this->spi_->transfer_byte(addr);
+  this->status_ = this->spi_->transfer_byte(addr);
   this->spi_->transfer_array(buffer, length);
   this->spi_->disable();
 }
@@ -157,11 +170,42 @@ void CC1101Driver::write_tx_fifo(const uint8_t *buffer, size_t length) {
   uint8_t addr = CC1101_FIFO | CC1101_WRITE_BURST;
 
   this->spi_->enable();
-  this->spi_->transfer_byte(addr);
+  this->status_ = this->spi_->transfer_byte(addr);
+  this->spi_->write_array(buffer, length);
+  this->spi_->disable();
+}
+
+uint8_t CC1101Driver::last_status() const {
+  return this->status_;
+}
+
+CC1101ChipState CC1101Driver::last_chip_state() const {
+  return cc1101_chip_state(this->status_);
+}
+
+void CC1101Driver::invalidate_shadow() {
+  this->shadow_valid_.fill(false);
+}
+
+bool CC1101Driver::shadow_matches_(CC1101Register reg, const uint8_t *buffer,
+                                   size_t length) const {
+  size_t first = static_cast<size_t>(reg);
+  if (first + length > CC1101_CONFIG_REGISTER_COUNT)
+    return false;
   for (size_t i = 0; i < length; i++) {
-    this->spi_->transfer_byte(buffer[i]);
+    if (!this->shadow_valid_[first + i] || this->shadow_[first + i] != buffer[i])
+      return false;
+  }
+  return true;
+}
+
+void CC1101Driver::update_shadow_(CC1101Register reg, const uint8_t *buffer,
+                                  size_t length) {
+  size_t first = static_cast<size_t>(reg);
+  for (size_t i = 0; i < length && first + i < CC1101_CONFIG_REGISTER_COUNT; i++) {
+    this->shadow_[first + i] = buffer[i];
+    this->shadow_valid_[first + i] = true;
   }
-  this->spi_->disable();
 }
 
 } // namespace wmbus_radio
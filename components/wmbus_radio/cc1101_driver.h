@@ -1,6 +1,7 @@
 #pragma once
 
 #include "esphome/components/spi/spi.h"
+#include <array>
 #include <cstdint>
 
 // Must match the SPIDevice template used by RadioTransceiver.
@@ -94,8 +95,32 @@ enum class CC1101Strobe : uint8_t {
   SNOP = 0x3D,
 };
 
+// Main radio control state reported in bits 6:4 of the SPI status byte.
+enum class CC1101ChipState : uint8_t {
+  IDLE = 0,
+  RX = 1,
+  TX = 2,
+  FSTXON = 3,
+  CALIBRATE = 4,
+  SETTLING = 5,
+  RX_FIFO_OVERFLOW = 6,
+  TX_FIFO_UNDERFLOW = 7,
+};
+
+constexpr uint8_t CC1101_STATUS_CHIP_RDYN = 0x80;
+
+constexpr CC1101ChipState cc1101_chip_state(uint8_t status_byte) {
+  return static_cast<CC1101ChipState>((status_byte >> 4) & 0x07);
+}
+
+// PKTSTATUS: sync word received, cleared again at the end of the packet.
+constexpr uint8_t CC1101_PKTSTATUS_SFD = 0x08;
+
 constexpr uint8_t CC1101_FIFO = 0x3F;
 
+// Number of configuration registers (IOCFG2..TEST0).
+constexpr size_t CC1101_CONFIG_REGISTER_COUNT = static_cast<size_t>(CC1101Register::TEST0) + 1;
+
 constexpr uint8_t CC1101_READ_SINGLE = 0x80;
 constexpr uint8_t CC1101_READ_BURST = 0xC0;
 constexpr uint8_t CC1101_WRITE_BURST = 0x40;
@@ -124,9 +149,29 @@ public:
 
   void write_tx_fifo(const uint8_t *buffer, size_t length);
 
+  // Status byte clocked out by the chip during the most recent SPI access.
+  // Its FIFO_BYTES_AVAILABLE field refers to the RX FIFO for read accesses and
+  // to the TX FIFO for writes.
+  uint8_t last_status() const;
+  CC1101ChipState last_chip_state() const;
+
+  // Forget the cached configuration, e.g. after the chip lost its registers.
+  void invalidate_shadow();
+
 private:
+  bool shadow_matches_(CC1101Register reg, const uint8_t *buffer, size_t length) const;
+  void update_shadow_(CC1101Register reg, const uint8_t *buffer, size_t length);
+
   spi::SPIDevice<spi::BIT_ORDER_MSB_FIRST, spi::CLOCK_POLARITY_LOW,
                  spi::CLOCK_PHASE_LEADING, WMBUS_RADIO_SPI_DATA_RATE> *spi_;
+
+  // Status byte returned by the most recent SPI access.
+  uint8_t status_{0xFF};
+
+  // Last value written to or read from each configuration register. Writes of
+  // an unchanged value are skipped while the entry is marked valid.
+  std::array<uint8_t, CC1101_CONFIG_REGISTER_COUNT> shadow_{};
+  std::array<bool, CC1101_CONFIG_REGISTER_COUNT> shadow_valid_{};
 };
 
 }
@@ -31,7 +31,10 @@ constexpr std::array<std::pair<CC1101Register, uint8_t>, 47>
         {CC1101Register::MDMCFG0, 0xF8},
         {CC1101Register::DEVIATN, 0x44},
         {CC1101Register::MCSM2, 0x07},
-        {CC1101Register::MCSM1, 0x00},
+        // RXOFF_MODE=RX: stay in RX after a packet so the next frame can sync
+        // without strobes; TXOFF_MODE=IDLE. The end of a packet is read from
+        // PKTSTATUS, the chip does not pass through IDLE.
+        {CC1101Register::MCSM1, 0x0C},
         {CC1101Register::MCSM0, 0x18},
         {CC1101Register::FOCCFG, 0x2E},
         {CC1101Register::BSCFG, 0xBF},
@@ -57,19 +60,38 @@ constexpr std::array<std::pair<CC1101Register, uint8_t>, 47>
         {CC1101Register::TEST0, 0x09},
     }};
 
+// The table covers every configuration register in address order, so it can
+// be written with a single burst transfer.
+constexpr bool rf_settings_are_contiguous() {
+  for (size_t i = 0; i < CC1101_WMBUS_RF_SETTINGS.size(); i++)
+    if (static_cast<size_t>(CC1101_WMBUS_RF_SETTINGS[i].first) != i)
+      return false;
+  return true;
+}
+static_assert(CC1101_WMBUS_RF_SETTINGS.size() == CC1101_CONFIG_REGISTER_COUNT &&
+                  rf_settings_are_contiguous(),
+              "CC1101_WMBUS_RF_SETTINGS must list IOCFG2..TEST0 in order");
+
+inline std::array<uint8_t, CC1101_CONFIG_REGISTER_COUNT> wmbus_rf_settings_values() {
+  std::array<uint8_t, CC1101_CONFIG_REGISTER_COUNT> values{};
+  for (size_t i = 0; i < values.size(); i++)
+    values[i] = CC1101_WMBUS_RF_SETTINGS[i].second;
+  return values;
+}
+
 inline void apply_wmbus_rf_settings(CC1101Driver &driver) {
-  for (const auto &[reg, value] : CC1101_WMBUS_RF_SETTINGS)
-    driver.write_register(reg, value);
+  auto values = wmbus_rf_settings_values();
+  driver.write_burst(CC1101Register::IOCFG2, values.data(), values.size());
 }
 
 inline void set_carrier_frequency(CC1101Driver &driver, float freq_mhz) {
   uint32_t freq_reg = static_cast<uint32_t>(freq_mhz * 65536.0f / 26.0f);
-  uint8_t freq2 = (freq_reg >> 16) & 0xFF;
-  uint8_t freq1 = (freq_reg >> 8) & 0xFF;
-  uint8_t freq0 = freq_reg & 0xFF;
-  driver.write_register(CC1101Register::FREQ2, freq2);
-  driver.write_register(CC1101Register::FREQ1, freq1);
-  driver.write_register(CC1101Register::FREQ0, freq0);
+  const uint8_t freq[3] = {
+      static_cast<uint8_t>((freq_reg >> 16) & 0xFF),
+      static_cast<uint8_t>((freq_reg >> 8) & 0xFF),
+      static_cast<uint8_t>(freq_reg & 0xFF),
+  };
+  driver.write_burst(CC1101Register::FREQ2, freq, sizeof(freq));
 }
 
 }
@@ -1,8 +1,15 @@
 #include "component.h"
 
+#include <algorithm>
+#include <cinttypes>
+
 #include "freertos/queue.h"
 #include "freertos/task.h"
 
+#include "esphome/core/hal.h"
+
+#include "dedup.h"
+
 #define ASSERT(expr, expected, before_exit)                                    \
   {                                                                            \
     auto result = (expr);                                                      \
@@ -18,6 +25,12 @@
 namespace esphome {
 namespace wmbus_radio {
 static const char *TAG = "wmbus";
+
+#ifdef WMBUS_LATENCY_PROBES
+// Time of the last radio interrupt. The ISR argument is the task handle, so
+// this cannot live in Radio; with several radios it is the latest of them.
+static volatile uint32_t last_isr_us = 0;
+#endif
 Radio::Radio()
     : radio(nullptr)
     , receiver_task_handle_(nullptr)
@@ -32,6 +45,25 @@ void Radio::setup() {
 
   this->radio->set_packet_queue(this->packet_queue_);
 
+  if (this->dedup_window_ms_ > 0) {
+    // Meters registered before every radio of the group had joined. The first
+    // member shares them before any receiver task runs, later ones find
+    // nothing left to add.
+    std::vector<uint32_t> ids;
+    for (auto *radio : global_dedup.radios())
+      for (const auto &meter : radio->schedules_.meters())
+        ids.push_back(meter.id);
+    for (auto id : ids)
+      this->add_address_filter_id(id);
+  }
+
+#ifdef USE_WMBUS_RADIO_TRACE
+  if (this->trace_buffer_size_ &&
+      !global_trace.allocate(this->trace_buffer_size_))
+    ESP_LOGW(TAG, "Failed to allocate trace buffer of %u records",
+             (unsigned) this->trace_buffer_size_);
+#endif
+
   if (this->radio->is_failed()) {
     ESP_LOGE(TAG, "Radio transceiver failed during setup; not starting receiver task");
     this->mark_failed();
@@ -60,46 +92,122 @@ void Radio::loop() {
   if (this->is_failed() || this->radio == nullptr)
     return;
 
+  if (this->dedup_window_ms_ > 0)
+    global_dedup.flush(millis());
+  this->update_schedules_(millis());
+
   Packet *p;
   if (xQueueReceive(this->packet_queue_, &p, 0) != pdPASS)
     return;
+  LATENCY_RECORD_US(QueueWait, p->queued_for_us());
 
   // ESP_LOGI(TAG, "Have RAW data from radio (%zu bytes)",
   //          p->calculate_payload_size());
 
-  auto frame = p->convert_to_frame();
+  auto &stats = this->radio->stats();
+  auto frame = p->convert_to_frame(stats);
 
   if (!frame)
     return;
 
-  ESP_LOGI(TAG, "Have data (%zu bytes) [RSSI: %ddBm, mode: %s %s]",
-           frame->data().size(), frame->rssi(), toString(frame->link_mode()),
-           frame->format().c_str());
+  if (frame->link_mode() == LinkMode::C1)
+    RadioStats::increment(stats.frames_c1);
+  else
+    RadioStats::increment(stats.frames_t1);
 
-  uint8_t packet_handled = 0;
-  for (auto &handler : this->handlers_)
-    handler(&frame.value());
+  // DLL id: L, C, M(2), ID(4) little endian.
+  const auto &data = frame->data();
+  if (data.size() >= 8)
+    this->schedules_.record(encode_uint32(data[7], data[6], data[5], data[4]),
+                            millis());
 
-  if (frame->handlers_count())
-    ESP_LOGI(TAG, "Telegram handled by %d handlers", frame->handlers_count());
-  else {
+  this->handle_frame(std::move(*frame));
+}
+
+void Radio::handle_frame(Frame &&frame) {
+  if (this->dedup_window_ms_ > 0) {
+    global_dedup.offer(this, std::move(frame), millis());
+    return;
+  }
+  this->dispatch_frame(frame);
+}
+
+void Radio::dispatch_frame(Frame &frame) {
+  if (this->dedup_window_ms_ > 0) {
+    for (auto *radio : global_dedup.radios())
+      for (auto &handler : radio->handlers_)
+        handler(&frame);
+  } else {
+    for (auto &handler : this->handlers_)
+      handler(&frame);
+  }
+
+  trace_event(TraceEvent::FRAME_DISPATCHED, frame.handlers_count(),
+              frame.data().size(), static_cast<uint32_t>(frame.rssi()));
+  if (!frame.handlers_count()) {
+    if (this->radio != nullptr)
+      RadioStats::increment(this->radio->stats().unhandled_frames);
 #if ESPHOME_LOG_LEVEL >= ESPHOME_LOG_LEVEL_DEBUG
     ESP_LOGD(TAG, "Telegram not handled by any handler");
     Telegram t;
-    if (t.parseHeader(frame->data()) && t.addresses.empty()) {
+    if (t.parseHeader(frame.data()) && t.addresses.empty()) {
       ESP_LOGD(TAG, "Check if telegram can be parsed on:");
     } else {
       ESP_LOGD(TAG, "Check if telegram with address %s can be parsed on:",
                t.addresses.back().id.c_str());
     }
     ESP_LOGD(TAG,
-             (std::string{"https://wmbusmeters.org/analyze/"} + frame->as_hex())
+             (std::string{"https://wmbusmeters.org/analyze/"} + frame.as_hex())
                  .c_str());
 #endif
   }
 }
 
+void Radio::update_schedules_(uint32_t now_ms) {
+  this->schedules_.expire(now_ms, [](const MeterSchedule &meter) {
+    ESP_LOGW(TAG,
+             "Meter %08" PRIX32 " missed %u windows in a row, dropped from the "
+             "schedule until it is heard again",
+             meter.id, MeterSchedule::MAX_MISSES);
+  });
+  if (!this->duty_cycle_)
+    return;
+
+  if (now_ms - this->resync_started_ms_ >= this->resync_interval_ms_) {
+    this->resync_started_ms_ = now_ms;
+    ESP_LOGD(TAG, "Listening for %" PRIu32 "s to resync meter schedules",
+             this->resync_duration_ms_ / 1000);
+  }
+  uint32_t listen_from = now_ms;
+  if (now_ms - this->resync_started_ms_ >= this->resync_duration_ms_)
+    listen_from = this->schedules_.listen_from(now_ms) - WAKE_MARGIN_MS;
+  this->listen_from_ms_.store(listen_from, std::memory_order_relaxed);
+}
+
+bool Radio::sleep_until_window_() {
+  int32_t remaining =
+      this->listen_from_ms_.load(std::memory_order_relaxed) - millis();
+  if (remaining < int32_t(MIN_SLEEP_MS) || !this->radio->sleep())
+    return false;
+
+  const uint32_t start = millis();
+  trace_event(TraceEvent::RADIO_SLEEP, 0, remaining);
+  while ((remaining = this->listen_from_ms_.load(std::memory_order_relaxed) -
+                      millis()) > 0)
+    vTaskDelay(std::max<TickType_t>(
+        1, pdMS_TO_TICKS(std::min<uint32_t>(remaining, SLEEP_STEP_MS))));
+  this->radio->restart_rx();
+
+  const uint32_t slept = millis() - start;
+  this->sleep_time_ms_.fetch_add(slept, std::memory_order_relaxed);
+  trace_event(TraceEvent::RADIO_WAKE, 0, slept);
+  return true;
+}
+
 void Radio::wakeup_receiver_task_from_isr(TaskHandle_t *arg) {
+#ifdef WMBUS_LATENCY_PROBES
+  last_isr_us = micros();
+#endif
   BaseType_t xHigherPriorityTaskWoken;
   vTaskNotifyGiveFromISR(*arg, &xHigherPriorityTaskWoken);
   portYIELD_FROM_ISR(xHigherPriorityTaskWoken);
@@ -110,6 +218,9 @@ void Radio::receive_frame() {
     vTaskDelay(pdMS_TO_TICKS(1000));
     return;
   }
+  if (this->duty_cycle_ && this->sleep_until_window_())
+    return;
+
   bool is_frame_oriented = this->radio->is_frame_oriented();
   bool use_interrupt = this->radio->has_irq_pin();
 
@@ -127,9 +238,9 @@ void Radio::receive_frame() {
     this->radio->restart_rx();
   }
 
-  uint32_t timeout_ms = is_frame_oriented
-                        ? this->radio->get_polling_interval()
-                        : 60000;
+  uint32_t timeout_ms = is_frame_oriented ? this->radio->get_polling_interval()
+                       : this->duty_cycle_ ? DUTY_CYCLE_POLL_MS
+                                           : 60000;
 
   if (!ulTaskNotifyTake(pdTRUE, pdMS_TO_TICKS(timeout_ms))) {
     if (!is_frame_oriented) {
@@ -142,12 +253,17 @@ void Radio::receive_frame() {
     }
     return;
   }
+  if (use_interrupt)
+    LATENCY_RECORD_US(IsrWakeup, micros() - last_isr_us);
 
   if (is_frame_oriented) {
     this->radio->run_receiver();
     return;
   }
 
+#ifdef WMBUS_LATENCY_PROBES
+  const uint32_t rx_start_us = micros();
+#endif
   auto packet = std::make_unique<Packet>();
 
   if (!this->radio->read_in_task(packet->rx_data_ptr(),
@@ -161,6 +277,8 @@ void Radio::receive_frame() {
     return;
   }
 
+  this->radio->set_expected_frame_length(packet->expected_size());
+
   if (!this->radio->read_in_task(packet->rx_data_ptr(),
                                  packet->rx_capacity())) {
     ESP_LOGW(TAG, "Failed to read data");
@@ -168,15 +286,8 @@ void Radio::receive_frame() {
   }
 
   packet->set_rssi(this->radio->get_rssi());
-  auto packet_ptr = packet.get();
-
-  if (xQueueSend(this->packet_queue_, &packet_ptr, 0) == pdTRUE) {
-    ESP_LOGV(TAG, "Queue items: %zu",
-             uxQueueMessagesWaiting(this->packet_queue_));
-    ESP_LOGV(TAG, "Queue send success");
-    packet.release();
-  } else
-    ESP_LOGW(TAG, "Queue send failed");
+  LATENCY_RECORD_US(FifoDrain, micros() - rx_start_us);
+  this->radio->queue_packet(packet);
 }
 
 void Radio::receiver_task(Radio *arg) {
@@ -189,5 +300,115 @@ void Radio::add_frame_handler(std::function<void(Frame *)> &&callback) {
   this->handlers_.push_back(std::move(callback));
 }
 
+void Radio::set_dedup_window(uint32_t window_ms) {
+  this->dedup_window_ms_ = window_ms;
+  global_dedup.add_radio(this);
+  global_dedup.set_window(window_ms);
+}
+
+void Radio::add_address_filter_id(uint32_t id) {
+  // The radios of a dedup group cover each other's meters, so each of them
+  // has to let the frames of all of them through.
+  if (this->dedup_window_ms_ > 0) {
+    for (auto *radio : global_dedup.radios())
+      radio->add_meter_(id);
+  } else {
+    this->add_meter_(id);
+  }
+}
+
+void Radio::add_meter_(uint32_t id) {
+  this->schedules_.add_meter(id);
+  if (this->radio != nullptr)
+    this->radio->add_address_filter_id(id);
+}
+
+void Radio::dump_stats() {
+  const auto &stats = this->get_stats();
+  ESP_LOGI(TAG,
+           "Frames: %u T1, %u C1, %u unhandled, %u rejected by address "
+           "filter",
+           RadioStats::get(stats.frames_t1), RadioStats::get(stats.frames_c1),
+           RadioStats::get(stats.unhandled_frames),
+           RadioStats::get(stats.address_filter_rejected));
+  ESP_LOGI(TAG, "Errors: %u CRC, %u 3-of-6, %u FIFO overflows, %u sync timeouts",
+           RadioStats::get(stats.crc_failures),
+           RadioStats::get(stats.decode_3of6_failures),
+           RadioStats::get(stats.fifo_overflows),
+           RadioStats::get(stats.sync_timeouts));
+  ESP_LOGI(TAG, "Queue: %u dropped, high water %u",
+           RadioStats::get(stats.queue_drops),
+           RadioStats::get(stats.queue_high_water));
+  if (RadioStats::get(stats.rx_restart_latency_max_us) > 0)
+    ESP_LOGI(TAG, "RX restart latency: last %u us, max %u us",
+             RadioStats::get(stats.rx_restart_latency_us),
+             RadioStats::get(stats.rx_restart_latency_max_us));
+  const auto &schedules = this->schedules_;
+  ESP_LOGI(TAG, "Schedule: %" PRIu32 " hits, %" PRIu32 " misses (%.1f%%)",
+           schedules.hits(), schedules.misses(), schedules.hit_rate());
+  for (const auto &meter : schedules.meters()) {
+    if (!meter.seen)
+      continue;
+    ESP_LOGI(TAG, "  %08" PRIX32 ": every %.1fs +-%.0fms%s, %" PRIu32
+             " hits, %" PRIu32 " misses",
+             meter.id, meter.interval_ms / 1000, meter.jitter_ms,
+             meter.lost()          ? " (lost)"
+             : meter.predictable() ? ""
+                                   : " (learning)",
+             meter.hits,
+             meter.misses);
+  }
+  if (this->duty_cycle_)
+    ESP_LOGI(TAG, "Duty cycle: asleep %.1f%% of the time",
+             100.0f * this->get_sleep_time_ms() / millis());
+  if (this->dedup_window_ms_ > 0)
+    ESP_LOGI(TAG, "Dedup: %u won, %u lost to other radios (%zu in group)",
+             RadioStats::get(stats.dedup_won), RadioStats::get(stats.dedup_lost),
+             global_dedup.radios().size());
+#ifdef WMBUS_LATENCY_PROBES
+  ESP_LOGI(TAG, "Latency (us)        count     p50     p95     p99     max");
+  for (size_t i = 0; i < LATENCY_STAGE_COUNT; i++) {
+    auto stage = static_cast<LatencyStage>(i);
+    const auto &histogram = latencyHistogram(stage);
+    ESP_LOGI(TAG, "  %-16s %8u %7u %7u %7u %7u", latencyStageName(stage),
+             histogram.count(), histogram.percentile(50),
+             histogram.percentile(95), histogram.percentile(99),
+             histogram.max());
+  }
+#else
+  ESP_LOGI(TAG, "Latency probes disabled (latency_probes: false)");
+#endif
+}
+
+void Radio::dump_trace() {
+#ifdef USE_WMBUS_RADIO_TRACE
+  static constexpr size_t TRACE_DUMP_LINE_BYTES = 8 * Trace::RECORD_SIZE;
+  const auto data = global_trace.serialize();
+  const uint32_t records = (data.size() - Trace::HEADER_SIZE) / Trace::RECORD_SIZE;
+  ESP_LOGI(TAG, "Trace: %" PRIu32 " of %" PRIu32 " records since last clear",
+           records, global_trace.written());
+  // Whole records per line, so a line lost by the logger never misaligns the
+  // rest of the dump.
+  ESP_LOGI(TAG, "trace: %s", format_hex(data.data(), Trace::HEADER_SIZE).c_str());
+  for (size_t offset = Trace::HEADER_SIZE; offset < data.size();
+       offset += TRACE_DUMP_LINE_BYTES) {
+    const size_t length = std::min(TRACE_DUMP_LINE_BYTES, data.size() - offset);
+    ESP_LOGI(TAG, "trace: %s", format_hex(data.data() + offset, length).c_str());
+  }
+#else
+  ESP_LOGI(TAG, "Trace disabled (trace_buffer_size not set)");
+#endif
+}
+
+void Radio::reset_stats() {
+  if (this->radio != nullptr)
+    this->get_stats().rx_restart_latency_max_us.store(
+        0, std::memory_order_relaxed);
+#ifdef WMBUS_LATENCY_PROBES
+  for (size_t i = 0; i < LATENCY_STAGE_COUNT; i++)
+    latencyHistogram(static_cast<LatencyStage>(i)).reset();
+#endif
+}
+
 } // namespace wmbus_radio
 } // namespace esphome
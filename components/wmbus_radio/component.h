@@ -1,5 +1,6 @@
 #pragma once
 
+#include <atomic>
 #include <functional>
 
 #include "freertos/FreeRTOS.h"
@@ -11,6 +12,7 @@
 #include "esphome/components/wmbus_common/wmbus.h"
 
 #include "packet.h"
+#include "schedule.h"
 #include "transceiver.h"
 
 namespace esphome {
@@ -20,23 +22,92 @@ class Radio : public Component {
 public:
   Radio();
   void set_radio(RadioTransceiver *radio);
+  void set_trace_buffer_size(size_t records) {
+    this->trace_buffer_size_ = records;
+  };
+  // Joins the dedup group right away, so meters registered later are shared
+  // with every radio of it.
+  void set_dedup_window(uint32_t window_ms);
+  // Sleeps the transceiver outside the predicted transmit windows of the
+  // configured meters, listening continuously for resync_duration_ms every
+  // resync_interval_ms to learn and correct the schedules.
+  void set_duty_cycle(uint32_t resync_interval_ms, uint32_t resync_duration_ms) {
+    this->duty_cycle_ = true;
+    this->resync_interval_ms_ = resync_interval_ms;
+    this->resync_duration_ms_ = resync_duration_ms;
+  };
 
   void setup() override;
   void loop() override;
   void receive_frame();
   void wakeup_polling_receiver_task();
 
+  // Entry point for a frame received by this radio or injected from
+  // elsewhere, e.g. socket_receiver. With a dedup window the frame is held
+  // back to be compared with the copies of the other radios.
+  void handle_frame(Frame &&frame);
+  // Runs the frame handlers (meters, on_frame triggers), of all radios of the
+  // dedup group if this radio is in one.
+  void dispatch_frame(Frame &frame);
   void add_frame_handler(std::function<void(Frame *)> &&callback);
+  // Registers a configured meter with the address filter and the schedules,
+  // of all radios of the dedup group if this radio is in one.
+  void add_address_filter_id(uint32_t id);
+
+  const TransmitSchedules &get_schedules() const { return this->schedules_; }
+  // Time the transceiver spent asleep since boot.
+  uint32_t get_sleep_time_ms() const {
+    return this->sleep_time_ms_.load(std::memory_order_relaxed);
+  }
+
+  const RadioStats &get_stats() const { return this->radio->stats(); }
+  RadioStats &get_stats() { return this->radio->stats(); }
+  // Logs the receive path statistics, see wmbus_radio.dump_stats.
+  void dump_stats();
+  // Clears the latency histograms and the largest RX restart latency. The
+  // counters keep counting, sensors derive rates from them.
+  void reset_stats();
+  // Logs the trace ring as hex for tools/wmbus_trace.py, see
+  // wmbus_radio.dump_trace.
+  void dump_trace();
 
 protected:
   static void wakeup_receiver_task_from_isr(TaskHandle_t *arg);
   static void receiver_task(Radio *arg);
+  void add_meter_(uint32_t id);
+  void update_schedules_(uint32_t now_ms);
+  // Receiver task: sleeps until the next window if none is open.
+  bool sleep_until_window_();
 
   RadioTransceiver *radio;
   TaskHandle_t receiver_task_handle_;
   QueueHandle_t packet_queue_;
 
   std::vector<std::function<void(Frame *)>> handlers_;
+  size_t trace_buffer_size_{0};
+  uint32_t dedup_window_ms_{0};
+
+  // Learned from frames of the configured meters, used for the duty cycle.
+  TransmitSchedules schedules_;
+  bool duty_cycle_{false};
+  uint32_t resync_interval_ms_{0};
+  uint32_t resync_duration_ms_{0};
+  uint32_t resync_started_ms_{0};
+  // Written by loop(), read by the receiver task.
+  std::atomic<uint32_t> listen_from_ms_{0};
+  std::atomic<uint32_t> sleep_time_ms_{0};
+
+  // Woken this much before a window: restart_rx() and the frame's way
+  // through the queue to loop(), where arrivals are timed.
+  static constexpr uint32_t WAKE_MARGIN_MS = 50;
+  // Shorter sleeps are not worth the restart.
+  static constexpr uint32_t MIN_SLEEP_MS = 200;
+  // Sleeping re-checks listen_from_ms_ this often, a resync or a meter
+  // losing its schedule ends the sleep early.
+  static constexpr uint32_t SLEEP_STEP_MS = 250;
+  // Receive timeout of interrupt driven radios with a duty cycle, how soon
+  // an idle receiver notices it may sleep.
+  static constexpr uint32_t DUTY_CYCLE_POLL_MS = 1000;
 };
 } // namespace wmbus_radio
 } // namespace esphome
@@ -0,0 +1,82 @@
+#include "dedup.h"
+
+#include <algorithm>
+
+#include "component.h"
+
+namespace esphome {
+namespace wmbus_radio {
+FrameDeduplicator global_dedup;
+
+void FrameDeduplicator::add_radio(Radio *radio) {
+  if (!this->is_member(radio))
+    this->radios_.push_back(radio);
+}
+
+void FrameDeduplicator::set_window(uint32_t window_ms) {
+  this->window_ms_ = std::max(this->window_ms_, window_ms);
+}
+
+bool FrameDeduplicator::is_member(const Radio *radio) const {
+  return std::find(this->radios_.begin(), this->radios_.end(), radio) !=
+         this->radios_.end();
+}
+
+uint32_t FrameDeduplicator::hash_(Frame &frame) {
+  // FNV-1a, the DLL CRCs are gone so copies from different radios match.
+  uint32_t hash = 2166136261UL;
+  for (auto byte : frame.data())
+    hash = (hash ^ byte) * 16777619UL;
+  return hash;
+}
+
+void FrameDeduplicator::offer(Radio *radio, Frame &&frame, uint32_t now_ms) {
+  const uint32_t hash = hash_(frame);
+  for (auto &entry : this->entries_) {
+    // A hash collision must not drop the telegram of another meter.
+    if (entry.hash != hash || entry.frame.data() != frame.data())
+      continue;
+    if (!entry.forwarded && frame.rssi() > entry.frame.rssi()) {
+      RadioStats::increment(entry.radio->get_stats().dedup_lost);
+      entry.radio = radio;
+      entry.frame = std::move(frame);
+    } else {
+      RadioStats::increment(radio->get_stats().dedup_lost);
+    }
+    return;
+  }
+
+  if (this->entries_.size() >= MAX_ENTRIES) {
+    // The oldest entry goes first, even if its window is still open.
+    if (!this->entries_.front().forwarded)
+      this->forward_(0);
+    this->entries_.erase(this->entries_.begin());
+  }
+  this->entries_.push_back({hash, now_ms, radio, std::move(frame)});
+}
+
+void FrameDeduplicator::flush(uint32_t now_ms) {
+  for (size_t i = 0; i < this->entries_.size();) {
+    const uint32_t age = now_ms - this->entries_[i].first_seen_ms;
+    if (!this->entries_[i].forwarded && age >= this->window_ms_)
+      this->forward_(i);
+    // Late copies are caught for another window after forwarding.
+    if (this->entries_[i].forwarded && age >= 2 * this->window_ms_)
+      this->entries_.erase(this->entries_.begin() + i);
+    else
+      i++;
+  }
+}
+
+void FrameDeduplicator::forward_(size_t index) {
+  auto &entry = this->entries_[index];
+  Radio *winner = entry.radio;
+  // A copy: the entry keeps the bytes to match late copies against.
+  Frame frame = entry.frame;
+  entry.forwarded = true;
+
+  RadioStats::increment(winner->get_stats().dedup_won);
+  winner->dispatch_frame(frame);
+}
+} // namespace wmbus_radio
+} // namespace esphome
@@ -0,0 +1,57 @@
+#pragma once
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+#include "packet.h"
+
+namespace esphome {
+namespace wmbus_radio {
+class Radio;
+
+// Pools the frames of several radios covering the same meters. A frame is
+// held for the dedup window; copies of it received by other radios within
+// the window are compared by RSSI and only the strongest copy is handed to
+// the handlers of the group, once. Copies arriving after that are dropped.
+//
+// Only used from the main loop: Radio::loop() and socket_receiver.
+class FrameDeduplicator {
+public:
+  void add_radio(Radio *radio);
+  // The longest window asked for by any radio wins.
+  void set_window(uint32_t window_ms);
+
+  bool is_member(const Radio *radio) const;
+  const std::vector<Radio *> &radios() const { return this->radios_; }
+  uint32_t window() const { return this->window_ms_; }
+
+  void offer(Radio *radio, Frame &&frame, uint32_t now_ms);
+  // Forwards the frames whose window has passed.
+  void flush(uint32_t now_ms);
+
+protected:
+  struct Entry {
+    uint32_t hash;
+    uint32_t first_seen_ms;
+    Radio *radio;
+    // Kept after forwarding, the entry then only catches late copies. Copies
+    // are matched by their bytes, the hash only narrows the search.
+    Frame frame;
+    bool forwarded{false};
+  };
+
+  static uint32_t hash_(Frame &frame);
+  // By index: handlers may offer frames themselves and grow entries_.
+  void forward_(size_t index);
+
+  std::vector<Radio *> radios_;
+  std::vector<Entry> entries_;
+  uint32_t window_ms_{0};
+
+  // Frames held at most, more are forwarded before their window has passed.
+  static constexpr size_t MAX_ENTRIES = 32;
+};
+
+extern FrameDeduplicator global_dedup;
+} // namespace wmbus_radio
+} // namespace esphome
@@ -1,11 +1,15 @@
 #include "packet.h"
 
+#include <algorithm>
+#include <cstdio>
 #include <ctime>
 
 #include "esphome/components/wmbus_common/meters.h"
+#include "esphome/core/hal.h"
 #include "esphome/core/helpers.h"
 
 #include "decode3of6.h"
+#include "trace.h"
 
 #define WMBUS_PREAMBLE_SIZE (3)
 #define WMBUS_MODE_C_SUFIX_LEN (2)
@@ -112,11 +116,18 @@ bool Packet::calculate_payload_size() {
   return total_length;
 }
 
-std::optional<Frame> Packet::convert_to_frame() {
-  std::optional<Frame> frame = {};
+#ifdef WMBUS_LATENCY_PROBES
+// micros(), not the cycle counter: the receiver task and loop() may run on
+// different cores.
+void Packet::mark_queued() { this->queued_us_ = micros(); }
+uint32_t Packet::queued_for_us() { return micros() - this->queued_us_; }
+#endif
 
-  ESP_LOGD(TAG, "Have data from radio (%zu bytes)", this->data_.size());
-  debugPayload("raw packet", this->data_);
+std::optional<Frame> Packet::convert_to_frame(RadioStats &stats) {
+  LATENCY_PROBE(CrcTrim);
+  std::optional<Frame> frame = {};
+  const size_t packet_size = this->data_.size();
+  bool decode_failed = false;
 
   if (this->expected_size() == this->data_.size()) {
     if (this->link_mode() == LinkMode::T1) {
@@ -124,8 +135,12 @@ std::optional<Frame> Packet::convert_to_frame() {
       this->frame_format_ = "A";
       if (this->requires_decode_) {
         auto decoded_data = decode3of6(this->data_);
-        if (decoded_data)
+        if (decoded_data) {
           this->data_ = decoded_data.value();
+        } else {
+          RadioStats::increment(stats.decode_3of6_failures);
+          decode_failed = true;
+        }
       }
     } else if (this->link_mode() == LinkMode::C1) {
       if (this->data_[1] == WMBUS_BLOCK_A_PREAMBLE)
@@ -142,12 +157,20 @@ std::optional<Frame> Packet::convert_to_frame() {
              this->data_.size());
   }
 
-  removeAnyDLLCRCs(this->data_);
-  int dummy;
-  if (checkWMBusFrame(this->data_, (size_t *)&dummy, &dummy, &dummy, false) ==
-      FrameStatus::FullFrame)
-    frame.emplace(this);
+  // The still encoded bytes of a frame that failed 3-of-6 decoding would fail
+  // the CRC check too; each broken frame is counted once.
+  if (!decode_failed) {
+    if (!removeAnyDLLCRCs(this->data_))
+      RadioStats::increment(stats.crc_failures);
+    int dummy;
+    if (checkWMBusFrame(this->data_, (size_t *)&dummy, &dummy, &dummy,
+                        false) == FrameStatus::FullFrame)
+      frame.emplace(this);
+  }
 
+  trace_event(TraceEvent::PACKET_CONVERTED,
+              static_cast<uint16_t>(this->link_mode_), packet_size,
+              frame ? frame->data().size() : 0);
   delete this;
 
   return frame;
@@ -155,34 +178,51 @@ std::optional<Frame> Packet::convert_to_frame() {
 
 Frame::Frame(Packet *packet)
     : data_(std::move(packet->data_)), link_mode_(packet->link_mode_),
-      rssi_(packet->rssi_), format_(packet->frame_format_) {}
+      rssi_(packet->rssi_), format_(packet->frame_format_),
+      timestamp_(std::time(nullptr)) {}
 
 std::vector<uint8_t> &Frame::data() { return this->data_; }
 LinkMode Frame::link_mode() { return this->link_mode_; }
 int8_t Frame::rssi() { return this->rssi_; }
 std::string Frame::format() { return this->format_; }
 
-std::vector<uint8_t> Frame::as_raw() { return this->data_; }
-std::string Frame::as_hex() { return format_hex(this->data_); }
-std::string Frame::as_rtlwmbus() {
-  const size_t time_repr_size = sizeof("YYYY-MM-DD HH:MM:SS.00Z");
-  char time_buffer[time_repr_size];
-  auto t = std::time(NULL);
-  std::strftime(time_buffer, time_repr_size, "%F %T.00Z", std::gmtime(&t));
-
-  auto output = std::string{};
-  output.reserve(2 + 5 + 24 + 1 + 4 + 5 + 2 * this->data_.size() + 1);
-
-  output += linkModeName(this->link_mode_); // size 2
-  output += ";1;1;";                        // size 5
-  output += time_buffer;                    // size 24
-  output += ';';                            // size 1
-  output += std::to_string(this->rssi_);    // size up to 4
-  output += ";;;0x";                        // size 5
-  output += this->as_hex();                 // size 2 * frame.size()
-  output += "\n";                           // size 1
-
-  return output;
+const std::vector<uint8_t> &Frame::as_raw() { return this->data_; }
+
+const std::string &Frame::as_hex() {
+  if (this->hex_.empty())
+    this->append_hex(this->hex_);
+  return this->hex_;
+}
+
+const std::string &Frame::as_rtlwmbus() {
+  if (this->rtlwmbus_.empty())
+    this->append_rtlwmbus(this->rtlwmbus_);
+  return this->rtlwmbus_;
+}
+
+void Frame::append_hex(std::string &output) const {
+  static const char HEX_CHARS[] = "0123456789abcdef";
+  output.reserve(output.size() + 2 * this->data_.size());
+  for (auto byte : this->data_) {
+    output += HEX_CHARS[byte >> 4];
+    output += HEX_CHARS[byte & 0x0F];
+  }
+}
+
+void Frame::append_rtlwmbus(std::string &output) const {
+  // T1;1;1;YYYY-MM-DD HH:MM:SS.00Z;-100;;;0x<hex>\n
+  char prefix[64];
+  std::tm tm;
+  gmtime_r(&this->timestamp_, &tm);
+  size_t length = std::snprintf(
+      prefix, sizeof(prefix), "%s;1;1;%04d-%02d-%02d %02d:%02d:%02d.00Z;%d;;;0x",
+      linkModeName(this->link_mode_).c_str(), tm.tm_year + 1900, tm.tm_mon + 1,
+      tm.tm_mday, tm.tm_hour, tm.tm_min, tm.tm_sec, this->rssi_);
+
+  output.reserve(output.size() + length + 2 * this->data_.size() + 1);
+  output.append(prefix, std::min(length, sizeof(prefix) - 1));
+  this->append_hex(output);
+  output += '\n';
 }
 
 void Frame::mark_as_handled() { this->handlers_count_++; }
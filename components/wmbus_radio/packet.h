@@ -6,9 +6,12 @@
 #include <string>
 #include <vector>
 
+#include "esphome/components/wmbus_common/latency.h"
 #include "esphome/components/wmbus_common/wmbus.h"
 #include "esphome/core/helpers.h"
 
+#include "radio_stats.h"
+
 namespace esphome {
 namespace wmbus_radio {
 struct Frame;
@@ -22,17 +25,24 @@ public:
   uint8_t *rx_data_ptr();
   size_t rx_capacity();
   bool calculate_payload_size();
+  size_t expected_size();
   void set_rssi(int8_t rssi);
   void set_data(const std::vector<uint8_t> &data);
   void set_link_mode_hint(LinkMode mode);
   void set_requires_decode(bool required);
 
-  std::optional<Frame> convert_to_frame();
+  // Counts 3 of 6 and CRC failures into stats.
+  std::optional<Frame> convert_to_frame(RadioStats &stats);
+
+#ifdef WMBUS_LATENCY_PROBES
+  // Called by the receiver task right before the packet is queued.
+  void mark_queued();
+  uint32_t queued_for_us();
+#endif
 
 protected:
   std::vector<uint8_t> data_;
 
-  size_t expected_size();
   size_t expected_size_ = 0;
 
   uint8_t l_field();
@@ -43,6 +53,15 @@ protected:
   bool requires_decode_ = true;
 
   std::string frame_format_;
+#ifdef WMBUS_LATENCY_PROBES
+  uint32_t queued_us_ = 0;
+#endif
+};
+
+enum class FrameEncoding : uint8_t {
+  HEX,
+  RAW,
+  RTLWMBUS,
 };
 
 struct Frame {
@@ -54,9 +73,15 @@ public:
   int8_t rssi();
   std::string format();
 
-  std::vector<uint8_t> as_raw();
-  std::string as_hex();
-  std::string as_rtlwmbus();
+  // Encodings are built on first use and kept, so a frame forwarded to several
+  // sinks is encoded once. The references stay valid while the frame lives.
+  const std::vector<uint8_t> &as_raw();
+  const std::string &as_hex();
+  const std::string &as_rtlwmbus();
+
+  // Append the encoding to a caller owned (reusable) buffer.
+  void append_hex(std::string &output) const;
+  void append_rtlwmbus(std::string &output) const;
 
   void mark_as_handled();
   uint8_t handlers_count();
@@ -67,6 +92,11 @@ protected:
   int8_t rssi_;
   std::string format_;
   uint8_t handlers_count_ = 0;
+  // Reception time, used by the rtlwmbus encoding.
+  std::time_t timestamp_;
+
+  std::string hex_;
+  std::string rtlwmbus_;
 };
 
 } // namespace wmbus_radio
@@ -0,0 +1,57 @@
+#pragma once
+#include <atomic>
+#include <cstdint>
+
+namespace esphome {
+namespace wmbus_radio {
+// Receive path counters. Updated from the receiver task and from loop() with
+// relaxed atomics, which are lock-free on the ESP32, and read by the
+// wmbus_radio sensors. Counters only grow and wrap at 2^32.
+struct RadioStats {
+  std::atomic<uint32_t> frames_t1{0};
+  std::atomic<uint32_t> frames_c1{0};
+  // Neither frame format A nor B DLL CRCs matched.
+  std::atomic<uint32_t> crc_failures{0};
+  std::atomic<uint32_t> decode_3of6_failures{0};
+  std::atomic<uint32_t> fifo_overflows{0};
+  // Sync word seen, but the frame header never followed.
+  std::atomic<uint32_t> sync_timeouts{0};
+  // Packets lost because the queue to loop() was full.
+  std::atomic<uint32_t> queue_drops{0};
+  std::atomic<uint32_t> queue_high_water{0};
+  // Frames no meter or on_frame trigger claimed.
+  std::atomic<uint32_t> unhandled_frames{0};
+  // Frames of meters not configured, dropped by address_filter while still
+  // being received.
+  std::atomic<uint32_t> address_filter_rejected{0};
+  // Dedup group: frames this radio delivered as the strongest copy, and
+  // copies dropped because another radio had the frame with better RSSI
+  // or earlier.
+  std::atomic<uint32_t> dedup_won{0};
+  std::atomic<uint32_t> dedup_lost{0};
+  // Time from the request to restart RX until the radio listens again, the
+  // latest and the largest since boot or reset_stats(). Transceivers that do
+  // not measure it leave both at 0.
+  std::atomic<uint32_t> rx_restart_latency_us{0};
+  std::atomic<uint32_t> rx_restart_latency_max_us{0};
+
+  static void increment(std::atomic<uint32_t> &counter) {
+    counter.fetch_add(1, std::memory_order_relaxed);
+  }
+  static uint32_t get(const std::atomic<uint32_t> &counter) {
+    return counter.load(std::memory_order_relaxed);
+  }
+  // Only the receiver task writes the gauges below, no CAS loop needed.
+  void update_rx_restart_latency(uint32_t latency_us) {
+    this->rx_restart_latency_us.store(latency_us, std::memory_order_relaxed);
+    if (latency_us > get(this->rx_restart_latency_max_us))
+      this->rx_restart_latency_max_us.store(latency_us,
+                                            std::memory_order_relaxed);
+  }
+  void update_queue_high_water(uint32_t depth) {
+    if (depth > get(this->queue_high_water))
+      this->queue_high_water.store(depth, std::memory_order_relaxed);
+  }
+};
+} // namespace wmbus_radio
+} // namespace esphome
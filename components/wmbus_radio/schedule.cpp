@@ -0,0 +1,152 @@
+#include "schedule.h"
+
+#include <algorithm>
+
+namespace esphome {
+namespace wmbus_radio {
+void MeterSchedule::record(uint32_t now_ms) {
+  const uint32_t delta = now_ms - this->last_seen_ms;
+  if (this->seen && delta < MIN_INTERVAL_MS)
+    return;
+
+  if (this->predictable()) {
+    const int32_t offset = now_ms - this->predicted_ms;
+    if (uint32_t(std::abs(offset)) <= this->guard_ms()) {
+      this->hits++;
+      this->consecutive_misses = 0;
+    } else if (offset > 0 || !this->window_expired) {
+      // Off schedule; the current window will not see an arrival anymore.
+      // Early for it right after expire() means late for the window that was
+      // already counted as missed.
+      this->misses++;
+      this->consecutive_misses++;
+    }
+  }
+  this->window_expired = false;
+  // Back after it was lost: predict it again from this arrival.
+  if (this->lost())
+    this->consecutive_misses = 0;
+
+  if (!this->seen) {
+    this->seen = true;
+  } else if (std::isnan(this->interval_ms)) {
+    this->interval_ms = delta;
+  } else {
+    const float periods = std::round(delta / this->interval_ms);
+    const float error = delta - periods * this->interval_ms;
+    const float tolerance =
+        std::max(this->interval_ms * TOLERANCE, 4 * this->jitter_ms);
+    if (periods >= 1 && periods <= MAX_SKIPPED &&
+        std::fabs(error) <= tolerance) {
+      this->interval_ms += error / periods * EWMA_WEIGHT;
+      this->jitter_ms += (std::fabs(error) - this->jitter_ms) * EWMA_WEIGHT;
+      if (this->samples < UINT8_MAX)
+        this->samples++;
+      this->mismatches = 0;
+    } else if (++this->mismatches >= MAX_MISMATCHES) {
+      // The meter changed its period, or the first interval spanned skipped
+      // transmissions: start over from the latest one.
+      this->interval_ms = delta;
+      this->jitter_ms = 0;
+      this->samples = 0;
+      this->mismatches = 0;
+      this->consecutive_misses = 0;
+    }
+  }
+
+  this->last_seen_ms = now_ms;
+  if (!std::isnan(this->interval_ms))
+    this->predicted_ms = now_ms + uint32_t(this->interval_ms);
+}
+
+bool MeterSchedule::expire(uint32_t now_ms) {
+  const bool was_lost = this->lost();
+  while (this->predictable() &&
+         int32_t(now_ms - (this->predicted_ms + this->guard_ms())) > 0) {
+    this->misses++;
+    this->consecutive_misses++;
+    this->predicted_ms += uint32_t(this->interval_ms);
+    this->window_expired = true;
+  }
+  return !was_lost && this->lost();
+}
+
+bool MeterSchedule::predictable() const {
+  return this->samples >= MIN_SAMPLES &&
+         !this->lost() &&
+         this->jitter_ms <= this->interval_ms * MAX_JITTER;
+}
+
+uint32_t MeterSchedule::guard_ms() const {
+  return MIN_GUARD_MS + uint32_t(4 * this->jitter_ms);
+}
+
+void TransmitSchedules::add_meter(uint32_t id) {
+  auto it = std::lower_bound(
+      this->meters_.begin(), this->meters_.end(), id,
+      [](const MeterSchedule &meter, uint32_t id) { return meter.id < id; });
+  if (it != this->meters_.end() && it->id == id)
+    return;
+  MeterSchedule meter;
+  meter.id = id;
+  this->meters_.insert(it, meter);
+}
+
+bool TransmitSchedules::record(uint32_t id, uint32_t now_ms) {
+  auto it = std::lower_bound(
+      this->meters_.begin(), this->meters_.end(), id,
+      [](const MeterSchedule &meter, uint32_t id) { return meter.id < id; });
+  if (it == this->meters_.end() || it->id != id)
+    return false;
+  it->record(now_ms);
+  return true;
+}
+
+void TransmitSchedules::expire(
+    uint32_t now_ms,
+    const std::function<void(const MeterSchedule &)> &on_lost) {
+  for (auto &meter : this->meters_)
+    if (meter.expire(now_ms) && on_lost)
+      on_lost(meter);
+}
+
+uint32_t TransmitSchedules::listen_from(uint32_t now_ms) const {
+  bool any_predicted = false;
+  int32_t earliest = INT32_MAX;
+  for (const auto &meter : this->meters_) {
+    // Meters never heard or lost are left to the periodic full listen, a
+    // dead meter must not keep the receiver awake for all others.
+    if (!meter.seen || meter.lost())
+      continue;
+    if (!meter.predictable())
+      return now_ms;
+    const int32_t until = meter.predicted_ms - meter.guard_ms() - now_ms;
+    if (until <= 0)
+      return now_ms;
+    earliest = std::min(earliest, until);
+    any_predicted = true;
+  }
+  return any_predicted ? now_ms + earliest : now_ms;
+}
+
+uint32_t TransmitSchedules::hits() const {
+  uint32_t hits = 0;
+  for (const auto &meter : this->meters_)
+    hits += meter.hits;
+  return hits;
+}
+
+uint32_t TransmitSchedules::misses() const {
+  uint32_t misses = 0;
+  for (const auto &meter : this->meters_)
+    misses += meter.misses;
+  return misses;
+}
+
+float TransmitSchedules::hit_rate() const {
+  const uint32_t hits = this->hits();
+  const uint32_t total = hits + this->misses();
+  return total ? 100.0f * hits / total : NAN;
+}
+} // namespace wmbus_radio
+} // namespace esphome
@@ -0,0 +1,85 @@
+#pragma once
+#include <cmath>
+#include <cstdint>
+#include <functional>
+#include <vector>
+
+namespace esphome {
+namespace wmbus_radio {
+// Transmit schedule of one configured meter, learned from the times its
+// frames arrive. Meters transmit on a fixed period plus some jitter; missed
+// transmissions show up as multiples of the period and do not disturb it.
+struct MeterSchedule {
+  // DLL id, as registered by wmbus_meter.
+  uint32_t id{0};
+  bool seen{false};
+  uint32_t last_seen_ms{0};
+  float interval_ms{NAN};
+  // Mean absolute deviation of the arrivals from the learned period.
+  float jitter_ms{0};
+  // Intervals in a row that fitted the learned period.
+  uint8_t samples{0};
+  uint8_t mismatches{0};
+  uint8_t consecutive_misses{0};
+  // Next expected arrival, valid while predictable().
+  uint32_t predicted_ms{0};
+  // expire() counted a window as missed since the last arrival.
+  bool window_expired{false};
+  // Arrivals inside the predicted window, and windows that passed without
+  // one.
+  uint32_t hits{0};
+  uint32_t misses{0};
+
+  void record(uint32_t now_ms);
+  // Counts the windows that passed without an arrival, true when that made
+  // the meter lost().
+  bool expire(uint32_t now_ms);
+  bool predictable() const;
+  // Missed MAX_MISSES windows in a row, e.g. removed or out of range. Left to
+  // the periodic resync listen until it is heard again.
+  bool lost() const { return this->consecutive_misses >= MAX_MISSES; }
+  // Half width of the window around predicted_ms.
+  uint32_t guard_ms() const;
+
+  static constexpr uint8_t MIN_SAMPLES = 3;
+  static constexpr uint8_t MAX_MISMATCHES = 3;
+  static constexpr uint8_t MAX_MISSES = 3;
+  // Transmissions a meter may skip between two arrivals.
+  static constexpr uint8_t MAX_SKIPPED = 8;
+  // Arrivals closer together are repeats of the same transmission.
+  static constexpr uint32_t MIN_INTERVAL_MS = 1000;
+  // An interval fits the period within this fraction or 4 jitters.
+  static constexpr float TOLERANCE = 0.1f;
+  // Meters jittering more than this fraction of their period are not
+  // predicted, e.g. randomised transmit times.
+  static constexpr float MAX_JITTER = 0.2f;
+  static constexpr uint32_t MIN_GUARD_MS = 250;
+  static constexpr float EWMA_WEIGHT = 0.125f;
+};
+
+class TransmitSchedules {
+public:
+  void add_meter(uint32_t id);
+  // False for ids that belong to no configured meter.
+  bool record(uint32_t id, uint32_t now_ms);
+  // on_lost is called for each meter that expiring made lost().
+  void expire(uint32_t now_ms,
+              const std::function<void(const MeterSchedule &)> &on_lost = nullptr);
+  // Earliest time the receiver has to listen again, now_ms while a window is
+  // open, nothing was heard yet or a heard meter is still learning its
+  // schedule. Lost meters are skipped.
+  uint32_t listen_from(uint32_t now_ms) const;
+
+  uint32_t hits() const;
+  uint32_t misses() const;
+  // Percent of predicted windows that caught their frame, NaN before the
+  // first prediction was due.
+  float hit_rate() const;
+  const std::vector<MeterSchedule> &meters() const { return this->meters_; }
+
+protected:
+  // Sorted by id.
+  std::vector<MeterSchedule> meters_;
+};
+} // namespace wmbus_radio
+} // namespace esphome
@@ -0,0 +1,178 @@
+from esphome import config_validation as cv
+from esphome import codegen as cg
+from esphome.components import sensor
+from esphome.const import (
+    CONF_ID,
+    ENTITY_CATEGORY_DIAGNOSTIC,
+    STATE_CLASS_MEASUREMENT,
+    STATE_CLASS_TOTAL_INCREASING,
+    UNIT_PERCENT,
+)
+
+from .. import RadioComponent, enable_latency_probes, radio_ns
+
+CONF_RADIO_ID = "radio_id"
+CONF_FRAMES_PER_MINUTE_T1 = "frames_per_minute_t1"
+CONF_FRAMES_PER_MINUTE_C1 = "frames_per_minute_c1"
+CONF_CRC_FAILURES = "crc_failures"
+CONF_DECODE_3OF6_FAILURES = "decode_3of6_failures"
+CONF_FIFO_OVERFLOWS = "fifo_overflows"
+CONF_SYNC_TIMEOUTS = "sync_timeouts"
+CONF_QUEUE_DROPS = "queue_drops"
+CONF_QUEUE_HIGH_WATER = "queue_high_water"
+CONF_UNHANDLED_FRAMES = "unhandled_frames"
+CONF_ADDRESS_FILTER_REJECTED = "address_filter_rejected"
+CONF_DEDUP_WON = "dedup_won"
+CONF_DEDUP_LOST = "dedup_lost"
+CONF_SCHEDULE_HIT_RATE = "schedule_hit_rate"
+CONF_RX_DUTY_CYCLE = "rx_duty_cycle"
+CONF_RX_RESTART_LATENCY = "rx_restart_latency"
+UNIT_MICROSECOND = "µs"
+UNIT_FRAMES_PER_MINUTE = "frames/min"
+
+RadioSensor = radio_ns.class_(
+    "RadioSensor", cg.PollingComponent, cg.Parented.template(RadioComponent)
+)
+LatencyStage = cg.global_ns.enum("LatencyStage", is_class=True)
+LatencyStatistic = radio_ns.enum("LatencyStatistic", is_class=True)
+
+# Same order and names as LatencyStage / latencyStageName() in wmbus_common.
+LATENCY_STAGES = {
+    "isr_wakeup": LatencyStage.IsrWakeup,
+    "fifo_drain": LatencyStage.FifoDrain,
+    "queue_wait": LatencyStage.QueueWait,
+    "crc_trim": LatencyStage.CrcTrim,
+    "header_parse": LatencyStage.HeaderParse,
+    "decrypt": LatencyStage.Decrypt,
+    "parse_dv": LatencyStage.ParseDV,
+    "field_extraction": LatencyStage.FieldExtraction,
+    "json_render": LatencyStage.JsonRender,
+    "publish": LatencyStage.Publish,
+}
+# Counters of RadioStats, published as totals since boot.
+COUNTER_SENSORS = [
+    CONF_CRC_FAILURES,
+    CONF_DECODE_3OF6_FAILURES,
+    CONF_FIFO_OVERFLOWS,
+    CONF_SYNC_TIMEOUTS,
+    CONF_QUEUE_DROPS,
+    CONF_UNHANDLED_FRAMES,
+    CONF_ADDRESS_FILTER_REJECTED,
+    CONF_DEDUP_WON,
+    CONF_DEDUP_LOST,
+]
+
+LATENCY_STATISTICS = {
+    "p50": LatencyStatistic.P50,
+    "p95": LatencyStatistic.P95,
+    "p99": LatencyStatistic.P99,
+    "max": LatencyStatistic.MAX,
+}
+
+# latency_<stage>_<statistic>, e.g. latency_decrypt_p95. Values cover
+# everything since boot or the last wmbus_radio.dump_stats with reset.
+LATENCY_SENSORS = {
+    f"latency_{stage}_{statistic}": (stage, statistic)
+    for stage in LATENCY_STAGES
+    for statistic in LATENCY_STATISTICS
+}
+
+CONFIG_SCHEMA = cv.Schema(
+    {
+        cv.GenerateID(): cv.declare_id(RadioSensor),
+        cv.GenerateID(CONF_RADIO_ID): cv.use_id(RadioComponent),
+        # Frames received in the last update interval, per minute.
+        **{
+            cv.Optional(key): sensor.sensor_schema(
+                unit_of_measurement=UNIT_FRAMES_PER_MINUTE,
+                icon="mdi:radio-tower",
+                accuracy_decimals=1,
+                state_class=STATE_CLASS_MEASUREMENT,
+                entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+            )
+            for key in (CONF_FRAMES_PER_MINUTE_T1, CONF_FRAMES_PER_MINUTE_C1)
+        },
+        **{
+            cv.Optional(key): sensor.sensor_schema(
+                icon="mdi:alert-circle-outline",
+                accuracy_decimals=0,
+                state_class=STATE_CLASS_TOTAL_INCREASING,
+                entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+            )
+            for key in COUNTER_SENSORS
+        },
+        # Predicted transmit windows that caught their meter's frame, since
+        # boot.
+        cv.Optional(CONF_SCHEDULE_HIT_RATE): sensor.sensor_schema(
+            unit_of_measurement=UNIT_PERCENT,
+            icon="mdi:calendar-clock",
+            accuracy_decimals=1,
+            state_class=STATE_CLASS_MEASUREMENT,
+            entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+        ),
+        # Share of the last update interval the receiver was listening, below
+        # 100% only with duty_cycle.
+        cv.Optional(CONF_RX_DUTY_CYCLE): sensor.sensor_schema(
+            unit_of_measurement=UNIT_PERCENT,
+            icon="mdi:sleep",
+            accuracy_decimals=1,
+            state_class=STATE_CLASS_MEASUREMENT,
+            entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+        ),
+        # Latest time from the request to restart RX until the radio listens
+        # again, CC1101 only.
+        cv.Optional(CONF_RX_RESTART_LATENCY): sensor.sensor_schema(
+            unit_of_measurement=UNIT_MICROSECOND,
+            icon="mdi:timer-outline",
+            accuracy_decimals=0,
+            state_class=STATE_CLASS_MEASUREMENT,
+            entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+        ),
+        cv.Optional(CONF_QUEUE_HIGH_WATER): sensor.sensor_schema(
+            icon="mdi:tray-full",
+            accuracy_decimals=0,
+            state_class=STATE_CLASS_MEASUREMENT,
+            entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+        ),
+        **{
+            cv.Optional(key): sensor.sensor_schema(
+                unit_of_measurement=UNIT_MICROSECOND,
+                icon="mdi:timer-outline",
+                accuracy_decimals=0,
+                state_class=STATE_CLASS_MEASUREMENT,
+                entity_category=ENTITY_CATEGORY_DIAGNOSTIC,
+            )
+            for key in LATENCY_SENSORS
+        },
+    }
+).extend(cv.polling_component_schema("60s"))
+
+
+async def to_code(config):
+    var = cg.new_Pvariable(config[CONF_ID])
+    await cg.register_parented(var, config[CONF_RADIO_ID])
+    await cg.register_component(var, config)
+
+    for key in (
+        CONF_FRAMES_PER_MINUTE_T1,
+        CONF_FRAMES_PER_MINUTE_C1,
+        *COUNTER_SENSORS,
+        CONF_QUEUE_HIGH_WATER,
+        CONF_SCHEDULE_HIT_RATE,
+        CONF_RX_DUTY_CYCLE,
+        CONF_RX_RESTART_LATENCY,
+    ):
+        if key in config:
+            sens = await sensor.new_sensor(config[key])
+            cg.add(getattr(var, f"set_{key}_sensor")(sens))
+
+    for key, (stage, statistic) in LATENCY_SENSORS.items():
+        if key not in config:
+            continue
+        enable_latency_probes()
+        sens = await sensor.new_sensor(config[key])
+        cg.add(
+            var.add_latency_sensor(
+                LATENCY_STAGES[stage], LATENCY_STATISTICS[statistic], sens
+            )
+        )
@@ -0,0 +1,109 @@
+#include "sensor.h"
+
+#include "esphome/core/hal.h"
+#include "esphome/core/log.h"
+
+namespace esphome {
+namespace wmbus_radio {
+static const char *TAG = "wmbus_radio.sensor";
+
+static void publish_counter(sensor::Sensor *sensor,
+                            const std::atomic<uint32_t> &counter) {
+  if (sensor != nullptr)
+    sensor->publish_state(RadioStats::get(counter));
+}
+
+void RadioSensor::update() {
+  const auto &stats = this->parent_->get_stats();
+
+  const uint32_t now = millis();
+  const uint32_t frames_t1 = RadioStats::get(stats.frames_t1);
+  const uint32_t frames_c1 = RadioStats::get(stats.frames_c1);
+  const uint32_t sleep_time_ms = this->parent_->get_sleep_time_ms();
+  const float minutes = (now - this->last_update_ms_) / 60000.0f;
+  if (minutes > 0) {
+    if (this->rx_duty_cycle_sensor_ != nullptr)
+      this->rx_duty_cycle_sensor_->publish_state(
+          100.0f - 100.0f * (sleep_time_ms - this->last_sleep_time_ms_) /
+                       (now - this->last_update_ms_));
+    if (this->frames_per_minute_t1_sensor_ != nullptr)
+      this->frames_per_minute_t1_sensor_->publish_state(
+          (frames_t1 - this->last_frames_t1_) / minutes);
+    if (this->frames_per_minute_c1_sensor_ != nullptr)
+      this->frames_per_minute_c1_sensor_->publish_state(
+          (frames_c1 - this->last_frames_c1_) / minutes);
+  }
+  this->last_update_ms_ = now;
+  this->last_frames_t1_ = frames_t1;
+  this->last_frames_c1_ = frames_c1;
+  this->last_sleep_time_ms_ = sleep_time_ms;
+
+  if (this->schedule_hit_rate_sensor_ != nullptr)
+    this->schedule_hit_rate_sensor_->publish_state(
+        this->parent_->get_schedules().hit_rate());
+
+  publish_counter(this->crc_failures_sensor_, stats.crc_failures);
+  publish_counter(this->decode_3of6_failures_sensor_,
+                  stats.decode_3of6_failures);
+  publish_counter(this->fifo_overflows_sensor_, stats.fifo_overflows);
+  publish_counter(this->sync_timeouts_sensor_, stats.sync_timeouts);
+  publish_counter(this->queue_drops_sensor_, stats.queue_drops);
+  publish_counter(this->queue_high_water_sensor_, stats.queue_high_water);
+  publish_counter(this->rx_restart_latency_sensor_, stats.rx_restart_latency_us);
+  publish_counter(this->unhandled_frames_sensor_, stats.unhandled_frames);
+  publish_counter(this->address_filter_rejected_sensor_,
+                  stats.address_filter_rejected);
+  publish_counter(this->dedup_won_sensor_, stats.dedup_won);
+  publish_counter(this->dedup_lost_sensor_, stats.dedup_lost);
+
+#ifdef WMBUS_LATENCY_PROBES
+  for (auto &latency : this->latency_sensors_) {
+    const auto &histogram = latencyHistogram(latency.stage);
+    if (histogram.count() == 0)
+      continue;
+    uint32_t value = 0;
+    switch (latency.statistic) {
+    case LatencyStatistic::P50:
+      value = histogram.percentile(50);
+      break;
+    case LatencyStatistic::P95:
+      value = histogram.percentile(95);
+      break;
+    case LatencyStatistic::P99:
+      value = histogram.percentile(99);
+      break;
+    case LatencyStatistic::MAX:
+      value = histogram.max();
+      break;
+    }
+    latency.sensor->publish_state(value);
+  }
+#endif
+}
+
+void RadioSensor::dump_config() {
+  ESP_LOGCONFIG(TAG, "wM-Bus Radio Sensors:");
+  LOG_UPDATE_INTERVAL(this);
+  LOG_SENSOR("  ", "Frames per minute T1", this->frames_per_minute_t1_sensor_);
+  LOG_SENSOR("  ", "Frames per minute C1", this->frames_per_minute_c1_sensor_);
+  LOG_SENSOR("  ", "CRC failures", this->crc_failures_sensor_);
+  LOG_SENSOR("  ", "3-of-6 failures", this->decode_3of6_failures_sensor_);
+  LOG_SENSOR("  ", "FIFO overflows", this->fifo_overflows_sensor_);
+  LOG_SENSOR("  ", "Sync timeouts", this->sync_timeouts_sensor_);
+  LOG_SENSOR("  ", "Queue drops", this->queue_drops_sensor_);
+  LOG_SENSOR("  ", "Queue high water", this->queue_high_water_sensor_);
+  LOG_SENSOR("  ", "Unhandled frames", this->unhandled_frames_sensor_);
+  LOG_SENSOR("  ", "Address filter rejected",
+             this->address_filter_rejected_sensor_);
+  LOG_SENSOR("  ", "Dedup won", this->dedup_won_sensor_);
+  LOG_SENSOR("  ", "Dedup lost", this->dedup_lost_sensor_);
+  LOG_SENSOR("  ", "Schedule hit rate", this->schedule_hit_rate_sensor_);
+  LOG_SENSOR("  ", "RX duty cycle", this->rx_duty_cycle_sensor_);
+  LOG_SENSOR("  ", "RX restart latency", this->rx_restart_latency_sensor_);
+#ifdef WMBUS_LATENCY_PROBES
+  for (auto &latency : this->latency_sensors_)
+    LOG_SENSOR("  ", latencyStageName(latency.stage), latency.sensor);
+#endif
+}
+} // namespace wmbus_radio
+} // namespace esphome
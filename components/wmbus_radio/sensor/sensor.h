@@ -0,0 +1,110 @@
+#pragma once
+#include <vector>
+
+#include "esphome/components/sensor/sensor.h"
+#include "esphome/core/component.h"
+#include "esphome/core/helpers.h"
+
+#include "../component.h"
+
+namespace esphome {
+namespace wmbus_radio {
+enum class LatencyStatistic : uint8_t {
+  P50,
+  P95,
+  P99,
+  MAX,
+};
+
+class RadioSensor : public PollingComponent, public Parented<Radio> {
+public:
+  void update() override;
+  void dump_config() override;
+
+  void set_frames_per_minute_t1_sensor(sensor::Sensor *sensor) {
+    this->frames_per_minute_t1_sensor_ = sensor;
+  };
+  void set_frames_per_minute_c1_sensor(sensor::Sensor *sensor) {
+    this->frames_per_minute_c1_sensor_ = sensor;
+  };
+  void set_crc_failures_sensor(sensor::Sensor *sensor) {
+    this->crc_failures_sensor_ = sensor;
+  };
+  void set_decode_3of6_failures_sensor(sensor::Sensor *sensor) {
+    this->decode_3of6_failures_sensor_ = sensor;
+  };
+  void set_fifo_overflows_sensor(sensor::Sensor *sensor) {
+    this->fifo_overflows_sensor_ = sensor;
+  };
+  void set_sync_timeouts_sensor(sensor::Sensor *sensor) {
+    this->sync_timeouts_sensor_ = sensor;
+  };
+  void set_queue_drops_sensor(sensor::Sensor *sensor) {
+    this->queue_drops_sensor_ = sensor;
+  };
+  void set_queue_high_water_sensor(sensor::Sensor *sensor) {
+    this->queue_high_water_sensor_ = sensor;
+  };
+  void set_unhandled_frames_sensor(sensor::Sensor *sensor) {
+    this->unhandled_frames_sensor_ = sensor;
+  };
+  void set_address_filter_rejected_sensor(sensor::Sensor *sensor) {
+    this->address_filter_rejected_sensor_ = sensor;
+  };
+  void set_dedup_won_sensor(sensor::Sensor *sensor) {
+    this->dedup_won_sensor_ = sensor;
+  };
+  void set_dedup_lost_sensor(sensor::Sensor *sensor) {
+    this->dedup_lost_sensor_ = sensor;
+  };
+  void set_schedule_hit_rate_sensor(sensor::Sensor *sensor) {
+    this->schedule_hit_rate_sensor_ = sensor;
+  };
+  void set_rx_duty_cycle_sensor(sensor::Sensor *sensor) {
+    this->rx_duty_cycle_sensor_ = sensor;
+  };
+  void set_rx_restart_latency_sensor(sensor::Sensor *sensor) {
+    this->rx_restart_latency_sensor_ = sensor;
+  };
+
+#ifdef WMBUS_LATENCY_PROBES
+  void add_latency_sensor(LatencyStage stage, LatencyStatistic statistic,
+                          sensor::Sensor *sensor) {
+    this->latency_sensors_.push_back({stage, statistic, sensor});
+  };
+#endif
+
+protected:
+  sensor::Sensor *frames_per_minute_t1_sensor_{nullptr};
+  sensor::Sensor *frames_per_minute_c1_sensor_{nullptr};
+  sensor::Sensor *crc_failures_sensor_{nullptr};
+  sensor::Sensor *decode_3of6_failures_sensor_{nullptr};
+  sensor::Sensor *fifo_overflows_sensor_{nullptr};
+  sensor::Sensor *sync_timeouts_sensor_{nullptr};
+  sensor::Sensor *queue_drops_sensor_{nullptr};
+  sensor::Sensor *queue_high_water_sensor_{nullptr};
+  sensor::Sensor *unhandled_frames_sensor_{nullptr};
+  sensor::Sensor *address_filter_rejected_sensor_{nullptr};
+  sensor::Sensor *dedup_won_sensor_{nullptr};
+  sensor::Sensor *dedup_lost_sensor_{nullptr};
+  sensor::Sensor *schedule_hit_rate_sensor_{nullptr};
+  sensor::Sensor *rx_duty_cycle_sensor_{nullptr};
+  sensor::Sensor *rx_restart_latency_sensor_{nullptr};
+
+  // Frame counts at the previous update, for the per minute rates.
+  uint32_t last_update_ms_{0};
+  uint32_t last_frames_t1_{0};
+  uint32_t last_frames_c1_{0};
+  uint32_t last_sleep_time_ms_{0};
+
+#ifdef WMBUS_LATENCY_PROBES
+  struct LatencySensor {
+    LatencyStage stage;
+    LatencyStatistic statistic;
+    sensor::Sensor *sensor;
+  };
+  std::vector<LatencySensor> latency_sensors_;
+#endif
+};
+} // namespace wmbus_radio
+} // namespace esphome
@@ -0,0 +1,88 @@
+#include "trace.h"
+
+#include <algorithm>
+#include <cinttypes>
+
+#include "esphome/core/hal.h"
+#include "esphome/core/helpers.h"
+
+namespace esphome {
+namespace wmbus_radio {
+static const char *TRACE_EVENT_NAMES[] = {
+    "unknown",        "rx_restart",     "sync_detected",    "sync_timeout",
+    "noise_flush",    "fifo_overflow",  "rx_entry_overflow", "header",
+    "frame_detected", "frame_complete", "foreign_frame",    "decoded_3of6",
+    "packet_queued",  "queue_drop",     "packet_converted", "frame_dispatched",
+    "radio_sleep",    "radio_wake",
+};
+
+const char *trace_event_name(TraceEvent event) {
+  size_t index = static_cast<size_t>(event);
+  return index < sizeof(TRACE_EVENT_NAMES) / sizeof(TRACE_EVENT_NAMES[0])
+             ? TRACE_EVENT_NAMES[index]
+             : TRACE_EVENT_NAMES[0];
+}
+
+Trace global_trace;
+
+bool Trace::allocate(size_t records) {
+  if (this->records_ != nullptr)
+    return true;
+  size_t capacity = 1;
+  while (capacity < records)
+    capacity <<= 1;
+  RAMAllocator<TraceRecord> allocator;
+  this->records_ = allocator.allocate(capacity);
+  if (this->records_ == nullptr)
+    return false;
+  this->mask_ = capacity - 1;
+  this->clear();
+  return true;
+}
+
+void Trace::record(TraceEvent event, uint16_t a, uint32_t b, uint32_t c) {
+  if (this->records_ == nullptr)
+    return;
+  // Claiming the slot first keeps concurrent writers apart.
+  const uint32_t index = this->head_.fetch_add(1, std::memory_order_relaxed);
+  auto &record = this->records_[index & this->mask_];
+  record.timestamp_us = micros();
+  record.event = event;
+  record.a = a;
+  record.b = b;
+  record.c = c;
+}
+
+void Trace::clear() { this->head_.store(0, std::memory_order_relaxed); }
+
+std::vector<uint8_t> Trace::serialize() const {
+  std::vector<uint8_t> out = {'W', 'T', 'R', FORMAT_VERSION};
+  if (this->records_ == nullptr)
+    return out;
+  const uint32_t head = this->written();
+  const uint32_t count = std::min<uint32_t>(head, this->capacity());
+  out.reserve(out.size() + count * RECORD_SIZE);
+  auto put = [&out](uint32_t value, size_t bytes) {
+    while (bytes--)
+      out.push_back(value >> (8 * bytes));
+  };
+  for (uint32_t i = head - count; i != head; i++) {
+    const auto &record = this->records_[i & this->mask_];
+    put(record.timestamp_us, 4);
+    put(static_cast<uint16_t>(record.event), 2);
+    put(record.a, 2);
+    put(record.b, 4);
+    put(record.c, 4);
+  }
+  return out;
+}
+
+#if ESPHOME_LOG_LEVEL >= ESPHOME_LOG_LEVEL_VERBOSE
+static const char *TAG = "wmbus_trace";
+
+void trace_log(TraceEvent event, uint16_t a, uint32_t b, uint32_t c) {
+  ESP_LOGV(TAG, "%s %u %" PRIu32 " %" PRIu32, trace_event_name(event), a, b, c);
+}
+#endif
+} // namespace wmbus_radio
+} // namespace esphome
@@ -0,0 +1,92 @@
+#pragma once
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+#include "esphome/core/defines.h"
+#include "esphome/core/log.h"
+
+namespace esphome {
+namespace wmbus_radio {
+// Events of the receive path trace. The values are the wire format decoded
+// by tools/wmbus_trace.py: add new events at the end, never renumber.
+enum class TraceEvent : uint16_t {
+  RX_RESTART = 1,    // a: 1 fast restart / 0 full, b: duration us
+  SYNC_DETECTED,     //
+  SYNC_TIMEOUT,      //
+  NOISE_FLUSH,       // a: FIFO bytes without sync
+  FIFO_OVERFLOW,     // a: RxLoopState, b: bytes received
+  RX_ENTRY_OVERFLOW, //
+  HEADER,            // a: FIFO bytes, b: the 4 header bytes
+  FRAME_DETECTED,    // a: mode << 8 | block, b: L-field, c: expected bytes
+  FRAME_COMPLETE,    // a: TraceFrameEnd, b: bytes received
+  FOREIGN_FRAME,     // a: bytes received, b: DLL id
+  DECODED_3OF6,      // a: 1 ok / 0 failed, b: decoded bytes
+  PACKET_QUEUED,     // a: queue depth
+  QUEUE_DROP,        //
+  PACKET_CONVERTED,  // a: LinkMode, b: packet bytes, c: frame bytes, 0 failed
+  FRAME_DISPATCHED,  // a: handlers, b: frame bytes, c: RSSI dBm (int8)
+  RADIO_SLEEP,       // b: planned ms
+  RADIO_WAKE,        // b: slept ms
+};
+
+enum class TraceFrameEnd : uint16_t { GDO2, CHIP_STATE, LENGTH };
+
+const char *trace_event_name(TraceEvent event);
+
+struct TraceRecord {
+  uint32_t timestamp_us;
+  TraceEvent event;
+  uint16_t a;
+  uint32_t b;
+  uint32_t c;
+};
+
+// Fixed ring of binary records. record() is O(1) and lock-free so it can be
+// called from the receiver task and loop() alike; nothing is formatted until
+// the ring is dumped (wmbus_radio.dump_trace) or serialized for a host tool.
+class Trace {
+public:
+  // Rounds up to a power of two. Without a successful allocation record() is
+  // a no-op; once allocated, further calls keep the existing ring.
+  bool allocate(size_t records);
+  void record(TraceEvent event, uint16_t a, uint32_t b, uint32_t c);
+  void clear();
+
+  size_t capacity() const { return this->mask_ + 1; }
+  // Records written since the last clear(), including overwritten ones.
+  uint32_t written() const { return this->head_.load(std::memory_order_relaxed); }
+  // Oldest record first, prefixed with a 4 byte magic and version. Records
+  // written during the copy may come out torn or twice.
+  std::vector<uint8_t> serialize() const;
+
+  static constexpr size_t HEADER_SIZE = 4;
+  static constexpr size_t RECORD_SIZE = 16;
+  static constexpr uint8_t FORMAT_VERSION = 1;
+
+protected:
+  TraceRecord *records_{nullptr};
+  size_t mask_{0};
+  std::atomic<uint32_t> head_{0};
+};
+
+// One ring for all radios; they share a receive path.
+extern Trace global_trace;
+
+#if ESPHOME_LOG_LEVEL >= ESPHOME_LOG_LEVEL_VERBOSE
+void trace_log(TraceEvent event, uint16_t a, uint32_t b, uint32_t c);
+#endif
+
+// Hot path replacement for ESP_LOGD: into the ring with trace_buffer_size
+// set, otherwise a generic verbose log line, otherwise nothing.
+inline void trace_event(TraceEvent event, uint16_t a = 0, uint32_t b = 0,
+                        uint32_t c = 0) {
+#ifdef USE_WMBUS_RADIO_TRACE
+  global_trace.record(event, a, b, c);
+#elif ESPHOME_LOG_LEVEL >= ESPHOME_LOG_LEVEL_VERBOSE
+  trace_log(event, a, b, c);
+#endif
+}
+} // namespace wmbus_radio
+} // namespace esphome
@@ -1,9 +1,12 @@
 #include "transceiver.h"
+#include "packet.h"
 
 #include "esphome/core/log.h"
 
 #include "freertos/FreeRTOS.h"
 
+#include <algorithm>
+
 namespace esphome {
 namespace wmbus_radio {
 static const char *TAG = "wmbus.transceiver";
@@ -16,26 +19,42 @@ RadioTransceiver::RadioTransceiver()
   : reset_pin_(nullptr)
   , irq_pin_(nullptr)
   , polling_interval_ms_(DEFAULT_POLLING_INTERVAL_MS)
-  , packet_queue_(nullptr) {
+  , packet_queue_(nullptr)
+  , read_timeout_ms_(1)
+  , address_filter_enabled_(false) {
 }
 
 bool RadioTransceiver::read_in_task(uint8_t *buffer, size_t length) {
   const uint8_t *buffer_end = buffer + length;
-  int wait_count = 0;
 
   while (buffer != buffer_end) {
-    auto byte = this->read();
-    if (byte.has_value())
-      *buffer++ = *byte;
-    else if (!ulTaskNotifyTake(pdTRUE, pdMS_TO_TICKS(1)))
-      return false;
-    else
-      wait_count++;
+    auto count = this->read_chunk(buffer, buffer_end - buffer);
+    if (count > 0) {
+      buffer += count;
+      continue;
+    }
+    if (!ulTaskNotifyTake(pdTRUE, pdMS_TO_TICKS(this->read_timeout_ms_))) {
+      // The tail of a frame may never raise another interrupt, poll once more.
+      count = this->read_chunk(buffer, buffer_end - buffer);
+      if (count == 0)
+        return false;
+      buffer += count;
+    }
   }
 
   return true;
 }
 
+size_t RadioTransceiver::read_chunk(uint8_t *buffer, size_t length) {
+  auto byte = this->read();
+  if (!byte.has_value())
+    return 0;
+  *buffer = *byte;
+  return 1;
+}
+
+void RadioTransceiver::set_expected_frame_length(size_t length) {}
+
 void RadioTransceiver::set_reset_pin(InternalGPIOPin *reset_pin) {
   this->reset_pin_ = reset_pin;
 }
@@ -67,10 +86,52 @@ void RadioTransceiver::set_packet_queue(QueueHandle_t queue) {
   this->packet_queue_ = queue;
 }
 
+bool RadioTransceiver::queue_packet(std::unique_ptr<Packet> &packet) {
+  auto packet_ptr = packet.get();
+#ifdef WMBUS_LATENCY_PROBES
+  packet->mark_queued();
+#endif
+  if (xQueueSend(this->packet_queue_, &packet_ptr, 0) != pdTRUE) {
+    RadioStats::increment(this->stats_.queue_drops);
+    trace_event(TraceEvent::QUEUE_DROP);
+    ESP_LOGW(TAG, "Queue send failed");
+    return false;
+  }
+  packet.release();
+  auto depth = uxQueueMessagesWaiting(this->packet_queue_);
+  this->stats_.update_queue_high_water(depth);
+  trace_event(TraceEvent::PACKET_QUEUED, depth);
+  return true;
+}
+
 gpio::InterruptType RadioTransceiver::irq_interrupt_type() const {
   return gpio::INTERRUPT_FALLING_EDGE;
 }
 
+bool RadioTransceiver::sleep() { return false; }
+
+void RadioTransceiver::set_address_filter(bool enabled) {
+  this->address_filter_enabled_ = enabled;
+}
+
+void RadioTransceiver::add_address_filter_id(uint32_t id) {
+  auto it = std::lower_bound(this->address_filter_ids_.begin(),
+                             this->address_filter_ids_.end(), id);
+  if (it == this->address_filter_ids_.end() || *it != id)
+    this->address_filter_ids_.insert(it, id);
+}
+
+bool RadioTransceiver::address_filter_active() const {
+  // Without any configured meter there is nothing to match against, so the
+  // filter stays transparent instead of dropping every frame.
+  return this->address_filter_enabled_ && !this->address_filter_ids_.empty();
+}
+
+bool RadioTransceiver::address_filter_accepts(uint32_t id) const {
+  return std::binary_search(this->address_filter_ids_.begin(),
+                            this->address_filter_ids_.end(), id);
+}
+
 void RadioTransceiver::reset() {
   if (this->reset_pin_ != nullptr) {
     this->reset_pin_->digital_write(0);
@@ -104,6 +165,14 @@ uint8_t RadioTransceiver::spi_read(uint8_t address) {
   return this->spi_transaction(0x00, address, {0});
 }
 
+void RadioTransceiver::spi_read_burst(uint8_t address, uint8_t *buffer,
+                                      size_t length) {
+  this->delegate_->begin_transaction();
+  this->delegate_->transfer(address);
+  this->delegate_->read_array(buffer, length);
+  this->delegate_->end_transaction();
+}
+
 void RadioTransceiver::spi_write(uint8_t address,
                                  std::initializer_list<uint8_t> data) {
   this->spi_transaction(0x80, address, data);
@@ -117,6 +186,9 @@ void RadioTransceiver::dump_config() {
   ESP_LOGCONFIG(TAG, "Transceiver: %s", this->get_name());
   LOG_PIN("  Reset Pin: ", this->reset_pin_);
   LOG_PIN("  IRQ Pin: ", this->irq_pin_);
+  if (this->address_filter_enabled_)
+    ESP_LOGCONFIG(TAG, "  Address filter: %zu meters",
+                  this->address_filter_ids_.size());
 }
 } // namespace wmbus_radio
 } // namespace esphome
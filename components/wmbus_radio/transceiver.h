@@ -6,6 +6,11 @@
 #include "freertos/task.h"
 #include "freertos/queue.h"
 #include <cstdint>
+#include <memory>
+#include <vector>
+
+#include "radio_stats.h"
+#include "trace.h"
 
 #define BYTE(x, n) ((uint8_t)(x >> (n * 8)))
 
@@ -18,6 +23,8 @@
 
 namespace esphome {
 namespace wmbus_radio {
+struct Packet;
+
 class RadioTransceiver
     : public Component,
       public spi::SPIDevice<spi::BIT_ORDER_MSB_FIRST, spi::CLOCK_POLARITY_LOW,
@@ -36,6 +43,9 @@ public:
   bool has_irq_pin() const;
 
   virtual void restart_rx() = 0;
+  // Powers the receiver down between predicted transmit windows, until the
+  // next restart_rx(). False if not supported or a frame is in progress.
+  virtual bool sleep();
   virtual int8_t get_rssi() = 0;
   virtual const char *get_name() = 0;
 
@@ -43,6 +53,7 @@ public:
   virtual void run_receiver();
 
   bool read_in_task(uint8_t *buffer, size_t length);
+  virtual void set_expected_frame_length(size_t length);
 
   void set_spi(spi::SPIDelegate *spi);
   void set_reset_pin(InternalGPIOPin *reset_pin);
@@ -50,21 +61,43 @@ public:
   void set_polling_interval(uint32_t interval_ms);
   uint32_t get_polling_interval() const;
   void set_packet_queue(QueueHandle_t queue);
+  // Hands the packet over to Radio::loop(). On a full queue the packet is
+  // dropped (counted) and stays owned by the caller.
+  bool queue_packet(std::unique_ptr<Packet> &packet);
+  RadioStats &stats() { return this->stats_; }
+  const RadioStats &stats() const { return this->stats_; }
   virtual gpio::InterruptType irq_interrupt_type() const;
 
+  void set_address_filter(bool enabled);
+  void add_address_filter_id(uint32_t id);
+
 protected:
   InternalGPIOPin *reset_pin_;
   InternalGPIOPin *irq_pin_;
   uint32_t polling_interval_ms_;
   QueueHandle_t packet_queue_;
+  RadioStats stats_;
+  // How long read_in_task waits for the next data interrupt before giving up.
+  uint32_t read_timeout_ms_;
+
+  // Sorted, unique DLL ids of configured meters. The four ID bytes of the
+  // A-field are sent least significant first and stored as the printed
+  // meter id, e.g. 0x12345678 for meter 12345678.
+  bool address_filter_enabled_;
+  std::vector<uint32_t> address_filter_ids_;
+
+  bool address_filter_active() const;
+  bool address_filter_accepts(uint32_t id) const;
 
   virtual optional<uint8_t> read() = 0;
+  virtual size_t read_chunk(uint8_t *buffer, size_t length);
 
   void reset();
   void common_setup();
   uint8_t spi_transaction(uint8_t operation, uint8_t address,
                           std::initializer_list<uint8_t> data);
   uint8_t spi_read(uint8_t address);
+  void spi_read_burst(uint8_t address, uint8_t *buffer, size_t length);
   void spi_write(uint8_t address, std::initializer_list<uint8_t> data);
   void spi_write(uint8_t address, uint8_t data);
 };
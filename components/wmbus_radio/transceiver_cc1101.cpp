@@ -2,8 +2,10 @@
 #include "cc1101_rf_settings.h"
 #include "decode3of6.h"
 #include "packet.h"
+#include "esphome/core/helpers.h"
 #include "esphome/core/log.h"
 #include <algorithm>
+#include <cinttypes>
 
 namespace esphome {
 namespace wmbus_radio {
@@ -67,7 +69,12 @@ CC1101::CC1101()
     , wmbus_mode_(WMBusMode::UNKNOWN)
     , wmbus_block_(WMBusBlock::UNKNOWN)
     , sync_time_(0)
-    , max_wait_time_(150) {}
+    , max_wait_time_(150)
+    , address_checked_(false)
+    , frame_completed_(false)
+    , last_calibration_ms_(0)
+    , fast_restarts_(0)
+    , full_restarts_(0) {}
 
 const char *CC1101::get_name() {
   return "CC1101";
@@ -94,6 +101,11 @@ void CC1101::set_gdo2_pin(InternalGPIOPin *pin) {
 void CC1101::set_frequency(float freq_mhz) {
   this->frequency_mhz_ = freq_mhz;
 }
+
+void CC1101::dump_config() {
+  RadioTransceiver::dump_config();
+  ESP_LOGCONFIG(TAG, "  RX restarts: %u fast, %u full", this->fast_restarts_, this->full_restarts_);
+}
 static size_t mode_a_decoded_size(uint8_t l_field) {
   size_t num_blocks = (l_field < 26) ? 2 : ((l_field - 26) / 16 + 3);
   return l_field + 1 + 2 * num_blocks;
@@ -149,17 +161,22 @@ void CC1101::setup() {
   ESP_LOGCONFIG(TAG, "CC1101 detected - PARTNUM: 0x%02X, VERSION: 0x%02X", partnum, version);
   ESP_LOGD(TAG, "Applying wM-Bus RF settings (%zu registers)...", CC1101_WMBUS_RF_SETTINGS.size());
   apply_wmbus_rf_settings(*this->driver_);
-  uint8_t iocfg2 = this->driver_->read_register(CC1101Register::IOCFG2);
-  uint8_t iocfg0 = this->driver_->read_register(CC1101Register::IOCFG0);
-  uint8_t sync1 = this->driver_->read_register(CC1101Register::SYNC1);
-  uint8_t sync0 = this->driver_->read_register(CC1101Register::SYNC0);
+  // Read the whole configuration back in one burst instead of register by register.
+  const auto expected = wmbus_rf_settings_values();
+  std::array<uint8_t, CC1101_CONFIG_REGISTER_COUNT> actual{};
+  this->driver_->read_burst(CC1101Register::IOCFG2, actual.data(), actual.size());
   ESP_LOGD(TAG, "Register verification:");
-  ESP_LOGD(TAG, "  IOCFG2 (GDO2 config): 0x%02X (expected: 0x06)", iocfg2);
-  ESP_LOGD(TAG, "  IOCFG0 (GDO0 config): 0x%02X (expected: 0x00)", iocfg0);
-  ESP_LOGD(TAG, "  SYNC1: 0x%02X (expected: 0x54)", sync1);
-  ESP_LOGD(TAG, "  SYNC0: 0x%02X (expected: 0x3D)", sync0);
-  bool registers_ok = (iocfg2 == 0x06) && (iocfg0 == 0x00) &&
-                      (sync1 == 0x54) && (sync0 == 0x3D);
+  ESP_LOGD(TAG, "  IOCFG2 (GDO2 config): 0x%02X (expected: 0x06)", actual[static_cast<size_t>(CC1101Register::IOCFG2)]);
+  ESP_LOGD(TAG, "  IOCFG0 (GDO0 config): 0x%02X (expected: 0x00)", actual[static_cast<size_t>(CC1101Register::IOCFG0)]);
+  ESP_LOGD(TAG, "  SYNC1: 0x%02X (expected: 0x54)", actual[static_cast<size_t>(CC1101Register::SYNC1)]);
+  ESP_LOGD(TAG, "  SYNC0: 0x%02X (expected: 0x3D)", actual[static_cast<size_t>(CC1101Register::SYNC0)]);
+  bool registers_ok = true;
+  for (size_t i = 0; i < actual.size(); i++) {
+    if (actual[i] != expected[i]) {
+      ESP_LOGD(TAG, "  Register 0x%02X: 0x%02X (expected: 0x%02X)", static_cast<unsigned>(i), actual[i], expected[i]);
+      registers_ok = false;
+    }
+  }
   if (!registers_ok) {
     ESP_LOGW(TAG, "Register verification failed! SPI communication may be unreliable.");
   } else {
@@ -168,9 +185,9 @@ void CC1101::setup() {
   if (this->frequency_mhz_ != 868.95f) {
     ESP_LOGD(TAG, "Setting custom frequency: %.2f MHz", this->frequency_mhz_);
     set_carrier_frequency(*this->driver_, this->frequency_mhz_);
-    uint8_t freq2 = this->driver_->read_register(CC1101Register::FREQ2);
-    uint8_t freq1 = this->driver_->read_register(CC1101Register::FREQ1);
-    uint8_t freq0 = this->driver_->read_register(CC1101Register::FREQ0);
+    uint8_t freq[3];
+    this->driver_->read_burst(CC1101Register::FREQ2, freq, sizeof(freq));
+    const uint8_t freq2 = freq[0], freq1 = freq[1], freq0 = freq[2];
     uint32_t freq_reg = (static_cast<uint32_t>(freq2) << 16) |
                         (static_cast<uint32_t>(freq1) << 8) |
                         freq0;
@@ -210,9 +227,36 @@ void CC1101::setup() {
 void CC1101::restart_rx() {
   if (this->is_failed())
     return;
-  this->set_idle_();
+  if (this->sleeping_)
+    this->wake_();
+  this->frame_completed_ = false;
   this->init_rx_();
 }
+bool CC1101::sleep() {
+  if (this->is_failed() || (this->rx_state_ != RxLoopState::WAIT_FOR_SYNC &&
+                            this->rx_state_ != RxLoopState::INIT_RX))
+    return false;
+  this->set_idle_();
+  this->driver_->send_strobe(CC1101Strobe::SPWD);
+  this->sleeping_ = true;
+  this->rx_state_ = RxLoopState::INIT_RX;
+  return true;
+}
+void CC1101::wake_() {
+  // Pulling CS low starts the crystal; until it runs the chip answers with
+  // CHIP_RDYn set.
+  for (uint32_t waited_us = 0; waited_us < WAKE_TIMEOUT_US; waited_us += STATE_POLL_INTERVAL_US) {
+    if ((this->driver_->send_strobe(CC1101Strobe::SNOP) & CC1101_STATUS_CHIP_RDYN) == 0)
+      break;
+    delayMicroseconds(STATE_POLL_INTERVAL_US);
+  }
+  // SLEEP loses the TEST registers; the shadow was invalidated by SPWD, so
+  // this rewrites the whole configuration.
+  apply_wmbus_rf_settings(*this->driver_);
+  if (this->frequency_mhz_ != 868.95f)
+    set_carrier_frequency(*this->driver_, this->frequency_mhz_);
+  this->sleeping_ = false;
+}
 void CC1101::run_receiver() {
   RxLoopState state_before;
   do {
@@ -237,13 +281,15 @@ void CC1101::run_receiver() {
   if (this->wmbus_mode_ == WMBusMode::MODE_T) {
     auto decoded = decode3of6(frame_data);
     if (!decoded.has_value()) {
+      RadioStats::increment(this->stats_.decode_3of6_failures);
+      trace_event(TraceEvent::DECODED_3OF6, 0, frame_data.size());
       ESP_LOGW(TAG, "3-of-6 decode failed");
       this->rx_state_ = RxLoopState::INIT_RX;
       return;
     }
     frame_data = std::move(decoded.value());
     requires_decode = false;
-    ESP_LOGD(TAG, "3-of-6 decode successful, decoded to %zu bytes", frame_data.size());
+    trace_event(TraceEvent::DECODED_3OF6, 1, frame_data.size());
   }
   packet->set_data(frame_data);
   packet->set_requires_decode(requires_decode && this->wmbus_mode_ == WMBusMode::MODE_T);
@@ -259,13 +305,7 @@ void CC1101::run_receiver() {
     this->rx_state_ = RxLoopState::INIT_RX;
     return;
   }
-  auto packet_ptr = packet.get();
-  if (xQueueSend(this->packet_queue_, &packet_ptr, 0) == pdTRUE) {
-    ESP_LOGV(TAG, "Frame queued successfully");
-    packet.release();
-  } else {
-    ESP_LOGW(TAG, "Queue send failed");
-  }
+  this->queue_packet(packet);
 }
 int8_t CC1101::get_rssi() {
   uint8_t rssi_raw = this->driver_->read_status(CC1101Status::RSSI);
@@ -297,22 +337,28 @@ optional<uint8_t> CC1101::read() {
     if (this->wait_for_sync_()) {
       // If SPI is failing (0xFF reads), GDO may be floating or the radio may be unresponsive.
       // Don't treat this as a real sync edge; restart RX and let the setup/driver warnings guide wiring fixes.
-      const uint8_t marc = this->driver_->read_status(CC1101Status::MARCSTATE);
+      // A single RXBYTES read is enough: read_status() only returns 0xFF when the
+      // status byte of every retry was 0xFF as well.
       const uint8_t rxbytes = this->driver_->read_status(CC1101Status::RXBYTES);
-      if (marc == 0xFF || rxbytes == 0xFF) {
+      if (rxbytes == 0xFF) {
         ESP_LOGW(TAG, "GDO2 indicates sync but SPI reads are 0xFF; ignoring and restarting RX");
         log_cc1101_snapshot_(*this->driver_, this->gdo0_pin_, this->gdo2_pin_, "sync while spi failing");
         this->init_rx_();
         return {};
       }
-      ESP_LOGD(TAG, "Sync detected");
+      trace_event(TraceEvent::SYNC_DETECTED);
       this->rx_state_ = RxLoopState::WAIT_FOR_DATA;
       this->sync_time_ = millis();
+#ifdef WMBUS_LATENCY_PROBES
+      this->sync_time_us_ = micros();
+#endif
       return {};
     }
     {
       uint8_t rxbytes_status = this->driver_->read_status(CC1101Status::RXBYTES);
       if (rxbytes_status & 0x80) {
+        RadioStats::increment(this->stats_.fifo_overflows);
+        trace_event(TraceEvent::FIFO_OVERFLOW, static_cast<uint16_t>(this->rx_state_));
         ESP_LOGW(TAG, "FIFO overflow while waiting for sync, flushing");
         log_cc1101_snapshot_(*this->driver_, this->gdo0_pin_, this->gdo2_pin_, "wait_for_sync overflow");
         this->init_rx_();
@@ -323,7 +369,7 @@ optional<uint8_t> CC1101::read() {
       // the GDO2 wiring/config is wrong. Flush early to avoid overflow and log when it starts happening.
       const uint8_t bytes_in_fifo = rxbytes_status & 0x7F;
       if (bytes_in_fifo >= 24) {
-        ESP_LOGD(TAG, "RX FIFO accumulating without sync (n=%u), flushing", bytes_in_fifo);
+        trace_event(TraceEvent::NOISE_FLUSH, bytes_in_fifo);
         log_cc1101_snapshot_(*this->driver_, this->gdo0_pin_, this->gdo2_pin_, "wait_for_sync fifo accumulating");
         this->init_rx_();
         return {};
@@ -332,12 +378,13 @@ optional<uint8_t> CC1101::read() {
     return {};
   case RxLoopState::WAIT_FOR_DATA:
     if (millis() - this->sync_time_ > this->max_wait_time_) {
+      RadioStats::increment(this->stats_.sync_timeouts);
+      trace_event(TraceEvent::SYNC_TIMEOUT);
       ESP_LOGW(TAG, "Timeout waiting for data after sync! Resetting RX.");
       this->rx_state_ = RxLoopState::INIT_RX;
       return {};
     }
     if (this->wait_for_data_()) {
-      ESP_LOGD(TAG, "Header received, processing frame data");
       this->rx_state_ = RxLoopState::READ_DATA;
     } else {
       return {};
@@ -346,12 +393,15 @@ optional<uint8_t> CC1101::read() {
   case RxLoopState::READ_DATA:
     while (true) {
       size_t bytes_before = this->bytes_received_;
-      if (this->read_data_()) {
-        ESP_LOGI(TAG, "Frame received: %zu bytes, mode: %c, L=0x%02X",
-                 this->rx_buffer_.size(),
-                 static_cast<char>(this->wmbus_mode_),
-                 this->length_field_);
+      bool frame_complete = this->read_data_();
+      if (this->rx_state_ == RxLoopState::READ_DATA && this->reject_foreign_frame_()) {
+        this->rx_state_ = RxLoopState::INIT_RX;
+        return {};
+      }
+      if (frame_complete) {
         this->rx_state_ = RxLoopState::FRAME_READY;
+        this->frame_completed_ = true;
+        LATENCY_RECORD_US(FifoDrain, micros() - this->sync_time_us_);
         this->rx_read_index_ = 0;
         if (!this->rx_buffer_.empty()) {
           return this->rx_buffer_[this->rx_read_index_++];
@@ -371,11 +421,7 @@ optional<uint8_t> CC1101::read() {
   }
 }
 void CC1101::init_rx_() {
-  this->set_idle_();
-  this->driver_->send_strobe(CC1101Strobe::SFTX);
-  this->driver_->send_strobe(CC1101Strobe::SFRX);
-  this->driver_->write_register(CC1101Register::FIFOTHR, 0x0A);
-  this->driver_->write_register(CC1101Register::PKTCTRL0, 0x02);
+  const uint32_t start_us = micros();
   this->rx_buffer_.clear();
   this->rx_read_index_ = 0;
   this->bytes_received_ = 0;
@@ -384,45 +430,82 @@ void CC1101::init_rx_() {
   this->length_mode_ = LengthMode::INFINITE;
   this->wmbus_mode_ = WMBusMode::UNKNOWN;
   this->wmbus_block_ = WMBusBlock::UNKNOWN;
+  this->address_checked_ = false;
+  this->rx_state_ = RxLoopState::WAIT_FOR_SYNC;
 
-  // Enter RX and verify MARCSTATE transitions. If the chip reports SLEEP (0x00) or RX_OVERFLOW (0x11),
-  // attempt a minimal recovery sequence and log a snapshot.
-  this->driver_->send_strobe(CC1101Strobe::SRX);
-  delay(1);
-  uint8_t marc_state = 0xFF;
-  uint8_t first_marc_state = 0xFF;
-  bool rx_entered = false;
-  for (int i = 0; i < 50; i++) {
-    marc_state = this->driver_->read_status(CC1101Status::MARCSTATE);
-    if (i == 0)
-      first_marc_state = marc_state;
-
-    if (marc_state == static_cast<uint8_t>(CC1101State::RX)) {
-      rx_entered = true;
-      break;
+  const bool fast_restart = this->try_fast_restart_();
+  if (fast_restart) {
+    this->fast_restarts_++;
+  } else {
+    this->full_restarts_++;
+    this->set_idle_();
+    // The TX FIFO is never used, so only the RX FIFO needs flushing. Register writes
+    // below go through the driver's shadow copy and cost nothing when unchanged.
+    this->driver_->send_strobe(CC1101Strobe::SFRX);
+    this->driver_->write_register(CC1101Register::FIFOTHR, 0x0A);
+    this->driver_->write_register(CC1101Register::PKTCTRL0, 0x02);
+    if (this->enter_rx_()) {
+      this->last_calibration_ms_ = millis();
+    } else {
+      const uint8_t marc_state = this->driver_->read_status(CC1101Status::MARCSTATE);
+      ESP_LOGW(TAG, "Failed to enter RX mode! MARCSTATE=0x%02X (expected RX=0x0D)", marc_state);
+      log_cc1101_snapshot_(*this->driver_, this->gdo0_pin_, this->gdo2_pin_, "init_rx failed");
+      // The chip may have been reset behind our back; do not trust cached registers.
+      this->driver_->invalidate_shadow();
     }
+  }
 
-    if (marc_state == static_cast<uint8_t>(CC1101State::RX_OVERFLOW)) {
-      ESP_LOGD(TAG, "MARCSTATE indicates RX overflow during RX entry, flushing and retrying");
-      this->driver_->send_strobe(CC1101Strobe::SFRX);
-      delay(1);
-      this->driver_->send_strobe(CC1101Strobe::SRX);
-    } else if (marc_state == static_cast<uint8_t>(CC1101State::SLEEP)) {
-      // If we ever read SLEEP here, it's a strong hint of SPI/chip-select issues or unintended powerdown.
-      // Try to wake to IDLE then re-enter RX.
-      this->driver_->send_strobe(CC1101Strobe::SIDLE);
-      delay(1);
+  const uint32_t latency_us = micros() - start_us;
+  this->stats_.update_rx_restart_latency(latency_us);
+  trace_event(TraceEvent::RX_RESTART, fast_restart, latency_us);
+}
+bool CC1101::try_fast_restart_() {
+  // After a complete fixed-length packet MCSM1.RXOFF_MODE keeps the radio in RX,
+  // already hunting for the next sync word. If nothing is left in the FIFO we only
+  // need to switch back to infinite length mode; no strobes, no calibration.
+  const bool frame_completed = this->frame_completed_;
+  this->frame_completed_ = false;
+  if (!frame_completed || millis() - this->last_calibration_ms_ > RECALIBRATION_INTERVAL_MS)
+    return false;
+  // RXBYTES value gives the FIFO level, the status byte of the same access the state.
+  const uint8_t rxbytes = this->driver_->read_status(CC1101Status::RXBYTES);
+  const uint8_t status = this->driver_->last_status();
+  if (rxbytes != 0 || (status & CC1101_STATUS_CHIP_RDYN) != 0 ||
+      cc1101_chip_state(status) != CC1101ChipState::RX)
+    return false;
+  this->driver_->write_register(CC1101Register::PKTCTRL0, 0x02);
+  return true;
+}
+bool CC1101::enter_rx_() {
+  // Status byte of the SRX strobe itself still reflects the state before it executed,
+  // so follow up with SNOP polls at microsecond granularity instead of delay(1).
+  this->driver_->send_strobe(CC1101Strobe::SRX);
+  bool woken = false;
+  for (uint32_t waited_us = 0; waited_us <= RX_ENTRY_TIMEOUT_US; waited_us += STATE_POLL_INTERVAL_US) {
+    const uint8_t status = this->driver_->send_strobe(CC1101Strobe::SNOP);
+    if ((status & CC1101_STATUS_CHIP_RDYN) != 0 && !woken) {
+      // The crystal is off: the chip is in SLEEP, however it got there. Wake it
+      // and restore the registers SLEEP lost before trying again.
+      woken = true;
+      this->driver_->invalidate_shadow();
+      this->wake_();
+      this->driver_->write_register(CC1101Register::PKTCTRL0, 0x02);
       this->driver_->send_strobe(CC1101Strobe::SRX);
+    } else if ((status & CC1101_STATUS_CHIP_RDYN) == 0) {
+      const CC1101ChipState state = cc1101_chip_state(status);
+      if (state == CC1101ChipState::RX)
+        return true;
+      if (state == CC1101ChipState::RX_FIFO_OVERFLOW) {
+        trace_event(TraceEvent::RX_ENTRY_OVERFLOW);
+        this->driver_->send_strobe(CC1101Strobe::SFRX);
+        this->driver_->send_strobe(CC1101Strobe::SRX);
+      } else if (state == CC1101ChipState::IDLE) {
+        this->driver_->send_strobe(CC1101Strobe::SRX);
+      }
     }
-
-    delay(1);
-  }
-  if (!rx_entered) {
-    ESP_LOGW(TAG, "Failed to enter RX mode! MARCSTATE first=0x%02X last=0x%02X (expected RX=0x0D)", first_marc_state,
-             marc_state);
-    log_cc1101_snapshot_(*this->driver_, this->gdo0_pin_, this->gdo2_pin_, "init_rx failed");
+    delayMicroseconds(STATE_POLL_INTERVAL_US);
   }
-  this->rx_state_ = RxLoopState::WAIT_FOR_SYNC;
+  return false;
 }
 bool CC1101::wait_for_sync_() {
   if (this->gdo2_pin_ != nullptr) {
@@ -446,6 +529,8 @@ bool CC1101::wait_for_data_() {
     return false;
   }
   if (rxbytes_status & 0x80) {
+    RadioStats::increment(this->stats_.fifo_overflows);
+    trace_event(TraceEvent::FIFO_OVERFLOW, static_cast<uint16_t>(this->rx_state_));
     ESP_LOGW(TAG, "RX FIFO overflow while reading header");
     this->rx_state_ = RxLoopState::INIT_RX;
     return false;
@@ -454,10 +539,10 @@ bool CC1101::wait_for_data_() {
   if (bytes_in_fifo < 4) {
     return false;
   }
-  ESP_LOGD(TAG, "FIFO has %d bytes, reading header", bytes_in_fifo);
   uint8_t header[4];
   this->driver_->read_rx_fifo(header, 4);
-  ESP_LOGD(TAG, "Header bytes: %02X %02X %02X %02X", header[0], header[1], header[2], header[3]);
+  trace_event(TraceEvent::HEADER, bytes_in_fifo,
+              encode_uint32(header[0], header[1], header[2], header[3]));
   if (header[0] == WMBUS_MODE_C_PREAMBLE) {
     this->wmbus_mode_ = WMBusMode::MODE_C;
     if (header[1] == WMBUS_BLOCK_A_PREAMBLE) {
@@ -483,8 +568,6 @@ bool CC1101::wait_for_data_() {
         this->length_field_ = decoded_l_field;
         this->expected_length_ = mode_t_packet_size(this->length_field_);
         this->rx_buffer_.insert(this->rx_buffer_.end(), header, header + 4);
-        ESP_LOGD(TAG, "Mode T detected: L=0x%02X (decoded from 3-of-6), expected_length=%zu",
-                 this->length_field_, this->expected_length_);
       } else {
         this->wmbus_mode_ = WMBusMode::MODE_C;
         this->wmbus_block_ = WMBusBlock::BLOCK_A;
@@ -494,8 +577,6 @@ bool CC1101::wait_for_data_() {
         this->rx_buffer_.push_back(WMBUS_MODE_C_PREAMBLE);
         this->rx_buffer_.push_back(WMBUS_BLOCK_A_PREAMBLE);
         this->rx_buffer_.insert(this->rx_buffer_.end(), header, header + 4);
-        ESP_LOGD(TAG, "Mode C (no preamble): L=0x%02X, expected_length=%zu",
-                 this->length_field_, this->expected_length_);
       }
     } else {
       this->wmbus_mode_ = WMBusMode::MODE_C;
@@ -506,8 +587,6 @@ bool CC1101::wait_for_data_() {
       this->rx_buffer_.push_back(WMBUS_MODE_C_PREAMBLE);
       this->rx_buffer_.push_back(WMBUS_BLOCK_A_PREAMBLE);
       this->rx_buffer_.insert(this->rx_buffer_.end(), header, header + 4);
-      ESP_LOGD(TAG, "Mode C (fallback): L=0x%02X, expected_length=%zu",
-               this->length_field_, this->expected_length_);
     }
   }
   if (this->expected_length_ == 0) {
@@ -521,10 +600,10 @@ bool CC1101::wait_for_data_() {
              this->expected_length_, this->bytes_received_);
     this->expected_length_ = this->bytes_received_;
   }
-  ESP_LOGD(TAG, "Frame detected: mode=%c, block=%c, L=0x%02X, expected=%zu",
-           static_cast<char>(this->wmbus_mode_),
-           static_cast<char>(this->wmbus_block_), this->length_field_,
-           this->expected_length_);
+  trace_event(TraceEvent::FRAME_DETECTED,
+              static_cast<uint8_t>(this->wmbus_mode_) << 8 |
+                  static_cast<uint8_t>(this->wmbus_block_),
+              this->length_field_, this->expected_length_);
   if (this->expected_length_ < MAX_FIXED_LENGTH) {
     this->driver_->write_register(CC1101Register::PKTLEN,
                                    static_cast<uint8_t>(this->expected_length_));
@@ -555,35 +634,56 @@ bool CC1101::read_data_() {
       size_t bytes_remaining = this->expected_length_ - this->bytes_received_;
       size_t bytes_to_read = std::min(static_cast<size_t>(bytes_in_fifo), bytes_remaining);
       if (bytes_to_read > 0) {
-        ESP_LOGD(TAG, "GDO2 LOW detected, reading final %zu bytes", bytes_to_read);
         size_t old_size = this->rx_buffer_.size();
         this->rx_buffer_.resize(old_size + bytes_to_read);
         this->driver_->read_rx_fifo(this->rx_buffer_.data() + old_size, bytes_to_read);
         this->bytes_received_ += bytes_to_read;
       }
     }
-    ESP_LOGD(TAG, "Frame complete via GDO2: %zu bytes", this->bytes_received_);
+    trace_event(TraceEvent::FRAME_COMPLETE,
+                static_cast<uint16_t>(TraceFrameEnd::GDO2), this->bytes_received_);
     return true;
   }
-  if (this->check_rx_overflow_()) {
+  // One RXBYTES read per pass: the value carries the FIFO fill level and the overflow
+  // flag, the status byte of the same transfer carries the chip state. MARCSTATE and
+  // PKTSTATUS are only read when one of those says the packet may have ended.
+  const uint8_t rxbytes_status = this->driver_->read_status(CC1101Status::RXBYTES);
+  if (this->check_rx_overflow_(rxbytes_status)) {
+    RadioStats::increment(this->stats_.fifo_overflows);
+    trace_event(TraceEvent::FIFO_OVERFLOW, static_cast<uint16_t>(this->rx_state_),
+                this->bytes_received_);
     ESP_LOGW(TAG, "RX FIFO overflow during read, aborting frame");
     this->rx_state_ = RxLoopState::INIT_RX;
     return false;
   }
-  // MARCSTATE fallback: if the chip has already returned to IDLE or RX_END the packet
-  // is complete. Drain whatever is left in the FIFO and treat it as frame end.
+  uint8_t bytes_in_fifo = rxbytes_status & 0x7F;
+  // End of packet fallback: if the chip has finished the packet, drain whatever
+  // is left in the FIFO and treat it as frame end. The 3-bit state of the status
+  // byte cannot tell RX_END from RX, so MARCSTATE is read once the chip has left
+  // RX and must show IDLE or RX_END. MCSM1.RXOFF_MODE returns the chip to RX right
+  // after a fixed length packet, so in FIXED mode SFD in PKTSTATUS, which drops at
+  // the end of the packet, is checked once the FIFO holds the rest of the frame.
   // This mirrors the errata workaround used in SzczepanLeon's implementation and
   // makes reception robust even when GDO2 timing is imperfect.
   if (this->bytes_received_ > 0) {
-    uint8_t marc = this->driver_->read_status(CC1101Status::MARCSTATE) & 0x1F;
-    constexpr uint8_t MARC_IDLE = static_cast<uint8_t>(CC1101State::IDLE);
-    constexpr uint8_t MARC_RX_END = 0x0E;
-    if (marc == MARC_IDLE || marc == MARC_RX_END) {
+    uint8_t marc = static_cast<uint8_t>(CC1101State::RX);
+    bool packet_end = false;
+    if (this->driver_->last_chip_state() != CC1101ChipState::RX) {
+      marc = this->driver_->read_status(CC1101Status::MARCSTATE) & 0x1F;
+      packet_end = marc == static_cast<uint8_t>(CC1101State::IDLE) ||
+                   marc == static_cast<uint8_t>(CC1101State::RX_END);
+    } else if (this->length_mode_ == LengthMode::FIXED &&
+               this->bytes_received_ + bytes_in_fifo >= this->expected_length_) {
+      packet_end = (this->driver_->read_status(CC1101Status::PKTSTATUS) & CC1101_PKTSTATUS_SFD) == 0;
+    }
+    if (packet_end) {
       // CC1101 errata: the state machine can advance to IDLE while the last few bytes
       // are still being written to the FIFO.  Retry reading RXBYTES a few times before
       // declaring the frame incomplete.
+      uint8_t remaining = bytes_in_fifo;
       for (int retry = 0; retry < MARCSTATE_RETRY_COUNT && this->bytes_received_ < this->expected_length_; retry++) {
-        uint8_t remaining = this->driver_->read_status(CC1101Status::RXBYTES) & 0x7F;
+        if (retry > 0)
+          remaining = this->driver_->read_status(CC1101Status::RXBYTES) & 0x7F;
         if (remaining > 0) {
           size_t to_drain = std::min(static_cast<size_t>(remaining),
                                      this->expected_length_ - this->bytes_received_);
@@ -598,16 +698,17 @@ bool CC1101::read_data_() {
         }
       }
       if (this->bytes_received_ >= this->expected_length_) {
-        ESP_LOGD(TAG, "Frame complete via MARCSTATE (0x%02X): %zu bytes", marc, this->bytes_received_);
+        trace_event(TraceEvent::FRAME_COMPLETE,
+                    static_cast<uint16_t>(TraceFrameEnd::CHIP_STATE),
+                    this->bytes_received_);
         return true;
       }
-      ESP_LOGW(TAG, "MARCSTATE end (0x%02X) but only %zu/%zu bytes received, discarding",
+      ESP_LOGW(TAG, "Packet end (MARCSTATE=0x%02X) but only %zu/%zu bytes received, discarding",
                marc, this->bytes_received_, this->expected_length_);
       this->rx_state_ = RxLoopState::INIT_RX;
       return false;
     }
   }
-  uint8_t bytes_in_fifo = this->driver_->read_status(CC1101Status::RXBYTES) & 0x7F;
   if (bytes_in_fifo > 0) {
     size_t bytes_remaining = this->expected_length_ - this->bytes_received_;
     size_t bytes_to_read;
@@ -632,23 +733,53 @@ bool CC1101::read_data_() {
   if (this->bytes_received_ >= this->expected_length_) {
     // Do NOT drain the FIFO further: any remaining bytes belong to the next frame.
     // The FIFO will be flushed by init_rx_() before the next reception cycle.
+    trace_event(TraceEvent::FRAME_COMPLETE,
+                static_cast<uint16_t>(TraceFrameEnd::LENGTH), this->bytes_received_);
     return true;
   }
   return false;
 }
 void CC1101::set_idle_() {
   this->driver_->send_strobe(CC1101Strobe::SIDLE);
-  uint8_t marc_state;
-  for (int i = 0; i < 10; i++) {
-    marc_state = this->driver_->read_status(CC1101Status::MARCSTATE);
-    if (marc_state == static_cast<uint8_t>(CC1101State::IDLE))
-      break;
-    delay(1);
+  for (uint32_t waited_us = 0; waited_us < IDLE_TIMEOUT_US; waited_us += STATE_POLL_INTERVAL_US) {
+    const uint8_t status = this->driver_->send_strobe(CC1101Strobe::SNOP);
+    if ((status & CC1101_STATUS_CHIP_RDYN) == 0 && cc1101_chip_state(status) == CC1101ChipState::IDLE)
+      return;
+    delayMicroseconds(STATE_POLL_INTERVAL_US);
   }
 }
-bool CC1101::check_rx_overflow_() {
-  uint8_t rxbytes = this->driver_->read_status(CC1101Status::RXBYTES);
-  return (rxbytes & 0x80) != 0;
+bool CC1101::check_rx_overflow_(uint8_t rxbytes_status) {
+  return (rxbytes_status & 0x80) != 0 ||
+         this->driver_->last_chip_state() == CC1101ChipState::RX_FIFO_OVERFLOW;
+}
+bool CC1101::reject_foreign_frame_() {
+  if (this->address_checked_ || !this->address_filter_active())
+    return false;
+  // Wait until the DLL address is buffered. Mode C frames carry a 2 byte
+  // preamble in front of the L-field, Mode T frames are still 3-of-6 encoded.
+  uint8_t dll[DLL_ADDRESS_END];
+  if (this->wmbus_mode_ == WMBusMode::MODE_T) {
+    const size_t encoded_len = encoded_size(DLL_ADDRESS_END);
+    if (this->rx_buffer_.size() < encoded_len)
+      return false;
+    this->address_checked_ = true;
+    std::vector<uint8_t> encoded(this->rx_buffer_.begin(), this->rx_buffer_.begin() + encoded_len);
+    auto decoded = decode3of6(encoded);
+    if (!decoded.has_value() || decoded->size() < DLL_ADDRESS_END)
+      return false;
+    std::copy_n(decoded->begin(), DLL_ADDRESS_END, dll);
+  } else {
+    if (this->rx_buffer_.size() < MODE_C_PREFIX_SIZE + DLL_ADDRESS_END)
+      return false;
+    this->address_checked_ = true;
+    std::copy_n(this->rx_buffer_.begin() + MODE_C_PREFIX_SIZE, DLL_ADDRESS_END, dll);
+  }
+  const uint32_t id = encode_uint32(dll[7], dll[6], dll[5], dll[4]);
+  if (this->address_filter_accepts(id))
+    return false;
+  RadioStats::increment(this->stats_.address_filter_rejected);
+  trace_event(TraceEvent::FOREIGN_FRAME, this->rx_buffer_.size(), id);
+  return true;
 }
 }
 }
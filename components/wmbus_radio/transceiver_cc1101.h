@@ -12,6 +12,7 @@ enum class CC1101State : uint8_t {
   SLEEP = 0x00,
   IDLE = 0x01,
   RX = 0x0D,
+  RX_END = 0x0E,
   RX_OVERFLOW = 0x11,
   TX = 0x13,
   TX_UNDERFLOW = 0x16,
@@ -47,6 +48,7 @@ public:
   CC1101();
   void setup() override;
   void restart_rx() override;
+  bool sleep() override;
   void run_receiver() override;
   int8_t get_rssi() override;
   const char *get_name() override;
@@ -55,17 +57,22 @@ public:
   void set_gdo0_pin(InternalGPIOPin *pin);
   void set_gdo2_pin(InternalGPIOPin *pin);
   void set_frequency(float freq_mhz);
+  void dump_config() override;
 
 protected:
   optional<uint8_t> read() override;
 
 private:
   void init_rx_();
+  bool try_fast_restart_();
+  bool enter_rx_();
   bool wait_for_sync_();
   bool wait_for_data_();
   bool read_data_();
   void set_idle_();
-  bool check_rx_overflow_();
+  void wake_();
+  bool check_rx_overflow_(uint8_t rxbytes_status);
+  bool reject_foreign_frame_();
 
   std::unique_ptr<CC1101Driver> driver_;
   InternalGPIOPin *gdo0_pin_;
@@ -81,17 +88,39 @@ private:
   WMBusMode wmbus_mode_;
   WMBusBlock wmbus_block_;
   uint32_t sync_time_;
+#ifdef WMBUS_LATENCY_PROBES
+  uint32_t sync_time_us_{0};
+#endif
   uint32_t max_wait_time_;
+  bool address_checked_;
+  bool frame_completed_;
+  uint32_t last_calibration_ms_;
+  uint32_t fast_restarts_;
+  uint32_t full_restarts_;
+  bool sleeping_{false};
   static constexpr uint8_t WMBUS_MODE_C_PREAMBLE = 0x54;
   static constexpr uint8_t WMBUS_BLOCK_A_PREAMBLE = 0xCD;
   static constexpr uint8_t WMBUS_BLOCK_B_PREAMBLE = 0x3D;
   static constexpr uint8_t RX_FIFO_THRESHOLD = 10;
   static constexpr size_t MAX_FIXED_LENGTH = 256;
   static constexpr size_t MAX_FRAME_SIZE = 512;
+  // DLL header up to and including the A-field ID: L, C, M(2), ID(4).
+  static constexpr size_t DLL_ADDRESS_END = 8;
+  static constexpr size_t MODE_C_PREFIX_SIZE = 2;
   // MARCSTATE errata: retry up to 5 times with 100 µs gap (500 µs total) waiting
   // for the CC1101 FIFO to settle after the state machine has gone IDLE.
   static constexpr int MARCSTATE_RETRY_COUNT = 5;
   static constexpr uint32_t MARCSTATE_RETRY_DELAY_US = 100;
+  // State transitions are verified through the SPI status byte. Entering RX from
+  // IDLE includes the automatic synthesizer calibration (~810 µs).
+  static constexpr uint32_t STATE_POLL_INTERVAL_US = 20;
+  static constexpr uint32_t IDLE_TIMEOUT_US = 500;
+  static constexpr uint32_t RX_ENTRY_TIMEOUT_US = 2000;
+  // Crystal start-up after SLEEP, typically 150 µs.
+  static constexpr uint32_t WAKE_TIMEOUT_US = 1000;
+  // Staying in RX skips the calibration done on IDLE->RX, so force a full
+  // restart at least this often.
+  static constexpr uint32_t RECALIBRATION_INTERVAL_MS = 60000;
 };
 
 }
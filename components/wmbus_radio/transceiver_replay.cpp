@@ -0,0 +1,73 @@
+#include "transceiver_replay.h"
+#include "packet.h"
+
+#include "esphome/core/hal.h"
+#include "esphome/core/log.h"
+
+namespace esphome {
+namespace wmbus_radio {
+static const char *TAG = "REPLAY";
+
+void REPLAY::setup() {
+  size_t failed = parseReplayCapture(this->capture_, this->default_link_mode_,
+                                     &this->frames_);
+  if (failed)
+    ESP_LOGW(TAG, "Skipped %zu capture lines that are no wM-Bus frame", failed);
+  if (this->frames_.empty()) {
+    ESP_LOGE(TAG, "Capture holds no frames");
+    this->mark_failed();
+    return;
+  }
+  this->schedule_ =
+      ReplaySchedule(this->rate_, this->burst_size_, this->burst_interval_ms_);
+}
+
+void REPLAY::dump_config() {
+  RadioTransceiver::dump_config();
+  ESP_LOGCONFIG(TAG, "  Capture: %zu frames, %s", this->frames_.size(),
+                this->repeat_ ? "repeated" : "once");
+  ESP_LOGCONFIG(TAG, "  Rate: %.1f frames/s", this->rate_);
+  if (this->burst_size_)
+    ESP_LOGCONFIG(TAG, "  Bursts: %u frames every %u ms", this->burst_size_,
+                  this->burst_interval_ms_);
+  if (this->meter_count_ > 1)
+    ESP_LOGCONFIG(TAG, "  Meters: %u", this->meter_count_);
+}
+
+void REPLAY::run_receiver() {
+  if (!this->repeat_ && this->replayed_ >= this->frames_.size())
+    return;
+
+  this->pending_ += this->schedule_.due(millis());
+  while (this->pending_ > 0) {
+    const uint32_t now = micros();
+    if (int32_t(now - this->channel_free_us_) < 0)
+      return;
+
+    ReplayFrame frame = this->frames_[this->replayed_ % this->frames_.size()];
+    if (this->meter_count_ > 1)
+      offsetReplayFrameId(&frame, this->replayed_ % this->meter_count_);
+    this->pending_--;
+    this->replayed_++;
+    this->channel_free_us_ = now + replayAirtimeUs(frame);
+
+    auto packet = std::make_unique<Packet>();
+    packet->set_data(frame.packet);
+    packet->set_requires_decode(false);
+    packet->set_link_mode_hint(frame.link_mode);
+    this->rssi_ = frame.rssi;
+    packet->set_rssi(this->rssi_);
+    if (!packet->calculate_payload_size())
+      continue;
+    this->queue_packet(packet);
+
+    if (!this->repeat_ && this->replayed_ >= this->frames_.size())
+      return;
+  }
+}
+
+int8_t REPLAY::get_rssi() { return this->rssi_; }
+
+const char *REPLAY::get_name() { return TAG; }
+} // namespace wmbus_radio
+} // namespace esphome
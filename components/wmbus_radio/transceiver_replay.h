@@ -0,0 +1,55 @@
+#pragma once
+#include "transceiver.h"
+
+#include "esphome/components/wmbus_common/replay.h"
+
+namespace esphome {
+namespace wmbus_radio {
+// Feeds frames from a capture compiled into the firmware into the packet
+// queue, paced like a real channel, for load tests without RF hardware.
+class REPLAY : public RadioTransceiver {
+public:
+  void setup() override;
+  void dump_config() override;
+  void restart_rx() override {}
+  void run_receiver() override;
+  int8_t get_rssi() override;
+  const char *get_name() override;
+  bool is_frame_oriented() const override { return true; }
+
+  void set_capture(const char *capture) { this->capture_ = capture; };
+  void set_default_link_mode(LinkMode mode) {
+    this->default_link_mode_ = mode;
+  };
+  void set_rate(float frames_per_s) { this->rate_ = frames_per_s; };
+  void set_burst(uint32_t size, uint32_t interval_ms) {
+    this->burst_size_ = size;
+    this->burst_interval_ms_ = interval_ms;
+  };
+  void set_meter_count(uint32_t count) { this->meter_count_ = count; };
+  void set_repeat(bool repeat) { this->repeat_ = repeat; };
+
+  uint32_t get_replayed() const { return this->replayed_; }
+
+protected:
+  optional<uint8_t> read() override { return {}; }
+
+  const char *capture_{""};
+  LinkMode default_link_mode_{LinkMode::T1};
+  float rate_{1};
+  uint32_t burst_size_{0};
+  uint32_t burst_interval_ms_{0};
+  // Each replayed frame gets a DLL id offset in [0, meter_count_).
+  uint32_t meter_count_{1};
+  bool repeat_{true};
+
+  std::vector<ReplayFrame> frames_;
+  ReplaySchedule schedule_{0, 0, 0};
+  // Frames due but not on air yet: the channel carries one at a time.
+  uint32_t pending_{0};
+  uint32_t channel_free_us_{0};
+  uint32_t replayed_{0};
+  int8_t rssi_{0};
+};
+} // namespace wmbus_radio
+} // namespace esphome
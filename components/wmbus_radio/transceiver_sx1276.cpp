@@ -2,8 +2,24 @@
 
 #include "esphome/core/log.h"
 
+#include <algorithm>
+
 #define F_OSC (32000000)
 
+#define REG_FIFO (0x00)
+#define REG_PACKET_CONFIG_2 (0x31)
+#define REG_PAYLOAD_LENGTH (0x32)
+#define REG_FIFO_THRESH (0x35)
+#define REG_IRQ_FLAGS_2 (0x3F)
+
+#define IRQ_FLAGS_2_FIFO_EMPTY (1 << 6)
+#define IRQ_FLAGS_2_FIFO_LEVEL (1 << 5)
+#define IRQ_FLAGS_2_PAYLOAD_READY (1 << 2)
+
+// Packet mode, upper bits of the payload length in [2:0]
+#define PACKET_CONFIG_2_DATA_MODE_PACKET (1 << 6)
+#define MAX_PAYLOAD_LENGTH (2047)
+
 namespace esphome {
 namespace wmbus_radio {
 static const char *TAG = "SX1276";
@@ -73,11 +89,18 @@ void SX1276::setup() {
 
   ESP_LOGVV(TAG, "set unlimited packet mode/zero length");
   uint8_t packet_mode = 0;
-  this->spi_write(0x32, packet_mode);
-
-  ESP_LOGVV(TAG, "set fifo empty flag on DIO1");
-  uint8_t fifo_empty_flag = 0b01 << 4;
-  this->spi_write(0x40, fifo_empty_flag);
+  this->spi_write(REG_PAYLOAD_LENGTH, packet_mode);
+
+  ESP_LOGVV(TAG, "set fifo level flag on DIO1");
+  // The threshold starts at the frame header, so DIO1 also marks the start of
+  // every frame, and is raised once the frame length is known.
+  this->spi_write(REG_FIFO_THRESH, (uint8_t)(HEADER_SIZE - 1));
+  this->fifo_threshold_ = HEADER_SIZE - 1;
+  uint8_t fifo_level_flag = 0b00 << 4;
+  this->spi_write(0x40, fifo_level_flag);
+  // Between two FifoLevel interrupts (FIFO_THRESHOLD + 1) bytes arrive, ~2.6 ms
+  // at 100 kbps. Wait a bit longer before polling for the tail of a frame.
+  this->read_timeout_ms_ = 4;
 
   ESP_LOGVV(TAG, "set RRSI smoothing");
   uint8_t rssi_smoothing = 0b111;
@@ -87,25 +110,84 @@ void SX1276::setup() {
 }
 
 optional<uint8_t> SX1276::read() {
-  if (this->irq_pin_->digital_read() == false)
-    return this->spi_read(0x00);
+  if ((this->spi_read(REG_IRQ_FLAGS_2) & IRQ_FLAGS_2_FIFO_EMPTY) == 0)
+    return this->spi_read(REG_FIFO);
 
   return {};
 }
 
+size_t SX1276::read_chunk(uint8_t *buffer, size_t length) {
+  // The FIFO fill level is not readable, but the flags bound it from below:
+  // FifoLevel guarantees more than the threshold, PayloadReady (fixed length
+  // mode) guarantees the whole remaining frame. Below that, wait for the next
+  // interrupt instead of reading single bytes.
+  uint8_t flags = this->spi_read(REG_IRQ_FLAGS_2);
+  size_t available;
+  if (flags & IRQ_FLAGS_2_PAYLOAD_READY)
+    available = length;
+  else if (flags & IRQ_FLAGS_2_FIFO_LEVEL)
+    available = this->fifo_threshold_ + 1;
+  else
+    return 0;
+
+  available = std::min(available, length);
+  this->spi_read_burst(REG_FIFO, buffer, available);
+  this->bytes_read_ += available;
+  // The tail of the read is shorter than a full chunk, lower the threshold so
+  // it still raises an interrupt.
+  if (available < length)
+    this->set_fifo_threshold_(length - available);
+  return available;
+}
+
+void SX1276::set_expected_frame_length(size_t length) {
+  if (length == 0 || length > MAX_PAYLOAD_LENGTH)
+    return;
+  // Switch from unlimited to fixed length so PayloadReady marks the frame end.
+  this->spi_write(REG_PACKET_CONFIG_2,
+                  (uint8_t)(PACKET_CONFIG_2_DATA_MODE_PACKET | BYTE(length, 1)));
+  this->spi_write(REG_PAYLOAD_LENGTH, BYTE(length, 0));
+  if (length > this->bytes_read_)
+    this->set_fifo_threshold_(length - this->bytes_read_);
+}
+
+void SX1276::set_fifo_threshold_(size_t remaining) {
+  // FifoLevel is set once the FIFO holds more than the threshold.
+  uint8_t threshold = std::min<size_t>(remaining, FIFO_THRESHOLD + 1) - 1;
+  if (threshold == this->fifo_threshold_)
+    return;
+  this->spi_write(REG_FIFO_THRESH, threshold);
+  this->fifo_threshold_ = threshold;
+}
+
+gpio::InterruptType SX1276::irq_interrupt_type() const {
+  return gpio::INTERRUPT_RISING_EDGE;
+}
+
 void SX1276::restart_rx() {
   // Standby mode
   this->spi_write(0x01, (uint8_t)0b001);
   delay(5);
 
+  // Back to unlimited length mode for the next frame, interrupt on its header
+  this->spi_write(REG_PACKET_CONFIG_2, {PACKET_CONFIG_2_DATA_MODE_PACKET, 0});
+  this->set_fifo_threshold_(HEADER_SIZE);
+  this->bytes_read_ = 0;
+
   // Clear FIFO
-  this->spi_write(0x3F, (uint8_t)(1 << 4));
+  this->spi_write(REG_IRQ_FLAGS_2, (uint8_t)(1 << 4));
 
   // Enable RX
   this->spi_write(0x01, (uint8_t)0b101);
   delay(5);
 }
 
+bool SX1276::sleep() {
+  // Registers are kept in sleep mode, restart_rx() passes through standby.
+  this->spi_write(0x01, (uint8_t)0b000);
+  return true;
+}
+
 int8_t SX1276::get_rssi() {
   uint8_t rssi = this->spi_read(0x11);
   return (int8_t)(-rssi / 2);
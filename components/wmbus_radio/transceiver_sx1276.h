@@ -8,8 +8,27 @@ public:
   void setup() override;
   optional<uint8_t> read() override;
   void restart_rx() override;
+  bool sleep() override;
   int8_t get_rssi() override;
   const char *get_name() override;
+  gpio::InterruptType irq_interrupt_type() const override;
+  void set_expected_frame_length(size_t length) override;
+
+protected:
+  size_t read_chunk(uint8_t *buffer, size_t length) override;
+
+  // Sets the FifoLevel threshold so DIO1 rises once `remaining` more bytes,
+  // up to a full chunk, are in the FIFO.
+  void set_fifo_threshold_(size_t remaining);
+
+  uint8_t fifo_threshold_{0};
+  // Bytes of the current frame read from the FIFO so far.
+  size_t bytes_read_{0};
+
+  // DIO1 raises FifoLevel once the FIFO holds more than this many bytes.
+  static constexpr uint8_t FIFO_THRESHOLD = 31;
+  // Bytes read before the frame length is known, see Packet.
+  static constexpr uint8_t HEADER_SIZE = 3;
 };
 } // namespace wmbus_radio
 } // namespace esphome
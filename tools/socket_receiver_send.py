@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Send captured frames to a socket_receiver.
+
+Stands in for a remote gateway or an rtl_wmbus host: reads a capture (one
+frame per line, rtlwmbus or plain hex, the format of wmbus_radio's REPLAY
+radio_type) and sends the frames at a fixed rate to a node running
+socket_receiver, in its ``lines`` or ``binary`` format.
+
+    tools/socket_receiver_send.py capture.txt 192.168.1.50 3334 --rate 50
+    tools/socket_receiver_send.py capture.txt 192.168.1.50 3334 --udp --format binary \\
+        --meters 500 --count 10000
+"""
+
+import argparse
+import itertools
+import socket
+import struct
+import sys
+import time
+
+RECORD_HEADER = struct.Struct(">H")
+
+
+def crc16_en13757(data: bytes) -> int:
+    crc = 0
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x3D65) if crc & 0x8000 else crc << 1
+            crc &= 0xFFFF
+    return crc ^ 0xFFFF
+
+
+def parse_line(line: str, default_link_mode: str):
+    """Return (link_mode, rssi, frame bytes) or None for comments."""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    link_mode, rssi, hex_ = default_link_mode, 0, line
+    if ";" in line:
+        # rtlwmbus: mode;crc ok;3of6 ok;time;rssi;;;0xhex
+        columns = line.split(";")
+        link_mode = columns[0].upper()
+        if len(columns) > 4 and columns[4]:
+            rssi = int(columns[4])
+        hex_ = columns[-1]
+    if hex_.lower().startswith("0x"):
+        hex_ = hex_[2:]
+    return link_mode, rssi, bytes.fromhex(hex_)
+
+
+def offset_id(frame: bytes, offset: int) -> bytes:
+    """Add offset to the DLL id, fixing the first block CRC if present."""
+    if offset == 0 or len(frame) < 12:
+        return frame
+    frame = bytearray(frame)
+    meter_id = int.from_bytes(frame[4:8], "little")
+    frame[4:8] = ((meter_id + offset) & 0xFFFFFFFF).to_bytes(4, "little")
+    if len(frame) != frame[0] + 1:
+        frame[10:12] = crc16_en13757(frame[:10]).to_bytes(2, "big")
+    return bytes(frame)
+
+
+def encode(link_mode: str, rssi: int, frame: bytes, binary: bool) -> bytes:
+    if binary:
+        body = link_mode[0].encode() + struct.pack("b", rssi) + frame
+        return RECORD_HEADER.pack(len(body)) + body
+    return f"{link_mode};1;1;{time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())}.00Z;{rssi};;;0x{frame.hex()}\n".encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", help="capture file, rtlwmbus or hex lines")
+    parser.add_argument("host")
+    parser.add_argument("port", type=int)
+    parser.add_argument("--udp", action="store_true", help="one record per datagram, default TCP")
+    parser.add_argument("--format", choices=("lines", "binary"), default="lines")
+    parser.add_argument("--link-mode", choices=("T1", "C1"), default="T1", help="of plain hex lines")
+    parser.add_argument("--rate", type=float, default=1.0, help="frames per second, 0 for as fast as possible")
+    parser.add_argument("--count", type=int, default=0, help="frames to send, default the capture once")
+    parser.add_argument("--meters", type=int, default=1, help="spread frames over this many DLL ids")
+    args = parser.parse_args()
+
+    with open(args.capture) as f:
+        frames = [parsed for line in f if (parsed := parse_line(line, args.link_mode))]
+    if not frames:
+        parser.exit(1, "capture holds no frames\n")
+    count = args.count or len(frames)
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM if args.udp else socket.SOCK_STREAM)
+    sock.connect((args.host, args.port))
+
+    start = time.monotonic()
+    binary = args.format == "binary"
+    sent = 0
+    try:
+        for n, (link_mode, rssi, frame) in zip(range(count), itertools.cycle(frames)):
+            if args.rate > 0:
+                delay = start + n / args.rate - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            frame = offset_id(frame, n % args.meters)
+            sock.sendall(encode(link_mode, rssi, frame, binary))
+            sent += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
+    elapsed = time.monotonic() - start
+    print(f"sent {sent} frames in {elapsed:.1f}s, {sent / elapsed if elapsed else 0:.1f}/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
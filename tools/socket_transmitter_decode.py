@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Decode compressed socket_transmitter batches.
+
+socket_transmitter with ``batch: compression: lzss`` sends every batch as an
+envelope (see components/socket_transmitter/lzss.h). This script unpacks such
+envelopes from a capture file or straight from a TCP/UDP listener and prints
+the contained records.
+
+    tools/socket_transmitter_decode.py --listen-tcp 3333
+    tools/socket_transmitter_decode.py capture.bin
+"""
+
+import argparse
+import socket
+import sys
+
+ENVELOPE_HEADER_SIZE = 4
+MIN_MATCH = 3
+
+
+def lzss_decompress(payload: bytes, original_length: int) -> bytes:
+    try:
+        return _lzss_decompress(payload, original_length)
+    except IndexError:
+        raise ValueError("payload ends before the original length") from None
+
+
+def _lzss_decompress(payload: bytes, original_length: int) -> bytes:
+    out = bytearray()
+    pos = 0
+    while len(out) < original_length:
+        flags = payload[pos]
+        pos += 1
+        for bit in range(8):
+            if len(out) >= original_length:
+                break
+            if flags & (1 << bit):
+                out.append(payload[pos])
+                pos += 1
+            else:
+                token = (payload[pos] << 8) | payload[pos + 1]
+                pos += 2
+                offset = (token >> 4) + 1
+                length = (token & 0x0F) + MIN_MATCH
+                if offset > len(out):
+                    raise ValueError(f"back reference {offset} beyond output {len(out)}")
+                for _ in range(length):
+                    out.append(out[-offset])
+    if pos != len(payload):
+        raise ValueError(f"{len(payload) - pos} trailing bytes in payload")
+    return bytes(out)
+
+
+def decode_envelope(data: bytes, start: int = 0):
+    """Return (batch, next_offset) or None if the envelope is incomplete."""
+    if len(data) - start < ENVELOPE_HEADER_SIZE:
+        return None
+    payload_length = int.from_bytes(data[start : start + 2], "big")
+    original_length = int.from_bytes(data[start + 2 : start + 4], "big")
+    end = start + ENVELOPE_HEADER_SIZE + payload_length
+    if len(data) < end:
+        return None
+    payload = data[start + ENVELOPE_HEADER_SIZE : end]
+    if payload_length == original_length:
+        return payload, end
+    return lzss_decompress(payload, original_length), end
+
+
+def decode_stream(chunks):
+    """Yield batches from an iterable of byte chunks (TCP or file contents)."""
+    buffer = b""
+    for chunk in chunks:
+        buffer += chunk
+        offset = 0
+        while (result := decode_envelope(buffer, offset)) is not None:
+            batch, offset = result
+            yield batch
+        buffer = buffer[offset:]
+    if buffer:
+        raise ValueError(f"{len(buffer)} bytes of incomplete envelope at end of stream")
+
+
+def emit(batch: bytes, out):
+    out.write(batch.decode(errors="replace"))
+    out.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("capture", nargs="?", help="file with concatenated envelopes")
+    source.add_argument("--listen-tcp", type=int, metavar="PORT")
+    source.add_argument("--listen-udp", type=int, metavar="PORT")
+    args = parser.parse_args()
+
+    if args.capture:
+        with open(args.capture, "rb") as f:
+            for batch in decode_stream([f.read()]):
+                emit(batch, sys.stdout)
+        return
+
+    if args.listen_udp:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("", args.listen_udp))
+        while True:
+            datagram, peer = sock.recvfrom(65535)
+            # A truncated or garbled datagram costs that datagram only.
+            try:
+                for batch in decode_stream([datagram]):
+                    emit(batch, sys.stdout)
+            except ValueError as e:
+                print(f"# {peer[0]}:{peer[1]}: {e}", file=sys.stderr)
+
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(("", args.listen_tcp))
+    server.listen(1)
+    while True:
+        conn, peer = server.accept()
+        print(f"# connection from {peer[0]}:{peer[1]}", file=sys.stderr)
+        with conn:
+            try:
+                for batch in decode_stream(iter(lambda: conn.recv(4096), b"")):
+                    emit(batch, sys.stdout)
+            except ValueError as e:
+                print(f"# {e}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
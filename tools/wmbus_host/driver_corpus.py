@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""Driver test corpus: extract the `// Test:` blocks and run them on the host.
+
+Every driver_*.cc in wmbus_common ends with test blocks from wmbusmeters:
+
+    // Test: MyTapWater multical21 76348799 NOKEY
+    // telegram=|2A442D2C998734761B168D2091D37CAC21576C78_02FF2071...|
+    // {"_":"telegram","media":"cold water",...}
+    // |MyTapWater;76348799;6.408;6.408;null;127;19;DRY;1111-11-11 11:11.11
+
+`extract` collects them into corpus.json (commit it together with re-pulled
+drivers). `run` feeds every telegram through the host build, checks the json
+and field output and measures decode time and allocations per driver, then
+compares with corpus_baseline.json: new failures, drivers that got slower or
+allocate more than the thresholds allow make the exit code non-zero.
+
+Allocation counts are deterministic. Decode times are compared relative to a
+calibration driver timed in the same rounds, so the baseline carries over to
+other machines and load bursts hit both sides alike; a driver over the
+threshold is timed again before it counts as a regression. The absolute
+times in the baseline are for reference only.
+
+    tools/wmbus_host/driver_corpus.py extract
+    tools/wmbus_host/driver_corpus.py run
+    tools/wmbus_host/driver_corpus.py run --update-baseline
+"""
+
+import argparse
+import json
+import pathlib
+import re
+import sys
+import time
+
+import wmbus_host
+
+HERE = pathlib.Path(__file__).resolve().parent
+WMBUS_COMMON = HERE.parent.parent / "components" / "wmbus_common"
+CORPUS = HERE / "corpus.json"
+BASELINE = HERE / "corpus_baseline.json"
+CORPUS_VERSION = 1
+TIMING_ROUNDS = 5
+# Extra timings of a driver over the threshold, the best one counts.
+TIMING_RETRIES = 2
+# Decode times are measured relative to this test, a plain unencrypted
+# driver that rarely changes.
+CALIBRATION_TEST = ("driver_multical21.cc", "MyTapWater")
+
+# The tests run with a fixed clock; our timestamps are real.
+TEST_TIMESTAMPS = {"1111-11-11T11:11:11Z", "1111-11-11 11:11.11"}
+# Older tests were written before the "_" member existed.
+IGNORED_KEYS = {"timestamp", "_"}
+
+TEST_RE = re.compile(r"^// Test:\s+(\S+)\s+(\S+)\s+(\S+)\s+(\S+)\s*$")
+TELEGRAM_RE = re.compile(r"^// telegram=(\|.*\|)\s*$")
+
+
+def wmbusmeters_version() -> str:
+    text = (WMBUS_COMMON / "_version.h").read_text()
+    match = re.search(r'WMBUSMETERS_VERSION\s+"([^"]*)"', text)
+    return match.group(1) if match else "unknown"
+
+
+def parse_driver_file(path: pathlib.Path) -> list:
+    tests = []
+    test = None
+    telegram = None
+    json_lines = []
+
+    def finish_json():
+        if telegram is not None and json_lines and telegram["json"] is None:
+            try:
+                telegram["json"] = json.loads(" ".join(json_lines))
+            except json.JSONDecodeError:
+                pass
+        json_lines.clear()
+
+    for line in path.read_text(errors="replace").splitlines():
+        if match := TEST_RE.match(line):
+            finish_json()
+            name, driver, meter_id, key = match.groups()
+            test = {
+                "file": path.name,
+                "name": name,
+                "driver": driver,
+                "id": meter_id,
+                "key": "" if key.upper() == "NOKEY" else key,
+                "telegrams": [],
+            }
+            tests.append(test)
+            telegram = None
+        elif test is not None and (match := TELEGRAM_RE.match(line)):
+            finish_json()
+            # "|", "_" and "#" only mark header/payload boundaries.
+            frame = re.sub(r"[|_#]", "", match.group(1))
+            telegram = {"frame": frame, "json": None, "fields": None}
+            test["telegrams"].append(telegram)
+        elif telegram is not None and line.startswith("// |"):
+            finish_json()
+            telegram["fields"] = line[len("// |") :].strip()
+        elif telegram is not None and line.startswith("// ") and (
+            json_lines or line.startswith("// {")
+        ):
+            json_lines.append(line[len("// ") :])
+        else:
+            finish_json()
+    finish_json()
+    return tests
+
+
+def extract(args):
+    tests = []
+    for path in sorted(WMBUS_COMMON.glob("driver_*.cc")):
+        tests.extend(t for t in parse_driver_file(path) if t["telegrams"])
+    corpus = {
+        "version": CORPUS_VERSION,
+        "wmbusmeters_version": wmbusmeters_version(),
+        "tests": tests,
+    }
+    with open(args.corpus, "w") as f:
+        json.dump(corpus, f, indent=1)
+        f.write("\n")
+    telegrams = sum(len(t["telegrams"]) for t in tests)
+    print(f"{len(tests)} tests, {telegrams} telegrams -> {args.corpus}")
+
+
+def json_differences(actual: dict, expected: dict) -> list:
+    problems = []
+    for key in sorted(set(actual) | set(expected)):
+        if key in IGNORED_KEYS:
+            continue
+        if key not in actual:
+            problems.append(f"missing {key}")
+        elif key not in expected:
+            problems.append(f"unexpected {key}={actual[key]!r}")
+        elif actual[key] != expected[key]:
+            problems.append(f"{key}: {actual[key]!r} != {expected[key]!r}")
+    return problems
+
+
+def fields_differences(actual: str, expected: str) -> list:
+    actual_fields = actual.split(";")
+    expected_fields = expected.split(";")
+    if len(actual_fields) != len(expected_fields):
+        return [f"fields: {actual!r} != {expected!r}"]
+    return [
+        f"field {i}: {a!r} != {e!r}"
+        for i, (a, e) in enumerate(zip(actual_fields, expected_fields))
+        if a != e and e not in TEST_TIMESTAMPS
+    ]
+
+
+class Timed:
+    """A meter with its telegrams, decoded over and over for timing."""
+
+    def __init__(self, lib, test):
+        self.meter = wmbus_host.HostMeter(lib, test["name"], test["driver"], test["id"], test["key"])
+        self.frames = [wmbus_host.parse_frame(t["frame"]) for t in test["telegrams"]]
+
+    def seconds(self, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for frame in self.frames:
+                self.meter.handle_telegram(frame)
+        return (time.perf_counter() - start) / (iterations * len(self.frames))
+
+    def close(self):
+        self.meter.close()
+
+
+def run_test(lib, test, iterations, calibration):
+    """Returns (problems, decode seconds per telegram, decode time relative to
+    the calibration test, allocations per telegram)."""
+    problems = []
+    timed = Timed(lib, test)
+    meter, frames = timed.meter, timed.frames
+
+    # Correctness and allocations on the first pass, in file order: some
+    # drivers (e.g. compact frames) need the telegram before.
+    allocations = 0
+    for number, (frame, telegram) in enumerate(zip(frames, test["telegrams"]), 1):
+        with wmbus_host.Stage(lib) as stage:
+            handled = meter.handle_telegram(frame)
+        allocations += stage.allocations
+        where = f"telegram {number}"
+        if not handled:
+            problems.append(f"{where}: not handled")
+            continue
+        if telegram["json"] is not None:
+            actual = json.loads(meter.json())
+            problems += [f"{where}: {p}" for p in json_differences(actual, telegram["json"])]
+        if telegram["fields"] is not None:
+            problems += [f"{where}: {p}" for p in fields_differences(meter.fields(), telegram["fields"])]
+
+    # Best of a few rounds: the minimum is far less sensitive to scheduler and
+    # frequency noise than the mean. The calibration test runs in the same
+    # rounds, right after the driver.
+    rounds = []
+    calibration_rounds = []
+    per_round = max(1, iterations // TIMING_ROUNDS)
+    for _ in range(TIMING_ROUNDS):
+        rounds.append(timed.seconds(per_round))
+        calibration_rounds.append(calibration.seconds(per_round))
+    seconds = min(rounds)
+
+    timed.close()
+    return problems, seconds, seconds / min(calibration_rounds), allocations / len(frames)
+
+
+def driver_results(stats):
+    return {
+        "us": round(sum(stats["us"]) / len(stats["us"]), 2),
+        "relative": round(sum(stats["relative"]) / len(stats["relative"]), 3),
+        "allocations": round(sum(stats["allocations"]) / len(stats["allocations"]), 1),
+    }
+
+
+def run(args):
+    with open(args.corpus) as f:
+        corpus = json.load(f)
+    if corpus.get("version") != CORPUS_VERSION:
+        sys.exit(f"{args.corpus}: unsupported corpus version {corpus.get('version')}")
+
+    lib = wmbus_host.load(build=not args.no_build)
+    lib.wmbus_host_set_log_level(wmbus_host.LOG_LEVELS[args.log_level])
+
+    baseline = {"failing": [], "drivers": {}}
+    if args.baseline.exists() and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    calibration_test = next(
+        (t for t in corpus["tests"] if (t["file"], t["name"]) == CALIBRATION_TEST), None
+    )
+    if calibration_test is None:
+        sys.exit(f"{args.corpus}: calibration test {' '.join(CALIBRATION_TEST)} missing")
+    calibration = Timed(lib, calibration_test)
+
+    drivers = {}
+    tests_by_driver = {}
+    failing = []
+    for test in corpus["tests"]:
+        if args.driver and test["driver"] not in args.driver:
+            continue
+        try:
+            problems, seconds, relative, allocations = run_test(lib, test, args.iterations, calibration)
+        except ValueError as e:
+            problems, seconds, relative, allocations = [str(e)], None, None, None
+        label = f"{test['file']} {test['name']}"
+        if problems:
+            failing.append(label)
+            known = " (known)" if label in baseline["failing"] else ""
+            print(f"FAIL {label}{known}")
+            for problem in problems:
+                print(f"     {problem}")
+        elif args.verbose:
+            print(f"ok   {label}")
+        if seconds is None:
+            continue
+        tests_by_driver.setdefault(test["driver"], []).append(test)
+        stats = drivers.setdefault(test["driver"], {"us": [], "relative": [], "allocations": []})
+        stats["us"].append(seconds * 1e6)
+        stats["relative"].append(relative)
+        stats["allocations"].append(allocations)
+
+    results = {driver: driver_results(s) for driver, s in sorted(drivers.items())}
+
+    tests = sum(1 for t in corpus["tests"] if not args.driver or t["driver"] in args.driver)
+    print(f"\n{tests - len(failing)}/{tests} tests passed, {len(results)} drivers timed")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(
+                {
+                    "wmbusmeters_version": corpus["wmbusmeters_version"],
+                    "calibration": " ".join(CALIBRATION_TEST),
+                    "failing": failing,
+                    "drivers": results,
+                },
+                f,
+                indent=1,
+            )
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        calibration.close()
+        return
+
+    def slower(now, before):
+        return now["relative"] > before["relative"] * (1 + args.time_threshold / 100)
+
+    regressions = [f"{label} fails" for label in failing if label not in baseline["failing"]]
+    for driver, now in results.items():
+        before = baseline["drivers"].get(driver)
+        if before is None or "relative" not in before:
+            continue
+        # A load burst can slow a single measurement down; a real regression
+        # shows up every time.
+        for _ in range(TIMING_RETRIES):
+            if not slower(now, before):
+                break
+            retry = {"us": [], "relative": [], "allocations": []}
+            for test in tests_by_driver[driver]:
+                _, seconds, relative, allocations = run_test(lib, test, args.iterations, calibration)
+                retry["us"].append(seconds * 1e6)
+                retry["relative"].append(relative)
+                retry["allocations"].append(allocations)
+            retry = driver_results(retry)
+            if retry["relative"] < now["relative"]:
+                now = results[driver] = retry
+        if slower(now, before):
+            regressions.append(
+                f"{driver}: {before['relative']} -> {now['relative']} x calibration per telegram"
+                f" ({before['us']} -> {now['us']} us)"
+            )
+        if now["allocations"] > before["allocations"] * (1 + args.alloc_threshold / 100):
+            regressions.append(
+                f"{driver}: {before['allocations']} -> {now['allocations']} allocations per telegram"
+            )
+    calibration.close()
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=pathlib.Path, default=CORPUS)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("extract", help="write the corpus from the driver sources")
+
+    run_parser = commands.add_parser("run", help="check and time the corpus")
+    run_parser.add_argument("--driver", action="append", help="only this driver (repeatable)")
+    run_parser.add_argument("--iterations", type=int, default=200)
+    run_parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE)
+    run_parser.add_argument(
+        "--update-baseline", action="store_true", help="write the results as the new baseline"
+    )
+    run_parser.add_argument(
+        "--time-threshold", type=float, default=25, help="allowed slowdown in %% (default 25)"
+    )
+    run_parser.add_argument(
+        "--alloc-threshold", type=float, default=5, help="allowed allocation increase in %% (default 5)"
+    )
+    run_parser.add_argument("--log-level", choices=wmbus_host.LOG_LEVELS, default="none")
+    run_parser.add_argument("--no-build", action="store_true", help="use the existing library")
+    run_parser.add_argument("-v", "--verbose", action="store_true")
+
+    args = parser.parse_args()
+    {"extract": extract, "run": run}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
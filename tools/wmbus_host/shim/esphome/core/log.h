@@ -0,0 +1,39 @@
+#pragma once
+// Host replacement for the ESPHome logging header, just enough for
+// wmbus_common. Messages go to stderr when their level is enabled with
+// wmbus_host_set_log_level().
+#include <cstdint>
+
+#define ESPHOME_LOG_LEVEL_NONE 0
+#define ESPHOME_LOG_LEVEL_ERROR 1
+#define ESPHOME_LOG_LEVEL_WARN 2
+#define ESPHOME_LOG_LEVEL_INFO 3
+#define ESPHOME_LOG_LEVEL_CONFIG 4
+#define ESPHOME_LOG_LEVEL_DEBUG 5
+#define ESPHOME_LOG_LEVEL_VERBOSE 6
+#define ESPHOME_LOG_LEVEL_VERY_VERBOSE 7
+#ifndef ESPHOME_LOG_LEVEL
+#define ESPHOME_LOG_LEVEL ESPHOME_LOG_LEVEL_VERY_VERBOSE
+#endif
+
+extern "C" void wmbus_host_log(int level, const char *tag, const char *format,
+                               ...) __attribute__((format(printf, 3, 4)));
+
+#define esph_log_e(tag, ...)                                                   \
+  wmbus_host_log(ESPHOME_LOG_LEVEL_ERROR, tag, __VA_ARGS__)
+#define esph_log_w(tag, ...)                                                   \
+  wmbus_host_log(ESPHOME_LOG_LEVEL_WARN, tag, __VA_ARGS__)
+#define esph_log_i(tag, ...)                                                   \
+  wmbus_host_log(ESPHOME_LOG_LEVEL_INFO, tag, __VA_ARGS__)
+#define esph_log_d(tag, ...)                                                   \
+  wmbus_host_log(ESPHOME_LOG_LEVEL_DEBUG, tag, __VA_ARGS__)
+#define esph_log_v(tag, ...)                                                   \
+  wmbus_host_log(ESPHOME_LOG_LEVEL_VERBOSE, tag, __VA_ARGS__)
+
+#define ESP_LOGE(tag, ...) esph_log_e(tag, __VA_ARGS__)
+#define ESP_LOGW(tag, ...) esph_log_w(tag, __VA_ARGS__)
+#define ESP_LOGI(tag, ...) esph_log_i(tag, __VA_ARGS__)
+#define ESP_LOGD(tag, ...) esph_log_d(tag, __VA_ARGS__)
+#define ESP_LOGV(tag, ...) esph_log_v(tag, __VA_ARGS__)
+#define ESP_LOGCONFIG(tag, ...)                                                \
+  wmbus_host_log(ESPHOME_LOG_LEVEL_CONFIG, tag, __VA_ARGS__)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark wmbus_common telegram decoding on the host.
+
+Feeds telegrams through createMeter + handleTelegram + printMeterJson of the
+host build (see Makefile) and reports telegrams/second, allocations per
+telegram and peak heap for every stage.
+
+Telegram file, one per line, '#' starts a comment:
+
+    <driver> <meter id> <key or NOKEY> <telegram hex>
+    multical21 76348799 NOKEY 2A442D2C998734761B168D2091D37CAC21576C78_02FF2071...
+
+    tools/wmbus_host/wmbus_bench.py telegrams.txt
+    tools/wmbus_host/wmbus_bench.py telegrams.txt --iterations 2000 --json
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import wmbus_host
+
+
+def read_telegrams(path):
+    telegrams = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            try:
+                driver, meter_id, key, frame = line.split()
+            except ValueError:
+                sys.exit(f"{path}:{number}: expected '<driver> <id> <key> <telegram>'")
+            key = "" if key.upper() == "NOKEY" else key
+            telegrams.append((driver, meter_id, key, wmbus_host.parse_frame(frame)))
+    return telegrams
+
+
+def bench_telegram(lib, driver, meter_id, key, frame, iterations):
+    """Returns per stage {"allocations", "peak_bytes", "seconds"} and success."""
+    result = {}
+
+    with wmbus_host.Stage(lib) as stage:
+        start = time.perf_counter()
+        meter = wmbus_host.HostMeter(lib, f"{driver}-{meter_id}", driver, meter_id, key)
+        elapsed = time.perf_counter() - start
+    result["create"] = {
+        "allocations": stage.allocations,
+        "peak_bytes": stage.peak_bytes,
+        "seconds": elapsed,
+    }
+
+    with wmbus_host.Stage(lib) as stage:
+        handled = meter.handle_telegram(frame)
+    result["parse"] = {"allocations": stage.allocations, "peak_bytes": stage.peak_bytes}
+
+    with wmbus_host.Stage(lib) as stage:
+        meter.json()
+    result["json"] = {"allocations": stage.allocations, "peak_bytes": stage.peak_bytes}
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        meter.handle_telegram(frame)
+    result["parse"]["seconds"] = (time.perf_counter() - start) / iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        meter.json()
+    result["json"]["seconds"] = (time.perf_counter() - start) / iterations
+
+    meter.close()
+    return result, handled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("telegrams", help="telegram file, see above")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--json", action="store_true", help="machine readable output")
+    parser.add_argument("--log-level", choices=wmbus_host.LOG_LEVELS, default="none")
+    parser.add_argument("--no-build", action="store_true", help="use the existing library")
+    args = parser.parse_args()
+
+    lib = wmbus_host.load(build=not args.no_build)
+    lib.wmbus_host_set_log_level(wmbus_host.LOG_LEVELS[args.log_level])
+
+    rows = []
+    for driver, meter_id, key, frame in read_telegrams(args.telegrams):
+        stages, handled = bench_telegram(lib, driver, meter_id, key, frame, args.iterations)
+        rows.append({"driver": driver, "id": meter_id, "handled": handled, "stages": stages})
+
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2)
+        print()
+        return
+
+    print(f"{'driver':<16} {'id':<10} {'stage':<7} {'us':>9} {'allocs':>7} {'peak B':>8}")
+    for row in rows:
+        for name, stage in row["stages"].items():
+            print(
+                f"{row['driver']:<16} {row['id']:<10} {name:<7} {stage['seconds'] * 1e6:>9.1f} "
+                f"{stage['allocations']:>7} {stage['peak_bytes']:>8}"
+                + ("" if row["handled"] or name != "parse" else "  (not handled)")
+            )
+
+    parse_seconds = sum(row["stages"]["parse"]["seconds"] for row in rows)
+    if rows and parse_seconds:
+        print(f"\n{len(rows)} telegrams, {len(rows) / parse_seconds:.0f} telegrams/s parse")
+
+
+if __name__ == "__main__":
+    main()
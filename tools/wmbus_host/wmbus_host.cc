@@ -0,0 +1,291 @@
+// C API around wmbus_common for host builds, used through ctypes by
+// wmbus_bench.py. Also counts heap allocations so the benchmark can report
+// allocations and peak heap per stage.
+#include <algorithm>
+#include <chrono>
+#include <cstdarg>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <malloc.h>
+#include <deque>
+#include <new>
+
+#include "latency.h"
+#include "meters.h"
+#include "meters_common_implementation.h"
+#include "replay.h"
+#include "wmbus.h"
+
+struct WmbusHostAllocStats {
+  uint64_t allocations;
+  uint64_t allocated_bytes;
+  uint64_t live_bytes;
+  uint64_t peak_bytes;
+};
+
+static WmbusHostAllocStats alloc_stats;
+static int log_level = ESPHOME_LOG_LEVEL_NONE;
+
+static void *counted_alloc(size_t size) {
+  void *p = malloc(size ? size : 1);
+  if (p == nullptr)
+    throw std::bad_alloc();
+  size_t usable = malloc_usable_size(p);
+  alloc_stats.allocations++;
+  alloc_stats.allocated_bytes += size;
+  alloc_stats.live_bytes += usable;
+  if (alloc_stats.live_bytes > alloc_stats.peak_bytes)
+    alloc_stats.peak_bytes = alloc_stats.live_bytes;
+  return p;
+}
+
+static void counted_free(void *p) {
+  if (p == nullptr)
+    return;
+  alloc_stats.live_bytes -= malloc_usable_size(p);
+  free(p);
+}
+
+void *operator new(size_t size) { return counted_alloc(size); }
+void *operator new[](size_t size) { return counted_alloc(size); }
+void operator delete(void *p) noexcept { counted_free(p); }
+void operator delete[](void *p) noexcept { counted_free(p); }
+void operator delete(void *p, size_t) noexcept { counted_free(p); }
+void operator delete[](void *p, size_t) noexcept { counted_free(p); }
+
+struct WmbusHostMeter {
+  std::shared_ptr<Meter> meter;
+  Telegram telegram;
+  bool has_telegram{false};
+};
+
+struct WmbusHostReplayConfig {
+  double rate;                // frames per second
+  uint32_t burst_size;        // extra frames every burst_interval_ms, 0: none
+  uint32_t burst_interval_ms;
+  uint32_t duration_ms;       // simulated time frames are offered
+  uint32_t queue_size;        // wmbus_radio packet queue length
+  uint32_t loop_interval_ms;  // Radio::loop() takes one packet per main loop
+  double cpu_scale;           // device time per host time of a decode
+  uint32_t service_us;        // fixed decode time instead of measuring, 0: off
+  uint32_t meter_count;       // spread frames over this many DLL ids
+  int c1;                     // link mode of plain hex capture lines
+};
+
+struct WmbusHostReplayStats {
+  uint64_t offered;
+  uint64_t dropped;
+  uint64_t decoded;
+  uint64_t crc_failures;
+  uint64_t handled;
+  uint64_t queue_high_water;
+  uint64_t end_us;            // when the last queued frame was done
+  uint32_t latency_p50_us;    // end of reception until handlers are done
+  uint32_t latency_p99_us;
+  uint32_t latency_max_us;
+  uint32_t service_p50_us;
+  uint32_t service_p99_us;
+};
+
+extern "C" {
+void wmbus_host_log(int level, const char *tag, const char *format, ...) {
+  if (level > log_level)
+    return;
+  va_list args;
+  va_start(args, format);
+  fprintf(stderr, "[%s] ", tag);
+  vfprintf(stderr, format, args);
+  fputc('\n', stderr);
+  va_end(args);
+}
+
+void wmbus_host_set_log_level(int level) { log_level = level; }
+
+// Starts a new measurement: counters are zeroed and the peak is set to the
+// heap currently in use.
+void wmbus_host_alloc_reset() {
+  alloc_stats.allocations = 0;
+  alloc_stats.allocated_bytes = 0;
+  alloc_stats.peak_bytes = alloc_stats.live_bytes;
+}
+
+void wmbus_host_alloc_stats(WmbusHostAllocStats *out) { *out = alloc_stats; }
+
+// Same MeterInfo as wmbus_meter::Meter::set_meter_params builds on the device.
+WmbusHostMeter *wmbus_host_meter_create(const char *name, const char *driver,
+                                        const char *id, const char *key) {
+  MeterInfo meter_info;
+  meter_info.parse(name, driver, std::string(id) + ",", key);
+  auto meter = createMeter(&meter_info);
+  if (meter == nullptr)
+    return nullptr;
+  auto host_meter = new WmbusHostMeter();
+  host_meter->meter = meter;
+  return host_meter;
+}
+
+void wmbus_host_meter_free(WmbusHostMeter *meter) { delete meter; }
+
+// frame is a wM-Bus telegram with the DLL CRCs already removed, as
+// wmbus_radio::Frame::data() holds it, or a wired M-Bus long frame
+// (68 L L 68 ...). Returns 1 when the meter decoded it.
+int wmbus_host_meter_handle(WmbusHostMeter *meter, const uint8_t *frame,
+                            size_t length, int rssi_dbm) {
+  // No device, like the wmbusmeters driver tests: the json then carries no
+  // device/rssi_dbm members.
+  bool mbus = length > 4 && frame[0] == 0x68 && frame[3] == 0x68;
+  AboutTelegram about("", rssi_dbm, mbus ? FrameType::MBUS : FrameType::WMBUS);
+  std::vector<Address> addresses;
+  bool id_match = false;
+  meter->telegram = Telegram();
+  bool handled = meter->meter->handleTelegram(
+      about, std::vector<uchar>(frame, frame + length), false, &addresses,
+      &id_match, &meter->telegram);
+  meter->has_telegram = handled && id_match;
+  return meter->has_telegram;
+}
+
+static int copy_out(const std::string &s, char *buffer, size_t size) {
+  if (size > 0) {
+    size_t n = std::min(s.size(), size - 1);
+    memcpy(buffer, s.data(), n);
+    buffer[n] = '\0';
+  }
+  return s.size();
+}
+
+// Renders the last handled telegram into buffer. Returns the json length,
+// which may exceed size (then the output is truncated), or -1.
+int wmbus_host_meter_json(WmbusHostMeter *meter, char *buffer, size_t size,
+                          int pretty_print) {
+  if (!meter->has_telegram)
+    return -1;
+  std::string json;
+  meter->meter->printMeterJson(&meter->telegram, &json, nullptr, pretty_print);
+  return copy_out(json, buffer, size);
+}
+
+// The driver's default fields separated by ';', as in the "|..." lines of the
+// driver tests.
+int wmbus_host_meter_fields(WmbusHostMeter *meter, char *buffer, size_t size) {
+  if (!meter->has_telegram)
+    return -1;
+  std::string fields;
+  // concatFields() looks up unknown field names in the constant fields.
+  std::vector<std::string> constant_fields;
+  meter->meter->printMeter(&meter->telegram, nullptr, &fields, ';', nullptr,
+                           nullptr, &constant_fields, nullptr, false);
+  return copy_out(fields, buffer, size);
+}
+
+// Radio::loop() and Meter::handle_frame for one replayed packet. Returns
+// whether a meter took the frame.
+static bool replay_decode(ReplayFrame &frame, WmbusHostMeter **meters,
+                          size_t meter_count, WmbusHostReplayStats *stats) {
+  std::vector<uchar> data = frame.packet;
+  if (frame.link_mode == LinkMode::C1)
+    data.erase(data.begin(), data.begin() + 2);
+  if (!removeAnyDLLCRCs(data))
+    stats->crc_failures++;
+  size_t frame_length;
+  int payload_length, payload_offset;
+  if (checkWMBusFrame(data, &frame_length, &payload_length, &payload_offset,
+                      false) != FrameStatus::FullFrame)
+    return false;
+  stats->decoded++;
+
+  bool handled = false;
+  for (size_t i = 0; i < meter_count; i++) {
+    Telegram header_check;
+    if (!header_check.parseHeader(data) ||
+        !MeterCommonImplementation::isTelegramForMeter(
+            &header_check, meters[i]->meter.get(), nullptr))
+      continue;
+    handled |= wmbus_host_meter_handle(meters[i], data.data(), data.size(),
+                                       frame.rssi);
+  }
+  return handled;
+}
+
+// Replays a capture through a simulated receive path: one frame on air at a
+// time, a packet queue of queue_size and one packet decoded per main loop
+// pass. Time is simulated; only decode times come from running the real
+// code. Returns the number of frames in the capture, -1 without any.
+int wmbus_host_replay(const char *capture, const WmbusHostReplayConfig *config,
+                      WmbusHostMeter **meters, size_t meter_count,
+                      WmbusHostReplayStats *out) {
+  std::vector<ReplayFrame> frames;
+  parseReplayCapture(capture, config->c1 ? LinkMode::C1 : LinkMode::T1,
+                     &frames);
+  if (frames.empty())
+    return -1;
+
+  *out = WmbusHostReplayStats{};
+  ReplaySchedule schedule(config->rate, config->burst_size,
+                          config->burst_interval_ms);
+  LatencyHistogram latency, service;
+  std::deque<std::pair<uint64_t, ReplayFrame>> queue;
+  const uint64_t loop_us = std::max<uint32_t>(config->loop_interval_ms, 1) * 1000;
+  uint64_t loop_free_us = 0;
+  uint64_t channel_free_us = 0;
+  uint64_t replayed = 0;
+
+  auto serve_until = [&](uint64_t until_us) {
+    while (!queue.empty()) {
+      uint64_t start = std::max(loop_free_us, queue.front().first);
+      start = (start + loop_us - 1) / loop_us * loop_us;
+      if (start > until_us)
+        return;
+      auto entry = std::move(queue.front());
+      queue.pop_front();
+
+      uint32_t service_us = config->service_us;
+      auto begin = std::chrono::steady_clock::now();
+      bool handled = replay_decode(entry.second, meters, meter_count, out);
+      if (service_us == 0) {
+        auto host_us = std::chrono::duration_cast<std::chrono::microseconds>(
+                           std::chrono::steady_clock::now() - begin)
+                           .count();
+        service_us = std::max<uint32_t>(host_us * config->cpu_scale, 1);
+      }
+      out->handled += handled;
+      loop_free_us = start + service_us;
+      service.record(service_us);
+      latency.record(loop_free_us - entry.first);
+    }
+  };
+
+  for (uint32_t now_ms = 0; now_ms < config->duration_ms; now_ms++) {
+    for (uint32_t due = schedule.due(now_ms); due > 0; due--) {
+      ReplayFrame frame = frames[replayed % frames.size()];
+      if (config->meter_count > 1)
+        offsetReplayFrameId(&frame, replayed % config->meter_count);
+      replayed++;
+      // The packet is queued once the whole frame is received.
+      uint64_t arrival = std::max<uint64_t>(now_ms * 1000ULL, channel_free_us) +
+                         replayAirtimeUs(frame);
+      channel_free_us = arrival;
+      serve_until(arrival);
+
+      out->offered++;
+      if (queue.size() >= config->queue_size) {
+        out->dropped++;
+        continue;
+      }
+      queue.emplace_back(arrival, std::move(frame));
+      out->queue_high_water =
+          std::max<uint64_t>(out->queue_high_water, queue.size());
+    }
+  }
+  serve_until(UINT64_MAX / 2);
+
+  out->end_us = loop_free_us;
+  out->latency_p50_us = latency.percentile(50);
+  out->latency_p99_us = latency.percentile(99);
+  out->latency_max_us = latency.max();
+  out->service_p50_us = service.percentile(50);
+  out->service_p99_us = service.percentile(99);
+  return frames.size();
+}
+}
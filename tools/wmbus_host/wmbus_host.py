@@ -0,0 +1,163 @@
+"""ctypes binding for the host build of wmbus_common (libwmbus_common.so).
+
+The library is built with ``make`` in this directory on first use.
+"""
+
+import ctypes
+import pathlib
+import subprocess
+
+HERE = pathlib.Path(__file__).resolve().parent
+LIBRARY = HERE / "libwmbus_common.so"
+
+LOG_LEVELS = {"none": 0, "error": 1, "warn": 2, "info": 3, "debug": 5, "verbose": 6}
+
+
+class AllocStats(ctypes.Structure):
+    _fields_ = [
+        ("allocations", ctypes.c_uint64),
+        ("allocated_bytes", ctypes.c_uint64),
+        ("live_bytes", ctypes.c_uint64),
+        ("peak_bytes", ctypes.c_uint64),
+    ]
+
+
+class ReplayConfig(ctypes.Structure):
+    _fields_ = [
+        ("rate", ctypes.c_double),
+        ("burst_size", ctypes.c_uint32),
+        ("burst_interval_ms", ctypes.c_uint32),
+        ("duration_ms", ctypes.c_uint32),
+        ("queue_size", ctypes.c_uint32),
+        ("loop_interval_ms", ctypes.c_uint32),
+        ("cpu_scale", ctypes.c_double),
+        ("service_us", ctypes.c_uint32),
+        ("meter_count", ctypes.c_uint32),
+        ("c1", ctypes.c_int),
+    ]
+
+
+class ReplayStats(ctypes.Structure):
+    _fields_ = [
+        ("offered", ctypes.c_uint64),
+        ("dropped", ctypes.c_uint64),
+        ("decoded", ctypes.c_uint64),
+        ("crc_failures", ctypes.c_uint64),
+        ("handled", ctypes.c_uint64),
+        ("queue_high_water", ctypes.c_uint64),
+        ("end_us", ctypes.c_uint64),
+        ("latency_p50_us", ctypes.c_uint32),
+        ("latency_p99_us", ctypes.c_uint32),
+        ("latency_max_us", ctypes.c_uint32),
+        ("service_p50_us", ctypes.c_uint32),
+        ("service_p99_us", ctypes.c_uint32),
+    ]
+
+
+def load(build: bool = True) -> ctypes.CDLL:
+    if build:
+        subprocess.run(["make", "-s", "-j8", "-C", str(HERE)], check=True)
+    lib = ctypes.CDLL(str(LIBRARY))
+    lib.wmbus_host_meter_create.restype = ctypes.c_void_p
+    lib.wmbus_host_meter_create.argtypes = [ctypes.c_char_p] * 4
+    lib.wmbus_host_meter_free.argtypes = [ctypes.c_void_p]
+    lib.wmbus_host_meter_handle.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_char_p,
+        ctypes.c_size_t,
+        ctypes.c_int,
+    ]
+    lib.wmbus_host_meter_json.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_char_p,
+        ctypes.c_size_t,
+        ctypes.c_int,
+    ]
+    lib.wmbus_host_meter_fields.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_char_p,
+        ctypes.c_size_t,
+    ]
+    lib.wmbus_host_alloc_stats.argtypes = [ctypes.POINTER(AllocStats)]
+    lib.wmbus_host_set_log_level.argtypes = [ctypes.c_int]
+    lib.wmbus_host_replay.argtypes = [
+        ctypes.c_char_p,
+        ctypes.POINTER(ReplayConfig),
+        ctypes.POINTER(ctypes.c_void_p),
+        ctypes.c_size_t,
+        ctypes.POINTER(ReplayStats),
+    ]
+    return lib
+
+
+class Stage:
+    """Counts allocations and peak heap of everything run inside the block."""
+
+    def __init__(self, lib: ctypes.CDLL):
+        self.lib = lib
+        self.stats = AllocStats()
+
+    def __enter__(self):
+        self.lib.wmbus_host_alloc_reset()
+        self.lib.wmbus_host_alloc_stats(ctypes.byref(self.stats))
+        self.start_bytes = self.stats.live_bytes
+        return self
+
+    def __exit__(self, *exc):
+        self.lib.wmbus_host_alloc_stats(ctypes.byref(self.stats))
+        return False
+
+    @property
+    def allocations(self) -> int:
+        return self.stats.allocations
+
+    @property
+    def peak_bytes(self) -> int:
+        """Heap in use on top of what was allocated when the stage started."""
+        return self.stats.peak_bytes - self.start_bytes
+
+
+class HostMeter:
+    def __init__(self, lib: ctypes.CDLL, name: str, driver: str, meter_id: str, key: str = ""):
+        self.lib = lib
+        self.handle = lib.wmbus_host_meter_create(
+            name.encode(), driver.encode(), meter_id.encode(), key.encode()
+        )
+        if not self.handle:
+            raise ValueError(f"no driver {driver!r} in the host build")
+        self._json = ctypes.create_string_buffer(4096)
+
+    def close(self):
+        if self.handle:
+            self.lib.wmbus_host_meter_free(self.handle)
+            self.handle = None
+
+    def __del__(self):
+        self.close()
+
+    def handle_telegram(self, frame: bytes, rssi_dbm: int = 0) -> bool:
+        return bool(self.lib.wmbus_host_meter_handle(self.handle, frame, len(frame), rssi_dbm))
+
+    def json(self, pretty_print: bool = False) -> str | None:
+        n = self.lib.wmbus_host_meter_json(self.handle, self._json, len(self._json), pretty_print)
+        if n < 0:
+            return None
+        if n >= len(self._json):
+            self._json = ctypes.create_string_buffer(n + 1)
+            self.lib.wmbus_host_meter_json(self.handle, self._json, len(self._json), pretty_print)
+        return self._json.value.decode(errors="replace")
+
+
+    def fields(self) -> str | None:
+        n = self.lib.wmbus_host_meter_fields(self.handle, self._json, len(self._json))
+        if n < 0:
+            return None
+        if n >= len(self._json):
+            self._json = ctypes.create_string_buffer(n + 1)
+            self.lib.wmbus_host_meter_fields(self.handle, self._json, len(self._json))
+        return self._json.value.decode(errors="replace")
+
+
+def parse_frame(text: str) -> bytes:
+    """Hex telegram as written in driver tests: |2A442D2C..._02FF20...|"""
+    return bytes.fromhex(text.strip().strip("|").replace("_", "").replace(" ", ""))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Decode wmbus_meter CBOR telegrams.
+
+wmbus_meter.send_telegram_with_mqtt / send_telegram_with_socket with
+``format: cbor`` (or ``cbor_field_ids``) send the same object as the json
+format, encoded as CBOR. This script turns such a payload back into json and
+can compare it with the json rendering of the same telegram.
+
+    tools/wmbus_meter_cbor_decode.py payload.cbor
+    tools/wmbus_meter_cbor_decode.py --hex bf615f6874656c656772616dff
+    tools/wmbus_meter_cbor_decode.py payload.cbor --compare payload.json
+"""
+
+import argparse
+import json
+import math
+import struct
+import sys
+
+BREAK = object()
+
+
+class CborDecoder:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def take(self, n: int) -> bytes:
+        if self.pos + n > len(self.data):
+            raise ValueError(f"truncated CBOR at offset {self.pos}")
+        chunk = self.data[self.pos : self.pos + n]
+        self.pos += n
+        return chunk
+
+    def argument(self, info: int) -> int:
+        if info < 24:
+            return info
+        if info in (24, 25, 26, 27):
+            return int.from_bytes(self.take(1 << (info - 24)), "big")
+        raise ValueError(f"unsupported additional info {info} at offset {self.pos - 1}")
+
+    def decode(self):
+        initial = self.take(1)[0]
+        major, info = initial >> 5, initial & 0x1F
+
+        if initial == 0xFF:
+            return BREAK
+        if major == 7:
+            if info == 20:
+                return False
+            if info == 21:
+                return True
+            if info in (22, 23):
+                return None
+            if info == 25:
+                return struct.unpack(">e", self.take(2))[0]
+            if info == 26:
+                return struct.unpack(">f", self.take(4))[0]
+            if info == 27:
+                return struct.unpack(">d", self.take(8))[0]
+            raise ValueError(f"unsupported simple value {info}")
+
+        if info == 31:
+            return self.decode_indefinite(major)
+
+        value = self.argument(info)
+        if major == 0:
+            return value
+        if major == 1:
+            return -1 - value
+        if major == 2:
+            return self.take(value)
+        if major == 3:
+            return self.take(value).decode()
+        if major == 4:
+            return [self.decode() for _ in range(value)]
+        if major == 5:
+            return self.pairs(value)
+        if major == 6:
+            return self.decode()  # Tags are not used, skip them
+        raise ValueError(f"unsupported major type {major}")
+
+    def decode_indefinite(self, major: int):
+        items = []
+        while (item := self.decode()) is not BREAK:
+            items.append(item)
+        if major == 4:
+            return items
+        if major == 5:
+            if len(items) % 2:
+                raise ValueError("odd number of items in map")
+            return {as_key(k): v for k, v in zip(items[::2], items[1::2])}
+        raise ValueError(f"unsupported indefinite length major type {major}")
+
+    def pairs(self, count: int) -> dict:
+        result = {}
+        for _ in range(count):
+            key = self.decode()
+            result[as_key(key)] = self.decode()
+        return result
+
+
+def as_key(key):
+    # [index, storage, tariff, subunit] field id keys are not hashable lists.
+    return tuple(key) if isinstance(key, list) else key
+
+
+def decode(data: bytes):
+    decoder = CborDecoder(data)
+    value = decoder.decode()
+    if decoder.pos != len(data):
+        raise ValueError(f"{len(data) - decoder.pos} trailing bytes")
+    return value
+
+
+def same(a, b) -> bool:
+    if isinstance(a, float) or isinstance(b, float):
+        if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
+            return False
+        # json has 6 decimals, CBOR the full value.
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
+    return a == b
+
+
+def compare(decoded: dict, expected: dict) -> list:
+    problems = []
+    for key in sorted(set(decoded) | set(expected), key=str):
+        if key not in decoded:
+            problems.append(f"missing {key}")
+        elif key not in expected:
+            problems.append(f"unexpected {key}")
+        elif not same(decoded[key], expected[key]):
+            problems.append(f"{key}: {decoded[key]!r} != {expected[key]!r}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("payload", nargs="?", help="file with one CBOR telegram")
+    source.add_argument("--hex", help="CBOR telegram as hex string")
+    parser.add_argument("--compare", metavar="JSON", help="json rendering to compare with")
+    args = parser.parse_args()
+
+    if args.hex:
+        data = bytes.fromhex(args.hex)
+    else:
+        with open(args.payload, "rb") as f:
+            data = f.read()
+
+    decoded = decode(data)
+    printable = {
+        (",".join(map(str, k)) if isinstance(k, tuple) else k): v
+        for k, v in decoded.items()
+    }
+    print(json.dumps(printable, indent=4))
+
+    if args.compare:
+        with open(args.compare) as f:
+            expected = json.load(f)
+        problems = compare(decoded, expected)
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Decode wmbus_radio receive path traces into a timeline.
+
+With ``trace_buffer_size`` set, wmbus_radio keeps binary trace records (see
+components/wmbus_radio/trace.h). ``wmbus_radio.dump_trace`` logs them as
+``trace: <hex>`` lines; this script picks those lines out of a captured log,
+or reads the serialized ring (Trace::serialize()) from a binary file, and
+prints one line per event.
+
+    esphome logs node.yaml | tee node.log
+    tools/wmbus_trace.py node.log
+    tools/wmbus_trace.py --binary trace.bin --summary
+"""
+
+import argparse
+import re
+import struct
+import sys
+from collections import Counter
+
+MAGIC = b"WTR"
+FORMAT_VERSION = 1
+RECORD = struct.Struct(">IHHII")
+
+# TraceEvent, in enum order starting at 1.
+EVENTS = [
+    "rx_restart",
+    "sync_detected",
+    "sync_timeout",
+    "noise_flush",
+    "fifo_overflow",
+    "rx_entry_overflow",
+    "header",
+    "frame_detected",
+    "frame_complete",
+    "foreign_frame",
+    "decoded_3of6",
+    "packet_queued",
+    "queue_drop",
+    "packet_converted",
+    "frame_dispatched",
+    "radio_sleep",
+    "radio_wake",
+]
+
+RX_STATES = ["INIT_RX", "WAIT_FOR_SYNC", "WAIT_FOR_DATA", "READ_DATA", "FRAME_READY"]
+FRAME_ENDS = ["gdo2", "chip_state", "length"]
+# wmbus_common LinkMode enum positions that a radio can produce.
+LINK_MODES = {5: "T1", 7: "C1", 32: "unknown"}
+
+# Log lines may end in a colour reset escape.
+TRACE_LINE = re.compile(r"trace: ([0-9A-Fa-f]+)")
+
+
+def _lookup(names, index):
+    return names[index] if 0 <= index < len(names) else str(index)
+
+
+def _signed32(value):
+    return value - (1 << 32) if value & 0x80000000 else value
+
+
+def describe(event, a, b, c):
+    """Human readable arguments of one record."""
+    if event == "rx_restart":
+        return f"{'fast' if a else 'full'} {b}us"
+    if event == "noise_flush":
+        return f"fifo={a}"
+    if event == "fifo_overflow":
+        return f"state={_lookup(RX_STATES, a)} bytes={b}"
+    if event == "header":
+        return f"fifo={a} bytes={b:08X}"
+    if event == "frame_detected":
+        return f"mode={chr(a >> 8)} block={chr(a & 0xFF)} L=0x{b:02X} expected={c}"
+    if event == "frame_complete":
+        return f"via={_lookup(FRAME_ENDS, a)} bytes={b}"
+    if event == "foreign_frame":
+        return f"id={b:08X} after={a}"
+    if event == "decoded_3of6":
+        return f"{'ok' if a else 'failed'} bytes={b}"
+    if event == "packet_queued":
+        return f"depth={a}"
+    if event == "packet_converted":
+        result = f"frame={c}" if c else "failed"
+        return f"mode={LINK_MODES.get(a, a)} packet={b} {result}"
+    if event == "frame_dispatched":
+        return f"handlers={a} bytes={b} rssi={_signed32(c)}dBm"
+    if event == "radio_sleep":
+        return f"planned={b}ms"
+    if event == "radio_wake":
+        return f"slept={b}ms"
+    return ""
+
+
+def parse(data: bytes):
+    """Yield (timestamp_us, event, a, b, c) from a serialized trace."""
+    if data[:3] != MAGIC:
+        raise ValueError("missing trace header, not a wmbus_radio trace")
+    if data[3] != FORMAT_VERSION:
+        raise ValueError(f"unsupported trace format version {data[3]}")
+    body = data[4:]
+    if len(body) % RECORD.size:
+        print(f"# ignoring {len(body) % RECORD.size} trailing bytes", file=sys.stderr)
+    for offset in range(0, len(body) - RECORD.size + 1, RECORD.size):
+        timestamp, event, a, b, c = RECORD.unpack_from(body, offset)
+        yield timestamp, _lookup(["unknown"] + EVENTS, event), a, b, c
+
+
+def from_log(lines):
+    """Concatenate the hex of the last dump found in a log."""
+    dumps = []
+    for line in lines:
+        match = TRACE_LINE.search(line)
+        if not match:
+            continue
+        chunk = bytes.fromhex(match.group(1))
+        if chunk[:3] == MAGIC:
+            dumps.append(bytearray())
+        if dumps:
+            dumps[-1] += chunk
+    if not dumps:
+        raise ValueError("no 'trace:' lines found, run wmbus_radio.dump_trace")
+    return bytes(dumps[-1])
+
+
+def timeline(records, out):
+    """Print time since the first record and since the previous one."""
+    start = previous = None
+    elapsed = 0
+    for timestamp, event, a, b, c in records:
+        if start is None:
+            start = previous = timestamp
+        # micros() wraps after ~71 minutes.
+        delta = (timestamp - previous) & 0xFFFFFFFF
+        if delta & 0x80000000:
+            # Two writers raced for neighbouring slots.
+            delta -= 1 << 32
+        elapsed += delta
+        previous = timestamp
+        out.write(
+            f"{elapsed / 1000:12.3f} ms {delta:+9d} us  {event:<18} {describe(event, a, b, c)}\n"
+        )
+
+
+def summary(records, out):
+    counts = Counter(event for _, event, *_ in records)
+    for event, count in counts.most_common():
+        out.write(f"{event:<18} {count:8d}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", nargs="?", help="log file or binary trace, default stdin")
+    parser.add_argument("--binary", action="store_true", help="input is Trace::serialize() output")
+    parser.add_argument("--summary", action="store_true", help="count events instead of a timeline")
+    args = parser.parse_args()
+
+    try:
+        if args.binary:
+            with open(args.input, "rb") if args.input else sys.stdin.buffer as f:
+                data = f.read()
+        else:
+            with open(args.input, errors="replace") if args.input else sys.stdin as f:
+                data = from_log(f)
+        records = list(parse(data))
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+    if args.summary:
+        summary(records, sys.stdout)
+    else:
+        timeline(records, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()